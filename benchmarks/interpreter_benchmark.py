@@ -0,0 +1,53 @@
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.interpreter.interpreter import Interpreter
+from src.interpreter.closure_interpreter import ClosureInterpreter
+from src.interpreter.transpiler import TranspiledInterpreter
+from src.vm.machine import VirtualMachine
+from src.lexer.regex_lexer import RegexLexer
+from src.parser.parser import Parser
+
+
+def create_program(element_count):
+    values = ", ".join(str(index % 100) for index in range(element_count))
+    return f"""
+    function int compute(int a){{
+        if (a * 3 + 7 > 150 - a * 2) {{ return a * a - a * 2 * a + a * 2 - 3 * a + 4 * a * a - 7; }}
+        else {{ return a * 2 + a * 3 - a * a - 5 * a + 6 * a * a - a; }};
+    }}
+    function int main(){{
+        List<int> values = [{values}];
+        for (int value in values) {{ compute(value); compute(value + 1); compute(value * 2); }};
+        return 0;
+    }}
+    """
+
+
+def measure(interpreter_class, program, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        interpreter_class(program).visit_program()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(element_count=10_000, repeats=5):
+    program = Parser(None, RegexLexer(io.StringIO(create_program(element_count)))).parse()
+    tree_time = measure(Interpreter, program, repeats)
+    print(f"{element_count:,} elements, best of {repeats} runs")
+    print(f"tree: {tree_time:.2f}s")
+    for name, interpreter_class in (
+        ("closure", ClosureInterpreter), ("vm", VirtualMachine), ("python", TranspiledInterpreter)
+    ):
+        engine_time = measure(interpreter_class, program, repeats)
+        print(f"{name}: {engine_time:.2f}s ({tree_time / engine_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*[int(argument) for argument in sys.argv[1:3]])
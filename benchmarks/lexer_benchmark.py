@@ -0,0 +1,57 @@
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.reader import Reader
+from src.lexer.lexer import Lexer, get_tokens
+from src.lexer.regex_lexer import RegexLexer
+
+PROGRAM_PATH = os.path.join(os.path.dirname(__file__), "..", "program.ks")
+REPEATS = 3
+
+
+def create_program(copies):
+    with open(PROGRAM_PATH, "r") as file_handle:
+        program = file_handle.read()
+    program = "\n".join(line for line in program.splitlines() if "#" not in line)
+    return (program + "\n") * copies
+
+
+def create_string_program(literals, length):
+    literal = '"' + "KacperScript " * (length // 13) + '"'
+    lines = [f"    string s{index} = {literal};" for index in range(literals)]
+    return "function int main(){\n" + "\n".join(lines) + "\n    return 0;\n}\n"
+
+
+def measure(create_lexer, source):
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        tokens = get_tokens(create_lexer(source))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(tokens), best
+
+
+def main():
+    engines = {
+        "chain": lambda text: Lexer(Reader(io.StringIO(text))),
+        "regex": lambda text: RegexLexer(io.StringIO(text)),
+    }
+    workloads = {
+        "program.ks x300": create_program(300),
+        "200 string literals of ~9900 chars": create_string_program(200, 9_900),
+    }
+    for workload, source in workloads.items():
+        print(f"{workload} ({len(source):,} chars)")
+        for name, create_lexer in engines.items():
+            count, elapsed = measure(create_lexer, source)
+            print(f"{name:>8}: {count} tokens in {elapsed:.3f}s, {count / elapsed:,.0f} tokens/s, "
+                  f"{len(source) / elapsed / 1e6:.2f} Mchars/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.lexer.regex_lexer import RegexLexer
+from src.parser.parser import Parser
+from src.token.token_buffer import TokenBufferStream, tokenize
+
+
+def create_program(function_count):
+    return "\n".join(
+        f"function int helper_{index}(int value)"
+        f"{{ int result = value * {index % 97}; while (result > 0) {{ result = result - 1; }}; return result; }}"
+        for index in range(function_count)
+    ) + "\n"
+
+
+def main(function_count=20_000, workers=None):
+    buffer = tokenize(RegexLexer(io.StringIO(create_program(function_count))))
+    print(f"{function_count:,} functions, {len(buffer):,} tokens, {os.cpu_count()} cpus")
+
+    start = time.perf_counter()
+    sequential = Parser(None, TokenBufferStream(buffer)).parse()
+    print(f"parse: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    parallel = Parser(None, TokenBufferStream(buffer)).parse_parallel(workers)
+    print(f"parse_parallel({workers or os.cpu_count()}): {time.perf_counter() - start:.2f}s")
+    assert parallel == sequential
+
+
+if __name__ == "__main__":
+    main(*[int(argument) for argument in sys.argv[1:3]])
@@ -0,0 +1,47 @@
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.reader import Reader
+from src.lexer.lexer import Lexer, get_tokens
+from src.lexer.regex_lexer import RegexLexer
+from src.token.token_buffer import tokenize
+
+TOKENS_PER_FUNCTION = 23
+
+
+def create_program(token_count):
+    functions = []
+    for index in range(token_count // TOKENS_PER_FUNCTION):
+        functions.append(
+            f"function int helper_{index % 500}(int value)"
+            f"{{ int result = value * {index % 97} + 3; return result - value; }}"
+        )
+    return "\n".join(functions) + "\n"
+
+
+def main(engine="regex", token_count=1_000_000, container="list"):
+    source = create_program(token_count)
+    if engine == "chain":
+        lexer = Lexer(Reader(io.StringIO(source)))
+    else:
+        lexer = RegexLexer(io.StringIO(source))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    tokens = tokenize(lexer) if container == "buffer" else get_tokens(lexer)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{engine} ({container}): {len(tokens):,} tokens in {elapsed:.2f}s (under tracemalloc)")
+    print(f"retained: {current / 2 ** 20:.1f} MiB, {current / len(tokens):.0f} bytes/token")
+    print(f"peak: {peak / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2], *[int(argument) for argument in sys.argv[2:3]], *sys.argv[3:4])
@@ -1,26 +1,121 @@
 #!/usr/bin/env python3
 
+import argparse
 import sys
 
+from src import ast_cache
 from src.interpreter.interpreter import Interpreter
-from src.reader import Reader
+from src.interpreter.closure_interpreter import ClosureInterpreter
+from src.interpreter.transpiler import TranspiledInterpreter
+from src.interpreter.type_checker import TypeChecker
+from src.interpreter.memoization import LRUCache, MEMOIZATION_CACHE_SIZE
+from src.interpreter.tail_calls import MAXIMUM_RECURSION_DEPTH, MAXIMUM_TAIL_CALLS, run_with_recursion_limit
+from src.vm.machine import VirtualMachine
+from src.optimizer.optimizer import optimize_program
+from src.optimizer.inlining import Inliner, MAXIMUM_INLINED_SIZE
+from src.reader import open_reader
 from src.lexer.lexer import Lexer
+from src.lexer.regex_lexer import RegexLexer
 from src.parser.parser import Parser
 
+INTERPRETERS = {
+    "tree": Interpreter,
+    "closure": ClosureInterpreter,
+    "vm": VirtualMachine,
+    "python": TranspiledInterpreter,
+}
 
-def main(file):
+
+def parse_program(file, lexer_engine="chain"):
     with open(file, "r") as file_handle:
-        reader = Reader(file_handle)
-        lexer = Lexer(reader)
-        parser = Parser(reader, lexer)
-        program = parser.parse()
-        interpreter = Interpreter(program)
+        if lexer_engine == "regex":
+            return Parser(None, RegexLexer(file_handle)).parse()
+        reader = open_reader(file_handle)
         try:
-            result = interpreter.visit_program()
-            print(result)
-        except Exception as e:
-            print(e)
+            return Parser(reader, Lexer(reader)).parse()
+        finally:
+            reader.close()
+
+
+def load_program(file, lexer_engine="chain", use_cache=True):
+    if not use_cache:
+        return parse_program(file, lexer_engine)
+    with open(file, "rb") as file_handle:
+        key = ast_cache.get_cache_key(file_handle.read())
+    program = ast_cache.load_program(file, key)
+    if program is None:
+        program = parse_program(file, lexer_engine)
+        ast_cache.store_program(file, key, program)
+    return program
+
+
+def main(file, lexer_engine="chain", use_cache=True, engine="tree", type_check=False, optimize=True,
+         inline_size=MAXIMUM_INLINED_SIZE, inline_report=False, memoize=False, memoize_size=MEMOIZATION_CACHE_SIZE,
+         recursion_limit=MAXIMUM_RECURSION_DEPTH, tail_call_limit=MAXIMUM_TAIL_CALLS):
+    program = load_program(file, lexer_engine, use_cache)
+    if optimize:
+        inliner = Inliner(inline_size)
+        program = optimize_program(program, inliner)
+        if inline_report:
+            for (line, column), name in sorted(inliner.inlined_calls.items()):
+                print(f"Inlined call to {name}, line: {line} at column: {column}")
+    if type_check:
+        type_errors = TypeChecker().check_program(program)
+        for type_error in type_errors:
+            print(type_error)
+        if type_errors:
+            return
+    options = {"maximum_recursion_depth": recursion_limit, "maximum_tail_calls": tail_call_limit}
+    if memoize:
+        memoization_cache = LRUCache(memoize_size)
+        options["memoization_cache"] = memoization_cache
+    interpreter = INTERPRETERS[engine](program, **options)
+    try:
+        result = run_with_recursion_limit(interpreter.visit_program, recursion_limit)
+        print(result)
+    except Exception as e:
+        print(e)
+    if memoize:
+        print(f"Memoization cache: {memoization_cache.hits} hits, {memoization_cache.misses} misses")
+
+
+def parse_arguments(arguments):
+    argument_parser = argparse.ArgumentParser(description="KacperScript interpreter")
+    argument_parser.add_argument("file", nargs="?", default="program.ks")
+    argument_parser.add_argument("--lexer", choices=["chain", "regex"], default="chain")
+    argument_parser.add_argument("--no-cache", action="store_true",
+                                 help=f"do not read or write the {ast_cache.CACHE_DIRECTORY} directory")
+    argument_parser.add_argument("--engine", choices=list(INTERPRETERS), default="tree")
+    argument_parser.add_argument("--type-check", action="store_true",
+                                 help="report statically detected type errors and do not run a program with any")
+    argument_parser.add_argument("--no-optimize", action="store_true",
+                                 help="run the program as parsed, without folding constants")
+    argument_parser.add_argument("--inline-size", type=int, default=MAXIMUM_INLINED_SIZE,
+                                 help="largest function body, in syntax tree nodes, that is inlined at its calls")
+    argument_parser.add_argument("--inline-report", action="store_true",
+                                 help="list the calls that were inlined before running the program")
+    argument_parser.add_argument("--memoize", action="store_true",
+                                 help="reuse results of pure functions called again with equal arguments (tree engine)")
+    argument_parser.add_argument("--memoize-size", type=int, default=MEMOIZATION_CACHE_SIZE,
+                                 help="number of results kept by --memoize, the least recently used are dropped")
+    argument_parser.add_argument("--recursion-limit", type=int, default=MAXIMUM_RECURSION_DEPTH,
+                                 help="deepest allowed nesting of function calls, tail calls do not nest")
+    argument_parser.add_argument("--tail-call-limit", type=int, default=MAXIMUM_TAIL_CALLS,
+                                 help="most tail calls a function may chain before the program is stopped")
+    parsed_arguments = argument_parser.parse_args(arguments)
+    if parsed_arguments.memoize and parsed_arguments.engine != "tree":
+        argument_parser.error("--memoize is only supported by the tree engine")
+    if parsed_arguments.memoize_size < 1:
+        argument_parser.error("--memoize-size must be at least 1")
+    if parsed_arguments.recursion_limit < 1:
+        argument_parser.error("--recursion-limit must be at least 1")
+    if parsed_arguments.tail_call_limit < 1:
+        argument_parser.error("--tail-call-limit must be at least 1")
+    return parsed_arguments
 
 
 if __name__ == '__main__':
-    main("program.ks")
+    arguments = parse_arguments(sys.argv[1:])
+    main(arguments.file, arguments.lexer, not arguments.no_cache, arguments.engine, arguments.type_check,
+         not arguments.no_optimize, arguments.inline_size, arguments.inline_report, arguments.memoize,
+         arguments.memoize_size, arguments.recursion_limit, arguments.tail_call_limit)
@@ -2,8 +2,60 @@ from abc import ABC, abstractmethod
 
 
 class Node(ABC):
+    __slots__ = ("line", "column", "structural_hash")
+
     @abstractmethod
     def __init__(self, line: int = None, column: int = None):
         self.line = line
         self.column = column
-        self.position = line, column
\ No newline at end of file
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # defining __eq__ sets __hash__ to None, the structural hash below matches every __eq__
+        if cls.__dict__.get("__hash__", Node.__hash__) is None:
+            cls.__hash__ = Node.__hash__
+
+    @property
+    def position(self):
+        return self.line, self.column
+
+    def get_node_class(self):
+        return type(self)
+
+    def get_fields(self):
+        return [getattr(self, name) for name in self.get_node_class().__slots__]
+
+    def __hash__(self):
+        # cached, so fields must not change once the node was hashed; positions are not part of it
+        try:
+            return self.structural_hash
+        except AttributeError:
+            self.structural_hash = hash((self.get_node_class(), *map(get_hashable, self.get_fields())))
+            return self.structural_hash
+
+    def __getstate__(self):
+        # the cached hash depends on the per-process string hash seed, so it is never copied
+        state = {name: getattr(self, name) for name in self.__slots__}
+        if hasattr(self, "line"):
+            state["line"] = self.line
+            state["column"] = self.column
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class AnnotatedNode(Node):
+    # filled in by the static passes, so they are not fields and take no part in equality, hashing or serialization
+    __slots__ = ("frame_layout", "slot", "type_proven", "tail_call")
+
+    @abstractmethod
+    def __init__(self, line: int = None, column: int = None):
+        super().__init__(line, column)
+
+
+def get_hashable(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(map(get_hashable, value))
+    return value
@@ -0,0 +1,179 @@
+import marshal
+from array import array
+
+from .abstract_node import Node, AnnotatedNode
+from .serializer import NODE_FIELDS, NODE_CLASSES, NODE_TAGS, TYPE_NODE_CLASSES
+
+MAGIC = b"KSARENA\x01"
+
+# every field value is a single integer: its kind in the low bits and an index above them
+VALUE_BITS = 3
+VALUE_MASK = (1 << VALUE_BITS) - 1
+VALUE_NODE = 0
+VALUE_CONSTANT = 1
+VALUE_LIST = 2
+VALUE_TUPLE = 3
+VALUE_CLASS = 4
+
+NO_POSITION = -2 ** 31
+
+ARRAY_NAMES = ("kinds", "lines", "columns", "field_starts", "values", "sequence_starts", "sequence_lengths")
+ARRAY_TYPECODES = ("B", "i", "i", "I", "I", "I", "I")
+
+
+class AstArena:
+    def __init__(self):
+        self.kinds = array("B")
+        self.lines = array("i")
+        self.columns = array("i")
+        self.field_starts = array("I")
+        self.values = array("I")
+        self.sequence_starts = array("I")
+        self.sequence_lengths = array("I")
+        self.constants = []
+        self.constant_indexes = {}
+        self.annotations = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @classmethod
+    def from_tree(cls, tree):
+        arena = cls()
+        arena.root = arena.add_value(tree)
+        return arena
+
+    def add_value(self, value):
+        if isinstance(value, Node):
+            return self.add_node(value) << VALUE_BITS | VALUE_NODE
+        elif isinstance(value, (list, tuple)):
+            items = [self.add_value(item) for item in value]
+            index = len(self.sequence_starts)
+            self.sequence_starts.append(len(self.values))
+            self.sequence_lengths.append(len(items))
+            self.values.extend(items)
+            return index << VALUE_BITS | (VALUE_LIST if isinstance(value, list) else VALUE_TUPLE)
+        elif isinstance(value, type) and value in NODE_TAGS:
+            return NODE_TAGS[value] << VALUE_BITS | VALUE_CLASS
+        key = (type(value), value)
+        index = self.constant_indexes.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constant_indexes[key] = index
+            self.constants.append(value)
+        return index << VALUE_BITS | VALUE_CONSTANT
+
+    def add_node(self, node):
+        fields = [self.add_value(value) for value in node.get_fields()] if not isinstance(node, TYPE_NODE_CLASSES) else []
+        index = len(self.kinds)
+        self.kinds.append(NODE_TAGS[type(node)])
+        line = getattr(node, "line", None)
+        column = getattr(node, "column", None)
+        if type(line) is int and type(column) is int:
+            self.lines.append(line)
+            self.columns.append(column)
+        else:
+            self.lines.append(NO_POSITION)
+            self.columns.append(NO_POSITION)
+        self.field_starts.append(len(self.values))
+        self.values.extend(fields)
+        return index
+
+    def get_root(self):
+        return self.get_value(self.root)
+
+    def get_node(self, index):
+        node_class = NODE_CLASSES[self.kinds[index]]
+        if node_class in TYPE_NODE_CLASSES:
+            return node_class()
+        proxy_class = PROXY_CLASSES[node_class]
+        proxy = proxy_class.__new__(proxy_class)
+        proxy.arena = self
+        proxy.index = index
+        return proxy
+
+    def get_value(self, value):
+        kind = value & VALUE_MASK
+        index = value >> VALUE_BITS
+        if kind == VALUE_NODE:
+            return self.get_node(index)
+        elif kind == VALUE_CONSTANT:
+            return self.constants[index]
+        elif kind == VALUE_CLASS:
+            return NODE_CLASSES[index]
+        start = self.sequence_starts[index]
+        items = [self.get_value(item) for item in self.values[start:start + self.sequence_lengths[index]]]
+        return items if kind == VALUE_LIST else tuple(items)
+
+    def get_field(self, index, field_index):
+        return self.get_value(self.values[self.field_starts[index] + field_index])
+
+    def get_line(self, index):
+        line = self.lines[index]
+        return None if line == NO_POSITION else line
+
+    def get_annotation(self, index, name):
+        return self.annotations[index, name]
+
+    def set_annotation(self, index, name, value):
+        self.annotations[index, name] = value
+
+    def get_column(self, index):
+        column = self.columns[index]
+        return None if column == NO_POSITION else column
+
+    def to_bytes(self):
+        header = marshal.dumps((self.root, [len(getattr(self, name)) for name in ARRAY_NAMES], tuple(self.constants)))
+        parts = [MAGIC, len(header).to_bytes(4, "little"), header]
+        offset = sum(map(len, parts))
+        for name in ARRAY_NAMES:
+            data = getattr(self, name).tobytes()
+            padding = -offset % 8
+            parts += (bytes(padding), data)
+            offset += padding + len(data)
+        return b"".join(parts)
+
+    @classmethod
+    def from_buffer(cls, buffer):
+        # arrays are read in place through memoryviews, so a shared memory block is not copied
+        view = memoryview(buffer)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a KacperScript AST arena")
+        offset = len(MAGIC) + 4
+        header_length = int.from_bytes(view[len(MAGIC):offset], "little")
+        root, lengths, constants = marshal.loads(view[offset:offset + header_length])
+        offset += header_length
+        arena = cls()
+        arena.root = root
+        arena.constants = list(constants)
+        for name, typecode, length in zip(ARRAY_NAMES, ARRAY_TYPECODES, lengths):
+            offset += -offset % 8
+            size = array(typecode).itemsize * length
+            setattr(arena, name, view[offset:offset + size].cast(typecode))
+            offset += size
+        return arena
+
+
+def create_proxy_class(node_class):
+    namespace = {
+        "__slots__": ("arena", "index"),
+        "get_node_class": lambda self: node_class,
+        "line": property(lambda self: self.arena.get_line(self.index)),
+        "column": property(lambda self: self.arena.get_column(self.index)),
+    }
+    for field_index, field in enumerate(NODE_FIELDS[node_class]):
+        namespace[field] = property(lambda self, field_index=field_index: self.arena.get_field(self.index, field_index))
+    if issubclass(node_class, AnnotatedNode):
+        # proxies are created on every access, so annotations live in the arena
+        for name in AnnotatedNode.__slots__:
+            namespace[name] = property(
+                lambda self, name=name: self.arena.get_annotation(self.index, name),
+                lambda self, value, name=name: self.arena.set_annotation(self.index, name, value),
+            )
+    return type(f"{node_class.__name__}Proxy", (node_class,), namespace)
+
+
+PROXY_CLASSES = {
+    node_class: create_proxy_class(node_class)
+    for node_class in NODE_CLASSES if node_class not in TYPE_NODE_CLASSES
+}
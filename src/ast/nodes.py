@@ -1,7 +1,9 @@
-from .abstract_node import Node
+from .abstract_node import Node, AnnotatedNode
 
 
 class Program(Node):
+    __slots__ = ("program_body",)
+
     def __init__(self, program_body=None):
         super().__init__()
         if not program_body:
@@ -25,7 +27,9 @@ class Program(Node):
         return visitor.visit_program(self)
 
 
-class Variable(Node):
+class Variable(AnnotatedNode):
+    __slots__ = ("name",)
+
     def __init__(self, name, line=None, column=None):
         super().__init__(line, column)
         self.name = name
@@ -44,6 +48,8 @@ class Variable(Node):
 
 
 class StatementBlock(Node):
+    __slots__ = ("statements",)
+
     def __init__(self, statements, line=None, column=None):
         super().__init__()
         self.statements = statements
@@ -62,6 +68,8 @@ class StatementBlock(Node):
 
 
 class SingleStatement(Node):
+    __slots__ = ("statement",)
+
     def __init__(self, statement, line=None, column=None):
         super().__init__()
         self.statement = statement
@@ -77,6 +85,8 @@ class SingleStatement(Node):
 
 
 class BoolValue(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value, line=None, column=None):
         super().__init__(line, column)
         self.value = value
@@ -95,6 +105,8 @@ class BoolValue(Node):
 
 
 class IntValue(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value, line=None, column=None):
         super().__init__(line, column)
         self.value = value
@@ -113,6 +125,8 @@ class IntValue(Node):
 
 
 class FloatValue(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value, line=None, column=None):
         super().__init__(line, column)
         self.value = value
@@ -131,6 +145,8 @@ class FloatValue(Node):
 
 
 class StringValue(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value, line=None, column=None):
         super().__init__(line, column)
         self.value = value
@@ -149,6 +165,8 @@ class StringValue(Node):
 
 
 class Identifier(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value, line=None, column=None):
         super().__init__(line, column)
         self.value = value
@@ -167,6 +185,8 @@ class Identifier(Node):
 
 
 class Expression(Node):
+    __slots__ = ("left_operand", "operation", "right_operand")
+
     def __init__(self, left_operand, operation, right_operand, line=None, column=None):
         super().__init__(line, column)
         self.left_operand = left_operand
@@ -189,6 +209,8 @@ class Expression(Node):
 
 
 class FunctionBody(Node):
+    __slots__ = ("content", "return_statement")
+
     def __init__(self, content, return_statement, line=None, column=None):
         super().__init__(line, column)
         self.content = content
@@ -209,6 +231,8 @@ class FunctionBody(Node):
 
 
 class FunctionCall(Node):
+    __slots__ = ("identifier", "arguments")
+
     def __init__(self, identifier, arguments, line=None, column=None):
         super().__init__(line, column)
         self.identifier = identifier
@@ -229,6 +253,8 @@ class FunctionCall(Node):
 
 
 class MethodCall(Node):
+    __slots__ = ("expression", "method_identifier", "arguments")
+
     def __init__(self, expression, method_identifier, arguments, line=None, column=None):
         super().__init__(line, column)
         self.expression = expression
@@ -250,7 +276,9 @@ class MethodCall(Node):
         return visitor.visit_method_call(self)
 
 
-class FunctionDefinition(Node):
+class FunctionDefinition(AnnotatedNode):
+    __slots__ = ("return_type", "identifier", "arguments", "body")
+
     def __init__(self, type, identifier, arguments, body, line=None, column=None):
         super().__init__(line, column)
         self.return_type = type
@@ -274,7 +302,9 @@ class FunctionDefinition(Node):
         return visitor.visit_function_definition(self)
 
 
-class IfStatement(Node):
+class IfStatement(AnnotatedNode):
+    __slots__ = ("condition", "true_statement", "false_statement")
+
     def __init__(self, condition, true_statement, false_statement, line=None, column=None):
         super().__init__(line, column)
         self.condition = condition
@@ -297,6 +327,8 @@ class IfStatement(Node):
 
 
 class Body(Node):
+    __slots__ = ("content",)
+
     def __init__(self, content, line=None, column=None):
         super().__init__(line, column)
         self.content = content
@@ -314,7 +346,9 @@ class Body(Node):
         return visitor.visit_body(self)
 
 
-class ForStatement(Node):
+class ForStatement(AnnotatedNode):
+    __slots__ = ("type", "identifier", "collection", "body")
+
     def __init__(self, type, identifier, collection, body, line=None, column=None):
         super().__init__(line, column)
         self.type = type
@@ -339,6 +373,8 @@ class ForStatement(Node):
 
 
 class ForSortedStatement(Node):
+    __slots__ = ("type", "identifier", "collection", "key_identifier", "body")
+
     def __init__(self, type, identifier, collection, key_identifier, body, line=None, column=None):
         super().__init__(line, column)
         self.type = type
@@ -364,7 +400,9 @@ class ForSortedStatement(Node):
         return visitor.visit_for_sorted_statement(self)
 
 
-class WhileStatement(Node):
+class WhileStatement(AnnotatedNode):
+    __slots__ = ("condition", "body")
+
     def __init__(self, condition, body, line, column):
         super().__init__(line, column)
         self.condition = condition
@@ -384,7 +422,9 @@ class WhileStatement(Node):
         return visitor.visit_while_statement(self)
 
 
-class LINQ(Node):
+class LINQ(AnnotatedNode):
+    __slots__ = ("from_statement", "where_statement", "select_statement", "orderby_statement")
+
     def __init__(self, from_statement, where_statement, select_statement, orderby_statement, line=None, column=None):
         super().__init__(line, column)
         self.from_statement = from_statement
@@ -409,6 +449,8 @@ class LINQ(Node):
 
 
 class AndExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -446,6 +488,8 @@ class AndExpression(Node):
 
 
 class OrExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -466,6 +510,8 @@ class OrExpression(Node):
 
 
 class AddExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -486,6 +532,8 @@ class AddExpression(Node):
 
 
 class SubExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -506,6 +554,8 @@ class SubExpression(Node):
 
 
 class MultiplyExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -526,6 +576,8 @@ class MultiplyExpression(Node):
 
 
 class DivisionExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -546,6 +598,8 @@ class DivisionExpression(Node):
 
 
 class LessThanExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -566,6 +620,8 @@ class LessThanExpression(Node):
 
 
 class LessThanOrEqualExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -586,6 +642,8 @@ class LessThanOrEqualExpression(Node):
 
 
 class GreaterThanExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -606,6 +664,8 @@ class GreaterThanExpression(Node):
 
 
 class GreaterThanOrEqualExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -626,6 +686,8 @@ class GreaterThanOrEqualExpression(Node):
 
 
 class EqualExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -646,6 +708,8 @@ class EqualExpression(Node):
 
 
 class NotEqualExpression(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left_term, right_term, line=None, column=None):
         super().__init__(line, column)
         self.left = left_term
@@ -665,7 +729,9 @@ class NotEqualExpression(Node):
         return visitor.visit_not_equal_expression(self)
 
 
-class Assignment(Node):
+class Assignment(AnnotatedNode):
+    __slots__ = ("identifier", "expression")
+
     def __init__(self, identifier, expression, line=None, column=None):
         super().__init__(line, column)
         self.identifier = identifier
@@ -686,6 +752,8 @@ class Assignment(Node):
 
 
 class Arguments(Node):
+    __slots__ = ("arguments",)
+
     def __init__(self, arguments, line=None, column=None):
         super().__init__(line, column)
         self.arguments = arguments
@@ -703,7 +771,9 @@ class Arguments(Node):
         return visitor.visit_arguments(self)
 
 
-class ReturnStatement(Node):
+class ReturnStatement(AnnotatedNode):
+    __slots__ = ("expression",)
+
     def __init__(self, expression, line=None, column=None):
         super().__init__(line, column)
         self.expression = expression
@@ -721,7 +791,9 @@ class ReturnStatement(Node):
         return visitor.visit_return_statement(self)
 
 
-class InitStatement(Node):
+class InitStatement(AnnotatedNode):
+    __slots__ = ("type", "identifier", "expression")
+
     def __init__(self, type, identifier, expression, line=None, column=None):
         super().__init__(line, column)
         self.type = type
@@ -744,6 +816,8 @@ class InitStatement(Node):
 
 
 class Declaration(Node):
+    __slots__ = ("type", "identifier")
+
     def __init__(self, type, identifier, line=None, column=None):
         super().__init__(line, column)
         self.type = type
@@ -764,6 +838,8 @@ class Declaration(Node):
 
 
 class ListType(Node):
+    __slots__ = ("type",)
+
     def __init__(self, type, line=None, column=None):
         super().__init__(line, column)
         self.type = type
@@ -782,6 +858,8 @@ class ListType(Node):
 
 
 class PairType(Node):
+    __slots__ = ("type_1", "type_2")
+
     def __init__(self, type_1, type_2, line=None, column=None):
         super().__init__(line, column)
         self.type_1 = type_1
@@ -802,6 +880,8 @@ class PairType(Node):
 
 
 class DictType(Node):
+    __slots__ = ("key_type", "value_type")
+
     def __init__(self, key_type, value_type, line=None, column=None):
         super().__init__(line, column)
         self.key_type = key_type
@@ -822,6 +902,8 @@ class DictType(Node):
 
 
 class IntType(Node):
+    __slots__ = ("value",)
+
     def __init__(self, line=None, column=None):
         self.value = int
 
@@ -838,6 +920,8 @@ class IntType(Node):
 
 
 class StringType(Node):
+    __slots__ = ("value",)
+
     def __init__(self, line=None, column=None):
         self.value = str
 
@@ -854,6 +938,8 @@ class StringType(Node):
 
 
 class FloatType(Node):
+    __slots__ = ("value",)
+
     def __init__(self, line=None, column=None):
         self.value = float
 
@@ -870,6 +956,8 @@ class FloatType(Node):
 
 
 class BoolType(Node):
+    __slots__ = ("value",)
+
     def __init__(self, line=None, column=None):
         self.value = bool
 
@@ -886,6 +974,8 @@ class BoolType(Node):
 
 
 class List(Node):
+    __slots__ = ("elements",)
+
     def __init__(self, elements, line=None, column=None):
         super().__init__(line, column)
         self.elements = elements
@@ -904,6 +994,8 @@ class List(Node):
 
 
 class Pair(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right, line=None, column=None):
         super().__init__(line, column)
         self.left = left
@@ -924,6 +1016,8 @@ class Pair(Node):
 
 
 class Dict(Node):
+    __slots__ = ("pairs",)
+
     def __init__(self, pairs, line=None, column=None):
         super().__init__(line, column)
         self.pairs = pairs
@@ -939,3 +1033,111 @@ class Dict(Node):
 
     def accept(self, visitor):
         return visitor.visit_dict(self)
+
+
+class InvariantLoop(Node):
+    __slots__ = ("loop", "invariant_count")
+
+    def __init__(self, loop, invariant_count, line=None, column=None):
+        super().__init__(line, column)
+        self.loop = loop
+        self.invariant_count = invariant_count
+
+    def __repr__(self):
+        return f"[InvariantLoop {self.loop} {self.invariant_count}]"
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, InvariantLoop) and
+            other.loop == self.loop and
+            other.invariant_count == self.invariant_count
+        )
+
+    def accept(self, visitor):
+        return visitor.visit_invariant_loop(self)
+
+
+class InvariantExpression(Node):
+    __slots__ = ("expression", "invariant_index")
+
+    def __init__(self, expression, invariant_index, line=None, column=None):
+        super().__init__(line, column)
+        self.expression = expression
+        self.invariant_index = invariant_index
+
+    def __repr__(self):
+        return f"[InvariantExpression {self.expression} {self.invariant_index}]"
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, InvariantExpression) and
+            other.expression == self.expression and
+            other.invariant_index == self.invariant_index
+        )
+
+    def accept(self, visitor):
+        return visitor.visit_invariant_expression(self)
+
+
+class InlinedCall(Node):
+    __slots__ = ("function_call", "body")
+
+    def __init__(self, function_call, body, line=None, column=None):
+        super().__init__(line, column)
+        self.function_call = function_call
+        self.body = body
+
+    def __repr__(self):
+        return f"[InlinedCall {self.function_call} {self.body}]"
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, InlinedCall) and
+            other.function_call == self.function_call and
+            other.body == self.body
+        )
+
+    def accept(self, visitor):
+        return visitor.visit_inlined_call(self)
+
+
+class InlinedReturn(AnnotatedNode):
+    __slots__ = ("expression", "return_type")
+
+    def __init__(self, expression, return_type, line=None, column=None):
+        super().__init__(line, column)
+        self.expression = expression
+        self.return_type = return_type
+
+    def __repr__(self):
+        return f"[InlinedReturn {self.expression} {self.return_type}]"
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, InlinedReturn) and
+            other.expression == self.expression and
+            other.return_type == self.return_type
+        )
+
+    def accept(self, visitor):
+        return visitor.visit_inlined_return(self)
+
+
+class InlinedArgument(Node):
+    __slots__ = ("argument_index",)
+
+    def __init__(self, argument_index, line=None, column=None):
+        super().__init__(line, column)
+        self.argument_index = argument_index
+
+    def __repr__(self):
+        return f"[InlinedArgument {self.argument_index}]"
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, InlinedArgument) and
+            other.argument_index == self.argument_index
+        )
+
+    def accept(self, visitor):
+        return visitor.visit_inlined_argument(self)
@@ -0,0 +1,222 @@
+import gc
+import marshal
+from array import array
+
+from .nodes import *
+
+MAGIC = b"KSAST\x01"
+
+NODE_FIELDS = {
+    Program: ("program_body",),
+    Variable: ("name",),
+    StatementBlock: ("statements",),
+    SingleStatement: ("statement",),
+    BoolValue: ("value",),
+    IntValue: ("value",),
+    FloatValue: ("value",),
+    StringValue: ("value",),
+    Identifier: ("value",),
+    Expression: ("left_operand", "operation", "right_operand"),
+    FunctionBody: ("content", "return_statement"),
+    FunctionCall: ("identifier", "arguments"),
+    MethodCall: ("expression", "method_identifier", "arguments"),
+    FunctionDefinition: ("return_type", "identifier", "arguments", "body"),
+    IfStatement: ("condition", "true_statement", "false_statement"),
+    Body: ("content",),
+    ForStatement: ("type", "identifier", "collection", "body"),
+    ForSortedStatement: ("type", "identifier", "collection", "key_identifier", "body"),
+    WhileStatement: ("condition", "body"),
+    LINQ: ("from_statement", "where_statement", "select_statement", "orderby_statement"),
+    AndExpression: ("left", "right"),
+    OrExpression: ("left", "right"),
+    AddExpression: ("left", "right"),
+    SubExpression: ("left", "right"),
+    MultiplyExpression: ("left", "right"),
+    DivisionExpression: ("left", "right"),
+    LessThanExpression: ("left", "right"),
+    LessThanOrEqualExpression: ("left", "right"),
+    GreaterThanExpression: ("left", "right"),
+    GreaterThanOrEqualExpression: ("left", "right"),
+    EqualExpression: ("left", "right"),
+    NotEqualExpression: ("left", "right"),
+    Assignment: ("identifier", "expression"),
+    Arguments: ("arguments",),
+    ReturnStatement: ("expression",),
+    InitStatement: ("type", "identifier", "expression"),
+    Declaration: ("type", "identifier"),
+    ListType: ("type",),
+    PairType: ("type_1", "type_2"),
+    DictType: ("key_type", "value_type"),
+    List: ("elements",),
+    Pair: ("left", "right"),
+    Dict: ("pairs",),
+    IntType: (),
+    StringType: (),
+    FloatType: (),
+    BoolType: (),
+    InvariantLoop: ("loop", "invariant_count"),
+    InvariantExpression: ("expression", "invariant_index"),
+    InlinedCall: ("function_call", "body"),
+    InlinedReturn: ("expression", "return_type"),
+    InlinedArgument: ("argument_index",),
+}
+
+NODE_CLASSES = list(NODE_FIELDS)
+NODE_TAGS = {node_class: tag for tag, node_class in enumerate(NODE_CLASSES)}
+TYPE_NODE_CLASSES = (IntType, StringType, FloatType, BoolType)
+
+# every instruction is a single integer: an opcode in the low bits and its argument above them
+OPCODE_BITS = 3
+OPCODE_MASK = (1 << OPCODE_BITS) - 1
+OP_CONSTANT = 0
+OP_LIST = 1
+OP_TUPLE = 2
+OP_CLASS = 3
+OP_NODE = 4
+OP_NODE_WITHOUT_POSITION = 5
+OP_TYPE_NODE = 6
+
+UNSIGNED_TYPECODES = "BHIQ"
+SIGNED_TYPECODES = "bhiq"
+
+
+class Encoder:
+    def __init__(self):
+        self.codes = []
+        self.positions = []
+        self.constants = []
+        self.constant_indexes = {}
+        self.line = 0
+
+    def encode(self, value):
+        if isinstance(value, Node):
+            self.encode_node(value)
+        elif isinstance(value, list):
+            for item in value:
+                self.encode(item)
+            self.codes.append(len(value) << OPCODE_BITS | OP_LIST)
+        elif isinstance(value, tuple):
+            for item in value:
+                self.encode(item)
+            self.codes.append(len(value) << OPCODE_BITS | OP_TUPLE)
+        elif isinstance(value, type) and value in NODE_TAGS:
+            self.codes.append(NODE_TAGS[value] << OPCODE_BITS | OP_CLASS)
+        else:
+            self.codes.append(self.get_constant_index(value) << OPCODE_BITS | OP_CONSTANT)
+
+    def encode_node(self, node):
+        tag = NODE_TAGS[type(node)]
+        if isinstance(node, TYPE_NODE_CLASSES):
+            self.codes.append(tag << OPCODE_BITS | OP_TYPE_NODE)
+            return
+        for field in NODE_FIELDS[type(node)]:
+            self.encode(getattr(node, field))
+        if type(node.line) is int and type(node.column) is int:
+            self.codes.append(tag << OPCODE_BITS | OP_NODE)
+            self.positions += (node.line - self.line, node.column)
+            self.line = node.line
+        else:
+            self.codes.append(tag << OPCODE_BITS | OP_NODE_WITHOUT_POSITION)
+            self.positions += (self.get_constant_index(node.line), self.get_constant_index(node.column))
+
+    def get_constant_index(self, value):
+        key = (type(value), value)
+        index = self.constant_indexes.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constant_indexes[key] = index
+            self.constants.append(value)
+        return index
+
+
+def to_array(values, typecodes):
+    low = min(values, default=0)
+    high = max(values, default=0)
+    for typecode in typecodes:
+        values_array = array(typecode)
+        limit = 1 << (8 * values_array.itemsize - (typecode in SIGNED_TYPECODES))
+        if high < limit and low >= -limit * (typecode in SIGNED_TYPECODES):
+            values_array.fromlist(values)
+            return typecode, values_array.tobytes()
+    raise OverflowError("Value too large to serialize")
+
+
+def dumps(tree):
+    encoder = Encoder()
+    encoder.encode(tree)
+    return MAGIC + marshal.dumps((
+        *to_array(encoder.codes, UNSIGNED_TYPECODES),
+        *to_array(encoder.positions, SIGNED_TYPECODES),
+        tuple(encoder.constants),
+    ))
+
+
+def loads(data):
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a serialized KacperScript tree")
+    # every node built here is kept, so collecting garbage in between only costs time
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return decode(data)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def decode(data):
+    codes_typecode, codes_bytes, positions_typecode, positions_bytes, constants = marshal.loads(data[len(MAGIC):])
+    codes = array(codes_typecode)
+    codes.frombytes(codes_bytes)
+    positions = array(positions_typecode)
+    positions.frombytes(positions_bytes)
+    next_position = iter(positions).__next__
+
+    # nodes are rebuilt through their constructors, which take the fields in NODE_FIELDS order
+    field_counts = [len(NODE_FIELDS[node_class]) for node_class in NODE_CLASSES]
+    stack = []
+    line = 0
+    for code in codes:
+        opcode = code & OPCODE_MASK
+        argument = code >> OPCODE_BITS
+        if opcode == OP_CONSTANT:
+            stack.append(constants[argument])
+        elif opcode == OP_NODE:
+            line += next_position()
+            field_count = field_counts[argument]
+            if field_count == 1:
+                stack[-1] = NODE_CLASSES[argument](stack[-1], line, next_position())
+            else:
+                values = stack[-field_count:]
+                del stack[-field_count:]
+                stack.append(NODE_CLASSES[argument](*values, line, next_position()))
+        elif opcode == OP_LIST:
+            if argument:
+                values = stack[-argument:]
+                del stack[-argument:]
+                stack.append(values)
+            else:
+                stack.append([])
+        elif opcode == OP_TUPLE:
+            values = tuple(stack[-argument:]) if argument else ()
+            del stack[len(stack) - argument:]
+            stack.append(values)
+        elif opcode == OP_CLASS:
+            stack.append(NODE_CLASSES[argument])
+        elif opcode == OP_TYPE_NODE:
+            stack.append(NODE_CLASSES[argument]())
+        else:
+            stack.append(build_node(NODE_CLASSES[argument], stack, field_counts[argument],
+                                    constants[next_position()], constants[next_position()]))
+    return stack.pop()
+
+
+def build_node(node_class, stack, field_count, line, column):
+    values = stack[len(stack) - field_count:]
+    del stack[len(stack) - field_count:]
+    node = node_class.__new__(node_class)
+    for field, value in zip(NODE_FIELDS[node_class], values):
+        setattr(node, field, value)
+    node.line = line
+    node.column = column
+    return node
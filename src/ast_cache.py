@@ -0,0 +1,77 @@
+import glob
+import hashlib
+import os
+import sys
+
+from src.ast import serializer
+
+CACHE_DIRECTORY = "__kscache__"
+CACHE_FORMAT = 2
+CACHE_EXTENSION = ".ksast"
+CACHED_PACKAGES = ("ast", "lexer", "parser", "token")
+SOURCE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+interpreter_version = None
+
+
+def get_interpreter_version():
+    # cache entries are invalidated by any change to the code that builds the tree
+    global interpreter_version
+    if interpreter_version is None:
+        digest = hashlib.sha256(f"{CACHE_FORMAT} {sys.version_info[:2]}".encode())
+        paths = [os.path.join(SOURCE_DIRECTORY, "reader.py")]
+        for package in CACHED_PACKAGES:
+            paths.extend(glob.glob(os.path.join(SOURCE_DIRECTORY, package, "*.py")))
+        for path in sorted(paths):
+            with open(path, "rb") as file_handle:
+                digest.update(os.path.relpath(path, SOURCE_DIRECTORY).encode())
+                digest.update(file_handle.read())
+        interpreter_version = digest.hexdigest()
+    return interpreter_version
+
+
+def get_cache_key(source):
+    return hashlib.sha256(get_interpreter_version().encode() + source).hexdigest()
+
+
+def get_cache_directory(script_path):
+    return os.path.join(os.path.dirname(os.path.abspath(script_path)), CACHE_DIRECTORY)
+
+
+def get_cache_path(script_path, key):
+    return os.path.join(get_cache_directory(script_path), f"{os.path.basename(script_path)}.{key[:32]}{CACHE_EXTENSION}")
+
+
+def load_program(script_path, key):
+    try:
+        with open(get_cache_path(script_path, key), "rb") as file_handle:
+            if file_handle.readline() != key.encode() + b"\n":
+                return None
+            return serializer.loads(file_handle.read())
+    except Exception:
+        # a missing, damaged or incompatible entry is treated as a miss and overwritten later
+        return None
+
+
+def store_program(script_path, key, program):
+    path = get_cache_path(script_path, key)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temporary_path, "wb") as file_handle:
+            file_handle.write(key.encode() + b"\n")
+            file_handle.write(serializer.dumps(program))
+        os.replace(temporary_path, path)
+    except (OSError, RecursionError, OverflowError, ValueError, KeyError):
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        return False
+
+    pattern = glob.escape(os.path.basename(script_path)) + ".*" + CACHE_EXTENSION
+    for stale_path in glob.glob(os.path.join(glob.escape(get_cache_directory(script_path)), pattern)):
+        if stale_path != path:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+    return True
@@ -0,0 +1,572 @@
+import operator
+
+from src.exceptions.interpreter_exception import (
+    WrongTypeError,
+    DifferentTypesListError,
+    UndefinedVariableError,
+    WrongTypeReturnError,
+    FunctionAlreadyDefinedError,
+    FunctionNotDefinedError,
+    ZeroDivisionError,
+    MaximumIterationsExceededError,
+    MaximumRecursionExceededError,
+)
+from src.interpreter.interpreter import BUILTIN_METHODS
+from src.interpreter.tail_calls import (
+    MAXIMUM_RECURSION_DEPTH,
+    MAXIMUM_TAIL_CALLS,
+    TailCall,
+    mark_tail_calls,
+    run_tail_calls,
+)
+from src.ast.nodes import *
+
+MAXIMUM_ITERATIONS = 100
+
+PYTHON_TYPES = {
+    IntType: int,
+    FloatType: float,
+    BoolType: bool,
+    StringType: str,
+}
+
+BUILTIN_FUNCTIONS = {
+    'print': lambda arguments: print(*arguments) or arguments,
+    'get_int': lambda arguments: int(arguments[0]),
+    'get_float': lambda arguments: float(arguments[0]),
+    'get_string': lambda arguments: str(arguments[0]),
+}
+
+COMPILE_METHODS = {
+    StatementBlock: "compile_statement_block",
+    BoolValue: "compile_value",
+    IntValue: "compile_value",
+    FloatValue: "compile_value",
+    StringValue: "compile_value",
+    Identifier: "compile_value",
+    Expression: "compile_expression",
+    Variable: "compile_variable",
+    FunctionCall: "compile_function_call",
+    MethodCall: "compile_method_call",
+    FunctionDefinition: "compile_function_definition",
+    IfStatement: "compile_if_statement",
+    WhileStatement: "compile_while_statement",
+    ForStatement: "compile_for_statement",
+    LINQ: "compile_linq",
+    AndExpression: "compile_and_expression",
+    OrExpression: "compile_or_expression",
+    DivisionExpression: "compile_division_expression",
+    Assignment: "compile_assignment",
+    Arguments: "compile_arguments",
+    ReturnStatement: "compile_return_statement",
+    InitStatement: "compile_init_statement",
+    Declaration: "compile_declaration",
+    List: "compile_list",
+    Pair: "compile_pair",
+    Dict: "compile_dict",
+    InvariantLoop: "compile_invariant_loop",
+    InvariantExpression: "compile_invariant_expression",
+    InlinedCall: "compile_inlined_call",
+}
+
+BINARY_OPERATIONS = {
+    AddExpression: operator.add,
+    SubExpression: operator.sub,
+    MultiplyExpression: operator.mul,
+    LessThanExpression: operator.lt,
+    GreaterThanExpression: operator.gt,
+    LessThanOrEqualExpression: operator.le,
+}
+
+CONSTANT_NODES = (BoolValue, IntValue, FloatValue, StringValue, Identifier)
+
+# statements whose value can become the function result without raising FunctionReturn
+TAIL_NODES = (StatementBlock, IfStatement, ReturnStatement)
+
+
+class FunctionReturn(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+class ClosureInterpreter:
+    def __init__(self, program, maximum_recursion_depth=MAXIMUM_RECURSION_DEPTH, maximum_tail_calls=MAXIMUM_TAIL_CALLS):
+        self.global_variables = {}
+        self.functions = {}
+        self.program = mark_tail_calls(program)
+        self.depth = 0
+        self.maximum_recursion_depth = maximum_recursion_depth
+        self.maximum_tail_calls = maximum_tail_calls
+        self.return_type = None
+
+    def visit_program(self):
+        for declaration in self.program.program_body:
+            self.compile(declaration)(self.global_variables)
+        return self.run_main_function()
+
+    def run_main_function(self):
+        parameters, body = self.functions['main']
+        self.depth = 0
+        return self.call_function(body, dict(zip(parameters, [])), (0, 0))
+
+    def call_function(self, body, frame, position):
+        depth = self.depth + 1
+        self.depth = depth
+        try:
+            if depth >= self.maximum_recursion_depth:
+                raise MaximumRecursionExceededError(position)
+            result = run_body(body, frame)
+            if type(result) is TailCall:
+                result = run_tail_calls(result, run_tail_call, self.maximum_tail_calls)
+            return result
+        except RecursionError as error:
+            raise MaximumRecursionExceededError(position) from error
+        finally:
+            self.depth = depth - 1
+
+    def compile(self, node, tail=False):
+        node_class = get_node_class(node)
+        if node_class in BINARY_OPERATIONS:
+            return self.compile_binary_operation(node, BINARY_OPERATIONS[node_class])
+        method_name = COMPILE_METHODS.get(node_class)
+        if method_name is None:
+            return compile_unsupported(node)
+        if tail and node_class in TAIL_NODES:
+            return getattr(self, method_name)(node, tail=True)
+        return getattr(self, method_name)(node)
+
+    def compile_statement_block(self, statement_block, tail=False):
+        statements = [self.compile(statement) for statement in statement_block.statements[:-1]]
+        if statement_block.statements:
+            statements.append(self.compile(statement_block.statements[-1], tail))
+        if tail and statements:
+            *leading_statements, last_statement = statements
+
+            def run_tail_block(scope):
+                for statement in leading_statements:
+                    statement(scope)
+                return last_statement(scope)
+            return run_tail_block
+
+        def run_block(scope):
+            for statement in statements:
+                statement(scope)
+        return run_block
+
+    def compile_value(self, node):
+        value = node.value
+        return lambda scope: value
+
+    def compile_expression(self, expression):
+        return lambda scope: None
+
+    def compile_variable(self, variable):
+        name = variable.name.value
+        position = (variable.line, variable.column)
+        global_variables = self.global_variables
+
+        return lambda scope: scope[name] if name in scope else get_global_variable(global_variables, name, position)
+
+    def compile_function_definition(self, function_definition):
+        name = function_definition.identifier.value
+        parameters = [parameter[1].value for parameter in function_definition.arguments]
+        outer_return_type = self.return_type
+        self.return_type = function_definition.return_type
+        body = self.compile_statement_block(function_definition.body, tail=True)
+        self.return_type = outer_return_type
+        functions = self.functions
+
+        def define_function(scope):
+            if name in functions:
+                raise FunctionAlreadyDefinedError(name)
+            functions[name] = (parameters, body)
+        return define_function
+
+    def compile_function_call(self, function_call):
+        name = function_call.identifier.value
+        arguments = self.compile_arguments(function_call.arguments)
+        position = function_call.position
+
+        if name in BUILTIN_FUNCTIONS:
+            builtin_function = BUILTIN_FUNCTIONS[name]
+            return lambda scope: builtin_function(arguments(scope))
+
+        functions = self.functions
+        call_function = self.call_function
+
+        def call(scope):
+            function = functions.get(name)
+            if function is None:
+                raise FunctionNotDefinedError(name, position)
+            parameters, body = function
+            return call_function(body, dict(zip(parameters, arguments(scope))), position)
+        return call
+
+    def compile_tail_call(self, function_call, return_type, check_return_value):
+        # the call is made by call_function, so the frame of the returning function is not kept
+        name = function_call.identifier.value
+        arguments = self.compile_arguments(function_call.arguments)
+        position = function_call.position
+        functions = self.functions
+
+        def get_tail_call(scope):
+            function = functions.get(name)
+            if function is None:
+                raise FunctionNotDefinedError(name, position)
+            parameters, body = function
+            return TailCall(body, dict(zip(parameters, arguments(scope))), position, return_type, check_return_value)
+        return get_tail_call
+
+    def compile_method_call(self, method_call):
+        expression = self.compile(method_call.expression)
+        method_name = method_call.method_identifier.value
+        arguments = self.compile_arguments(method_call.arguments)
+        global_variables = self.global_variables
+
+        def call_method(scope):
+            value = expression(scope)
+            method_arguments = arguments(scope)
+            method = BUILTIN_METHODS[method_name]
+            if value in scope:
+                variable = scope[value]
+            else:
+                variable = get_global_variable(global_variables, value, None)
+            if variable is not None:
+                value = variable
+            return method(value, method_arguments)
+        return call_method
+
+    def compile_arguments(self, arguments):
+        compiled_arguments = [self.compile(argument) for argument in arguments.arguments]
+        return lambda scope: [argument(scope) for argument in compiled_arguments]
+
+    def compile_if_statement(self, if_statement, tail=False):
+        condition = self.compile(if_statement.condition)
+        true_statement = self.compile(if_statement.true_statement, tail)
+        false_statement = self.compile(if_statement.false_statement, tail)
+        position = if_statement.position
+
+        def run_if(scope):
+            condition_value = condition(scope)
+            if type(condition_value) is not bool:
+                check_type(bool, condition_value, position)
+            if condition_value:
+                return true_statement(scope)
+            return false_statement(scope)
+        return run_if
+
+    def compile_while_statement(self, while_statement):
+        condition = self.compile(while_statement.condition)
+        body = self.compile(while_statement.body)
+        position = while_statement.position
+
+        def run_while(scope):
+            condition_value = condition(scope)
+            if type(condition_value) is not bool:
+                check_type(bool, condition_value, position)
+            iteration = 0
+            while condition_value:
+                body(scope)
+                if iteration == MAXIMUM_ITERATIONS:
+                    raise MaximumIterationsExceededError(position)
+                condition_value = condition(scope)
+                iteration += 1
+        return run_while
+
+    def compile_invariant_loop(self, invariant_loop):
+        # closures already read variables cheaply, so the loop runs unchanged
+        return self.compile(invariant_loop.loop)
+
+    def compile_invariant_expression(self, invariant_expression):
+        return self.compile(invariant_expression.expression)
+
+    def compile_inlined_call(self, inlined_call):
+        # compiled calls already skip the scope dictionary the tree interpreter builds
+        return self.compile(inlined_call.function_call)
+
+    def compile_for_statement(self, for_statement):
+        identifier = for_statement.identifier.value
+        collection_name = for_statement.collection.value
+        body = self.compile(for_statement.body)
+        global_variables = self.global_variables
+
+        def run_for(scope):
+            if collection_name in scope:
+                collection = scope[collection_name]
+            else:
+                collection = get_global_variable(global_variables, collection_name, None)
+            for element in collection[1]:
+                self.depth += 1
+                try:
+                    body({identifier: element})
+                finally:
+                    self.depth -= 1
+        return run_for
+
+    def compile_linq(self, linq):
+        from_identifier = linq.from_statement[1].value
+        collection_name = linq.from_statement[2].value
+        where_statement = self.compile(linq.where_statement)
+        select_statement = self.compile(linq.select_statement)
+        global_variables = self.global_variables
+
+        def run_linq(scope):
+            if collection_name in scope:
+                data = scope[collection_name]
+            else:
+                data = get_global_variable(global_variables, collection_name, None)
+            result = []
+            for pair in list(data[1].items()):
+                frame = {from_identifier: (None, pair)}
+                self.depth += 1
+                try:
+                    if where_statement(frame):
+                        result.append(select_statement(frame))
+                finally:
+                    self.depth -= 1
+            return result
+        return run_linq
+
+    def compile_and_expression(self, and_expression):
+        left = self.compile(and_expression.left)
+        right = self.compile(and_expression.right)
+        position = and_expression.position
+
+        def evaluate_and(scope):
+            left_value = left(scope)
+            if type(left_value) is not bool:
+                raise WrongTypeError(bool, type(left_value), position)
+            right_value = right(scope)
+            return left_value and right_value
+        return evaluate_and
+
+    def compile_or_expression(self, or_expression):
+        left = self.compile(or_expression.left)
+        right = self.compile(or_expression.right)
+        position = or_expression.position
+
+        def evaluate_or(scope):
+            left_value = left(scope)
+            if type(left_value) is not bool:
+                raise WrongTypeError(bool, type(left_value), position)
+            right_value = right(scope)
+            return left_value or right_value
+        return evaluate_or
+
+    def compile_division_expression(self, division_expression):
+        left = self.compile(division_expression.left)
+        right = self.compile(division_expression.right)
+        position = division_expression.position
+
+        def divide(scope):
+            left_value = left(scope)
+            right_value = right(scope)
+            if right_value == 0:
+                raise ZeroDivisionError(position)
+            return left_value / right_value
+        return divide
+
+    def compile_binary_operation(self, operation_node, operation):
+        # constant operands are captured as values, so evaluating them does not cost a call
+        left_node, right_node = operation_node.left, operation_node.right
+        left = left_node.value if is_constant(left_node) else self.compile(left_node)
+        right = right_node.value if is_constant(right_node) else self.compile(right_node)
+        if is_constant(left_node) and is_constant(right_node):
+            return lambda scope: operation(left, right)
+        elif is_constant(right_node):
+            return lambda scope: operation(left(scope), right)
+        elif is_constant(left_node):
+            return lambda scope: operation(left, right(scope))
+        return lambda scope: operation(left(scope), right(scope))
+
+    def compile_assignment(self, assignment):
+        name = assignment.identifier.value
+        expression = self.compile(assignment.expression)
+        position = assignment.position
+        global_variables = self.global_variables
+
+        def assign(scope):
+            if name in scope:
+                variable_type, _ = scope[name]
+            else:
+                variable_type, _ = get_global_variable(global_variables, name, position)
+            value = expression(scope)
+            check_type(variable_type, value[1], position)
+            scope[name] = value
+        return assign
+
+    def compile_return_statement(self, return_statement, tail=False):
+        return_type = self.return_type
+        position = return_statement.position
+
+        if return_type in PYTHON_TYPES:
+            expected_type = PYTHON_TYPES[return_type]
+
+            def check_return_value(value):
+                if type(value) is not expected_type:
+                    raise WrongTypeReturnError(return_type, type(value), position)
+        else:
+            expected_type = get_container_type(return_type)
+
+            def check_return_value(value):
+                if expected_type != value[0]:
+                    raise WrongTypeReturnError(expected_type[1].__name__, type(value[1][0]).__name__, position)
+
+        if tail and return_statement.tail_call:
+            return self.compile_tail_call(return_statement.expression, return_type, check_return_value)
+        expression = self.compile(return_statement.expression)
+
+        def get_return_value(scope):
+            value = expression(scope)
+            check_return_value(value)
+            return value
+
+        if tail:
+            return get_return_value
+
+        def run_return(scope):
+            raise FunctionReturn(get_return_value(scope))
+        return run_return
+
+    def compile_init_statement(self, init_statement):
+        expression = self.compile(init_statement.expression)
+        variable_type = get_value_type(init_statement.type)
+        name = init_statement.identifier.value
+        position = (init_statement.line, init_statement.column)
+
+        def initialize(scope):
+            value = expression(scope)
+            if type(value) is not variable_type:
+                check_type(variable_type, value, position)
+            scope[name] = (variable_type, value)
+        return initialize
+
+    def compile_declaration(self, declaration):
+        identifier = declaration.identifier
+
+        def declare(scope):
+            scope[identifier] = None
+        return declare
+
+    def compile_list(self, list_node):
+        elements = [self.compile(element) for element in list_node.elements]
+        positions = [(element.line, element.column) for element in list_node.elements]
+        if not elements:
+            return compile_error(IndexError("list index out of range"))
+        first_element = elements[0]
+        checked_elements = list(zip(elements, positions))
+
+        def build_list(scope):
+            result = []
+            previous_value = first_element(scope)
+            for element, position in checked_elements:
+                value = element(scope)
+                if type(value) != type(previous_value):
+                    raise DifferentTypesListError(position)
+                result.append(value)
+                previous_value = value
+            return result
+        return build_list
+
+    def compile_pair(self, pair):
+        left = self.compile(pair.left)
+        right = self.compile(pair.right)
+        return lambda scope: (left(scope), right(scope))
+
+    def compile_dict(self, dict_node):
+        pairs = [(self.compile(pair.left), self.compile(pair.right)) for pair in dict_node.pairs]
+
+        def build_dict(scope):
+            result = {}
+            for key, value in pairs:
+                result[key(scope)] = value(scope)
+            return result
+        return build_dict
+
+
+def get_node_class(node):
+    if isinstance(node, Node):
+        return node.get_node_class()
+    return type(node)
+
+
+def is_constant(node):
+    return get_node_class(node) in CONSTANT_NODES
+
+
+def compile_unsupported(node):
+    # nodes the tree interpreter has no visit method for fail when executed, not when compiled
+    return compile_error(AttributeError(f"{get_node_class(node).__name__} cannot be executed"))
+
+
+def compile_error(error):
+    def raise_error(scope):
+        raise error
+    return raise_error
+
+
+def run_body(body, frame):
+    try:
+        return body(frame)
+    except FunctionReturn as function_return:
+        return function_return.value
+
+
+def run_tail_call(tail_call):
+    return run_body(tail_call.function, tail_call.arguments)
+
+
+def get_global_variable(global_variables, name, position):
+    if name in global_variables:
+        return global_variables[name]
+    raise UndefinedVariableError(name, position)
+
+
+def get_value_type(type_node):
+    if type_node in PYTHON_TYPES:
+        return PYTHON_TYPES[type_node]
+    return get_container_type(type_node)
+
+
+def get_container_type(type_node):
+    node_class = get_node_class(type_node)
+    if node_class is ListType:
+        return "list", type_node.type
+    elif node_class is PairType:
+        return "pair", type_node.type_1, type_node.type_2
+    elif node_class is DictType:
+        return "dict", type_node.key_type, type_node.value_type
+    raise AttributeError(f"{node_class.__name__} is not a type")
+
+
+def get_element_type(type_node):
+    # nested container types cannot be checked, the tree interpreter reports them as a TypeError too
+    if type_node in PYTHON_TYPES:
+        return PYTHON_TYPES[type_node]
+    raise TypeError(f"{get_node_class(type_node).__name__} is not a simple type")
+
+
+def check_type(expected_type, value, position):
+    if type(value) == expected_type:
+        return True
+    try:
+        if expected_type[0] == 'list':
+            if type(value[0]) == get_element_type(expected_type[1]):
+                return True
+        elif expected_type[0] == "pair":
+            type_1 = get_element_type(expected_type[1])
+            type_2 = get_element_type(expected_type[2])
+            if type(value[0]) == type_1 and type(value[1]) == type_2:
+                return True
+        elif expected_type[0] == "dict":
+            for pair in value.items():
+                type_1 = get_element_type(expected_type[1])
+                if type(pair[0]) != type_1:
+                    raise WrongTypeError(type_1.__name__, type(pair[0]).__name__, position)
+                type_2 = get_element_type(expected_type[2])
+                if type(pair[1]) != type_2:
+                    raise WrongTypeError(type_2.__name__, type(pair[1]).__name__, position)
+            return True
+    except TypeError:
+        raise WrongTypeError(expected_type, type(value), position)
+    raise WrongTypeError(expected_type, value, position)
@@ -1,5 +1,18 @@
+from collections import deque
+
 from src.exceptions.interpreter_exception import *
-from src.interpreter.scope import Scope
+from src.interpreter.scope import Scope, UNSET
+from src.interpreter.resolver import Resolver
+from src.interpreter.type_checker import TypeChecker
+from src.interpreter.memoization import find_memoizable_functions, get_memoization_key, MEMOIZED_RESULT_TYPES
+from src.interpreter.tail_calls import (
+    MAXIMUM_RECURSION_DEPTH,
+    MAXIMUM_TAIL_CALLS,
+    TailCall,
+    mark_tail_calls,
+    add_return_check,
+    run_return_checks,
+)
 from src.ast.nodes import *
 
 
@@ -90,13 +103,25 @@ BUILTIN_FUNCTIONS = {
 
 
 class Interpreter:
-    def __init__(self, program):
+    def __init__(self, program, memoization_cache=None, maximum_recursion_depth=MAXIMUM_RECURSION_DEPTH,
+                 maximum_tail_calls=MAXIMUM_TAIL_CALLS):
         self.global_variables = {}
         self.function_definitions = {}
         self.scopes_stack = []
         self.current_scope = None
-        self.program = program
+        self.program = Resolver().resolve_program(program)
+        # only the type_proven annotations are used, the errors are reported by --type-check
+        TypeChecker().check_program(self.program)
+        mark_tail_calls(self.program)
         self.last_value = None
+        self.loop_invariants = []
+        self.inlined_arguments = []
+        self.memoization_cache = memoization_cache
+        self.memoized_functions = find_memoizable_functions(self.program) if memoization_cache is not None else set()
+        self.deepest_call_depth = 0
+        self.maximum_recursion_depth = maximum_recursion_depth
+        self.maximum_tail_calls = maximum_tail_calls
+        self.tail_call = None
 
         self.builtin_functions = {
             'print': lambda arguments: print(*arguments),
@@ -134,11 +159,6 @@ class Interpreter:
         self.last_value = identifier.value
 
     def visit_init_statement(self, init_statement, global_declaration):
-        if global_declaration:
-            scope = self.global_variables
-        else:
-            scope = self.current_scope.local_variables
-
         init_statement.expression.accept(self)
         value = self.last_value
         try:
@@ -146,11 +166,17 @@ class Interpreter:
         except TypeError:
             init_statement.type.accept(self, self)
         type = self.last_value
-        self.check_type(type, value, (init_statement.line, init_statement.column))
+        if not init_statement.type_proven:
+            self.check_type(type, value, (init_statement.line, init_statement.column))
 
         init_statement.identifier.accept(self)
 
-        scope[self.last_value] = (type, value)
+        if global_declaration:
+            self.global_variables[self.last_value] = (type, value)
+        elif self.current_scope.frame_layout is init_statement.frame_layout:
+            self.current_scope.slots[init_statement.slot] = (type, value)
+        else:
+            self.current_scope.set_local_variable(self.last_value, (type, value))
 
     def visit_function_definition(self, function_definition):
         function_definition.identifier.accept(self)
@@ -175,9 +201,13 @@ class Interpreter:
         self.last_value = boolean_value.value
 
     def visit_variable(self, variable):
-        variable.name.accept(self)
-        variable_name = self.last_value
-        value = self.get_variable(variable_name, (variable.line, variable.column))
+        scope = self.current_scope
+        if scope.frame_layout is variable.frame_layout:
+            value = scope.slots[variable.slot]
+            if value is UNSET:
+                value = self.get_global_variable(variable.name.value, (variable.line, variable.column))
+        else:
+            value = self.get_variable(variable.name.value, (variable.line, variable.column))
         self.last_value = value
 
     def visit_function_call(self, function_call):
@@ -191,16 +221,128 @@ class Interpreter:
         else:
             function_definition = self.get_function_definition(function_id, function_call.position)
             function_call.arguments.accept(self)
-            new_scope = Scope(
-                function_definition,
-                function_call.position,
-                self.last_value
-            )
-            self.scopes_stack.append(self.current_scope)
-            if len(self.scopes_stack) == 10:
-                raise MaximumRecursionExceededError(function_call.position)
-            self.current_scope = new_scope
+            if function_id in self.memoized_functions:
+                self.call_memoized_function(function_id, function_definition, function_call, self.last_value)
+            else:
+                self.call_function(function_definition, function_call, self.last_value)
+
+    def call_function(self, function_definition, function_call, arguments):
+        new_scope = Scope(
+            function_definition,
+            function_call.position,
+            arguments
+        )
+        self.scopes_stack.append(self.current_scope)
+        call_depth = len(self.scopes_stack)
+        if call_depth >= self.maximum_recursion_depth:
+            raise MaximumRecursionExceededError(function_call.position)
+        if call_depth > self.deepest_call_depth:
+            self.deepest_call_depth = call_depth
+        self.current_scope = new_scope
+        try:
+            function_definition.body.accept(self)
+            if self.tail_call is not None:
+                self.run_tail_calls()
+        except RecursionError as error:
+            # the Python stack ran out before the configured limit was reached
+            raise MaximumRecursionExceededError(function_call.position) from error
+
+    def run_tail_calls(self):
+        # every callee takes over the scope of the function returning its call, the stack does not grow
+        call_depth = len(self.scopes_stack) - 1
+        return_checks = {}
+        memoization_keys = deque(maxlen=self.memoization_cache.maximum_size) if self.memoized_functions else ()
+        deepest_call_depth = self.deepest_call_depth
+        tail_call = self.tail_call
+        tail_call_count = 0
+        while tail_call is not None:
+            self.tail_call = None
+            if tail_call_count >= self.maximum_tail_calls:
+                raise MaximumRecursionExceededError(tail_call.position)
+            tail_call_count += 1
+            add_return_check(return_checks, tail_call.return_type, tail_call.check)
+            function_definition = tail_call.function
+            function_id = function_definition.identifier.value
+            if function_id in self.memoized_functions:
+                key = get_memoization_key(tail_call.arguments)
+                if key is not None:
+                    key = (function_id, key)
+                    entry = self.get_memoized_entry(key, call_depth)
+                    if entry is not None:
+                        self.current_scope = self.scopes_stack.pop()
+                        self.last_value = entry[0]
+                        break
+                    if not memoization_keys:
+                        deepest_call_depth = self.deepest_call_depth
+                        self.deepest_call_depth = call_depth + 1
+                    memoization_keys.append(key)
+            self.current_scope = Scope(function_definition, tail_call.position, tail_call.arguments)
             function_definition.body.accept(self)
+            tail_call = self.tail_call
+        result = self.last_value
+        run_return_checks(return_checks, result)
+        if memoization_keys:
+            # every entry is given the depth reached since the first of them, which never understates its own
+            if type(result) in MEMOIZED_RESULT_TYPES:
+                for key in memoization_keys:
+                    self.memoization_cache.put(key, (result, self.deepest_call_depth - call_depth))
+            self.deepest_call_depth = max(deepest_call_depth, self.deepest_call_depth)
+        self.last_value = result
+
+    def call_memoized_function(self, function_id, function_definition, function_call, arguments):
+        call_depth = len(self.scopes_stack)
+        key = get_memoization_key(arguments)
+        if key is not None:
+            key = (function_id, key)
+            entry = self.get_memoized_entry(key, call_depth)
+            if entry is not None:
+                self.last_value = entry[0]
+                return
+        deepest_call_depth = self.deepest_call_depth
+        self.deepest_call_depth = call_depth
+        self.call_function(function_definition, function_call, arguments)
+        result = self.last_value
+        if key is not None and type(result) in MEMOIZED_RESULT_TYPES:
+            self.memoization_cache.put(key, (result, self.deepest_call_depth - call_depth))
+        self.deepest_call_depth = max(deepest_call_depth, self.deepest_call_depth)
+
+    def get_memoized_entry(self, key, call_depth):
+        # a result is reused only where the calls it saves would not have exceeded the recursion limit
+        entry = self.memoization_cache.get(key)
+        if entry is not None and call_depth + entry[1] < self.maximum_recursion_depth:
+            self.memoization_cache.hits += 1
+            self.deepest_call_depth = max(self.deepest_call_depth, call_depth + entry[1])
+            return entry
+        self.memoization_cache.misses += 1
+        return None
+
+    def visit_inlined_call(self, inlined_call):
+        function_call = inlined_call.function_call
+        function_call.arguments.accept(self)
+        arguments = self.last_value
+        # the caller's scope stands in for the callee's, so calls made by the body run at the same depth
+        self.scopes_stack.append(self.current_scope)
+        call_depth = len(self.scopes_stack)
+        if call_depth >= self.maximum_recursion_depth:
+            raise MaximumRecursionExceededError(function_call.position)
+        if call_depth > self.deepest_call_depth:
+            self.deepest_call_depth = call_depth
+        self.inlined_arguments.append(arguments)
+        inlined_call.body.accept(self)
+        self.inlined_arguments.pop()
+        self.current_scope = self.scopes_stack.pop()
+
+    def visit_inlined_return(self, inlined_return):
+        inlined_return.expression.accept(self)
+        return_value = self.last_value
+        if not inlined_return.type_proven:
+            inlined_return.return_type.accept(self, self)
+            if self.last_value != type(return_value):
+                raise WrongTypeReturnError(inlined_return.return_type, type(return_value), inlined_return.position)
+        self.last_value = return_value
+
+    def visit_inlined_argument(self, inlined_argument):
+        self.last_value = self.inlined_arguments[-1][inlined_argument.argument_index]
 
     def visit_method_call(self, method_call):
         method_call.expression.accept(self)
@@ -237,16 +379,12 @@ class Interpreter:
         result = []
         from_statement = linq.from_statement
         # from_type = from_statement[0]
-        from_statement[1].accept(self)
-        from_id = self.last_value
-
         from_statement[2].accept(self)
         data = self.get_variable(self.last_value)
 
         all_pairs = list(data[1].items())
         for pair in all_pairs:
-            new_scope = Scope()
-            new_scope.local_variables[from_id] = (None, pair)
+            new_scope = Scope(None, None, [(None, pair)], linq.frame_layout)
             self.scopes_stack.append(self.current_scope)
             self.current_scope = new_scope
             # where
@@ -270,18 +408,26 @@ class Interpreter:
         assignment.identifier.accept(self)
         variable_id = self.last_value
 
-        type, variable = self.get_variable(variable_id, assignment.position)
+        resolved = self.current_scope.frame_layout is assignment.frame_layout
+        if resolved and self.current_scope.slots[assignment.slot] is not UNSET:
+            type, variable = self.current_scope.slots[assignment.slot]
+        else:
+            type, variable = self.get_variable(variable_id, assignment.position)
 
         assignment.expression.accept(self)
         value = self.last_value
 
         self.check_type(type, value[1], assignment.position)
-        self.current_scope.local_variables[variable_id] = value
+        if resolved:
+            self.current_scope.slots[assignment.slot] = value
+        else:
+            self.current_scope.set_local_variable(variable_id, value)
 
     def visit_if_statement(self, if_statement):
         if_statement.condition.accept(self)
         condition = self.last_value
-        self.check_type(bool, condition, if_statement.position)
+        if not if_statement.type_proven:
+            self.check_type(bool, condition, if_statement.position)
         if condition:
             if_statement.true_statement.accept(self)
         else:
@@ -290,7 +436,8 @@ class Interpreter:
     def visit_while_statement(self, while_statement):
         while_statement.condition.accept(self)
         condition = self.last_value
-        self.check_type(bool, condition, while_statement.position)
+        if not while_statement.type_proven:
+            self.check_type(bool, condition, while_statement.position)
         i = 0
 
         while condition:
@@ -309,14 +456,11 @@ class Interpreter:
 # nie rob osobnych scopw, ale przypisz nowe a w kolejnej iteracji
     def visit_for_statement(self, for_statement):
         # type = for_statement.type.accept(self)
-        for_statement.identifier.accept(self)
-        identifier = self.last_value
         for_statement.collection.accept(self)
         collection = self.last_value
         collection = self.get_variable(collection)
         for element in collection[1]:
-            new_frame = Scope()
-            new_frame.local_variables[identifier] = element
+            new_frame = Scope(None, None, [element], for_statement.frame_layout)
             self.scopes_stack.append(self.current_scope)
             self.current_scope = new_frame
             # where
@@ -325,27 +469,58 @@ class Interpreter:
             frame = self.scopes_stack.pop()
             self.current_scope = frame
 
+    def visit_invariant_loop(self, invariant_loop):
+        # invariants are evaluated lazily, so they raise where and when the unoptimized loop would
+        self.loop_invariants.append([UNSET] * invariant_loop.invariant_count)
+        try:
+            invariant_loop.loop.accept(self)
+        finally:
+            self.loop_invariants.pop()
+
+    def visit_invariant_expression(self, invariant_expression):
+        invariants = self.loop_invariants[-1]
+        value = invariants[invariant_expression.invariant_index]
+        if value is UNSET:
+            invariant_expression.expression.accept(self)
+            value = self.last_value
+            # containers are mutable and tuples carry their declared type, so only plain values are kept
+            if type(value) in (int, float, str, bool):
+                invariants[invariant_expression.invariant_index] = value
+        self.last_value = value
+
     def visit_return_statement(self, return_statement):
+        if return_statement.tail_call:
+            self.visit_tail_call(return_statement)
+            return
         return_statement.expression.accept(self)
         return_value = self.last_value
-        if self.current_scope.return_value_type in (IntType, BoolType, StringType, FloatType):
-            self.current_scope.return_value_type.accept(self, self)
-            if self.last_value == type(return_value):
-                scope = self.scopes_stack.pop()
-                self.current_scope = scope
-                self.last_value = return_value
-            else:
-                raise WrongTypeReturnError(self.current_scope.return_value_type, type(return_value),
-                                           return_statement.position)
+        if not return_statement.type_proven:
+            self.check_return_value(self.current_scope.return_value_type, return_value, return_statement.position)
+        scope = self.scopes_stack.pop()
+        self.current_scope = scope
+        self.last_value = return_value
+
+    def visit_tail_call(self, return_statement):
+        # the call is made by call_function, once the scope of this function is no longer needed
+        function_call = return_statement.expression
+        function_call.identifier.accept(self)
+        function_definition = self.get_function_definition(self.last_value, function_call.position)
+        function_call.arguments.accept(self)
+        return_value_type = self.current_scope.return_value_type
+        check = None
+        if not return_statement.type_proven:
+            check = lambda value: self.check_return_value(return_value_type, value, return_statement.position)
+        self.tail_call = TailCall(function_definition, self.last_value, function_call.position, return_value_type, check)
+
+    def check_return_value(self, return_value_type, return_value, position):
+        if return_value_type in (IntType, BoolType, StringType, FloatType):
+            return_value_type.accept(self, self)
+            if self.last_value != type(return_value):
+                raise WrongTypeReturnError(return_value_type, type(return_value), position)
         else:
-            self.current_scope.return_value_type.accept(self)
-            if self.last_value == return_value[0]:
-                scope = self.scopes_stack.pop()
-                self.current_scope = scope
-                self.last_value = return_value
-            else:
-                raise WrongTypeReturnError(self.last_value[1].__name__, type(return_value[1][0]).__name__,
-                                           return_statement.position)
+            return_value_type.accept(self)
+            if self.last_value != return_value[0]:
+                raise WrongTypeReturnError(self.last_value[1].__name__, type(return_value[1][0]).__name__, position)
 
     def visit_expression(self, expression):
         pass
@@ -497,9 +672,13 @@ class Interpreter:
         raise FunctionNotDefinedError(name, position)
 
     def get_variable(self, name, position=None):
-        if name in self.current_scope.local_variables:
-            return self.current_scope.local_variables[name]
-        elif name in self.global_variables:
+        value = self.current_scope.get_local_variable(name)
+        if value is UNSET:
+            return self.get_global_variable(name, position)
+        return value
+
+    def get_global_variable(self, name, position=None):
+        if name in self.global_variables:
             return self.global_variables[name]
         raise UndefinedVariableError(name, position)
 
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+from src.interpreter.resolver import LEAF_NODES, get_node_class
+from src.interpreter.type_checker import TypeChecker, SIMPLE_TYPES, MUTATING_METHODS
+from src.ast.nodes import *
+
+MEMOIZATION_CACHE_SIZE = 1024
+
+KEY_TYPES = (int, float, str, bool)
+
+# results are shared between every call with equal arguments, so only immutable values are kept
+MEMOIZED_RESULT_TYPES = (int, float, str, bool)
+
+
+class LRUCache:
+    def __init__(self, maximum_size=MEMOIZATION_CACHE_SIZE):
+        self.maximum_size = maximum_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maximum_size:
+            self.entries.popitem(last=False)
+
+
+def find_memoizable_functions(program):
+    # pure functions with a simple return type, whose result depends on nothing but the arguments
+    type_checker = TypeChecker()
+    type_checker.collect_functions(program)
+    pure_functions = find_pure_functions(type_checker)
+    return {
+        name for name in pure_functions
+        if type_checker.function_definitions[name][0].function_definition.return_type in SIMPLE_TYPES
+    }
+
+
+def find_pure_functions(type_checker):
+    # a well behaved function is pure when neither it nor any function it calls prints or mutates a container
+    candidates = {}
+    for name in type_checker.find_well_behaved_functions():
+        summary = type_checker.function_definitions[name][0]
+        if not has_side_effects(summary.function_definition.body):
+            candidates[name] = summary.called_names
+    pure_functions = set(candidates)
+    changed = True
+    while changed:
+        changed = False
+        for name in list(pure_functions):
+            if any(
+                called_name in type_checker.function_definitions and called_name not in pure_functions
+                for called_name in candidates[name]
+            ):
+                pure_functions.discard(name)
+                changed = True
+    return pure_functions
+
+
+def has_side_effects(node):
+    if type(node) in LEAF_NODES:
+        return False
+    elif type(node) is list or type(node) is tuple:
+        return any(has_side_effects(item) for item in node)
+    elif not isinstance(node, Node):
+        return False
+    node_class = get_node_class(node)
+    if node_class is FunctionCall and node.identifier.value == 'print':
+        return True
+    elif node_class is MethodCall and node.method_identifier.value in MUTATING_METHODS:
+        return True
+    return any(has_side_effects(field) for field in node.get_fields())
+
+
+def get_memoization_key(value):
+    # equal keys need equal types as well, 1, 1.0 and true are different arguments
+    value_type = type(value)
+    if value_type in KEY_TYPES:
+        return value_type, value
+    elif value_type is list or value_type is tuple:
+        items = tuple(get_memoization_key(item) for item in value)
+        if None in items:
+            return None
+        return value_type, items
+    elif value_type is dict:
+        items = tuple((get_memoization_key(key), get_memoization_key(item)) for key, item in value.items())
+        if any(None in item for item in items):
+            return None
+        return dict, items
+    elif isinstance(value, type) or isinstance(value, Node):
+        # declared types of variables, hashed by identity or by structure
+        return value_type, value
+    return None
@@ -0,0 +1,59 @@
+from src.ast.nodes import *
+
+LEAF_NODES = (BoolValue, IntValue, FloatValue, StringValue, Identifier)
+
+
+class FrameLayout:
+    def __init__(self, parameter_names):
+        self.slot_names = {}
+        self.parameter_slots = [self.get_slot(name) for name in parameter_names]
+
+    def get_slot(self, name):
+        if name not in self.slot_names:
+            self.slot_names[name] = len(self.slot_names)
+        return self.slot_names[name]
+
+
+class Resolver:
+    def resolve_program(self, program):
+        for declaration in program.program_body:
+            self.resolve(declaration, None)
+        return program
+
+    def resolve(self, node, frame_layout):
+        if type(node) in LEAF_NODES:
+            return
+        elif type(node) is list or type(node) is tuple:
+            for item in node:
+                self.resolve(item, frame_layout)
+            return
+        node_class = get_node_class(node)
+        if node_class is FunctionDefinition:
+            node.frame_layout = FrameLayout([parameter[1].value for parameter in node.arguments])
+            self.resolve(node.body, node.frame_layout)
+        elif node_class is ForStatement:
+            # every iteration runs in a fresh frame that starts with the loop variable
+            node.frame_layout = FrameLayout([node.identifier.value])
+            self.resolve(node.body, node.frame_layout)
+        elif node_class is LINQ:
+            node.frame_layout = FrameLayout([node.from_statement[1].value])
+            self.resolve(node.where_statement, node.frame_layout)
+            self.resolve(node.select_statement, node.frame_layout)
+        elif node_class is Variable:
+            self.resolve_name(node, node.name.value, frame_layout)
+        elif node_class is Assignment or node_class is InitStatement:
+            self.resolve_name(node, node.identifier.value, frame_layout)
+            self.resolve(node.expression, frame_layout)
+        elif isinstance(node, Node):
+            for field in node.get_fields():
+                self.resolve(field, frame_layout)
+
+    def resolve_name(self, node, name, frame_layout):
+        node.frame_layout = frame_layout
+        node.slot = frame_layout.get_slot(name) if frame_layout else None
+
+
+def get_node_class(node):
+    if isinstance(node, Node):
+        return node.get_node_class()
+    return type(node)
@@ -1,18 +1,39 @@
+UNSET = object()
+
+
 class Scope:
-    def __init__(self, function_definition=None, source_position=None, params_values_list=None):
+    def __init__(self, function_definition=None, source_position=None, params_values_list=None, frame_layout=None):
+        # names the resolver gave no slot, such as declarations, stay in a dictionary
         self.local_variables = {}
         if function_definition:
             self.function_name = function_definition.identifier
             self.return_value_type = function_definition.return_type
+            frame_layout = function_definition.frame_layout
         else:
             self.function_name = None
             self.return_value_type = None
         self.return_value = None
 
-        if function_definition:
-            for param, param_value in zip(function_definition.arguments, params_values_list):
-                # self.local_variables[param[1].value] = (param_value[0], param_value[1])
-                self.local_variables[param[1].value] = param_value
+        self.frame_layout = frame_layout
+        if frame_layout:
+            self.slot_names = frame_layout.slot_names
+            self.slots = [UNSET] * len(frame_layout.slot_names)
+            for slot, param_value in zip(frame_layout.parameter_slots, params_values_list or []):
+                self.slots[slot] = param_value
+        else:
+            self.slot_names = {}
+            self.slots = []
+
+    def get_local_variable(self, name):
+        if name in self.slot_names:
+            return self.slots[self.slot_names[name]]
+        return self.local_variables.get(name, UNSET)
+
+    def set_local_variable(self, name, value):
+        if name in self.slot_names:
+            self.slots[self.slot_names[name]] = value
+        else:
+            self.local_variables[name] = value
 
     # def check_return_value(self, value, source_position) -> bool:
     #     print(f"return_value: {self.return_value_type}")
@@ -22,4 +43,4 @@ class Scope:
     #     return True
 
     # funkcja ma contex ktory zawiera scopy
-    # program ma stos contektoew
\ No newline at end of file
+    # program ma stos contektoew
@@ -0,0 +1,123 @@
+import sys
+import threading
+
+from src.exceptions.interpreter_exception import MaximumRecursionExceededError
+from src.interpreter.resolver import LEAF_NODES, get_node_class
+from src.interpreter.type_checker import TypeChecker, BUILTIN_RESULT_TYPES
+from src.ast.nodes import *
+
+MAXIMUM_RECURSION_DEPTH = 10
+# tail calls keep the stack flat, so an endless chain of them is stopped by counting
+MAXIMUM_TAIL_CALLS = 1000000
+
+# Python frames one call may need in the tree interpreter, and the C stack reserved for each of them
+PYTHON_FRAMES_PER_CALL = 50
+STACK_BYTES_PER_FRAME = 1024
+MAXIMUM_STACK_SIZE = 1 << 30
+
+
+class TailCall:
+    __slots__ = ("function", "arguments", "position", "return_type", "check")
+
+    def __init__(self, function, arguments, position, return_type, check):
+        self.function = function
+        self.arguments = arguments
+        self.position = position
+        self.return_type = return_type
+        self.check = check
+
+
+def mark_tail_calls(program):
+    # only calls between well behaved functions are marked, their frames are finished once the call is made
+    type_checker = TypeChecker()
+    type_checker.collect_functions(program)
+    well_behaved_functions = type_checker.find_well_behaved_functions() - BUILTIN_RESULT_TYPES.keys()
+    clear_tail_calls(program)
+    for name in well_behaved_functions:
+        function_definition = type_checker.function_definitions[name][0].function_definition
+        mark_tail_returns(function_definition.body, well_behaved_functions)
+    return program
+
+
+def clear_tail_calls(node):
+    if type(node) in LEAF_NODES:
+        return
+    elif type(node) is list or type(node) is tuple:
+        for item in node:
+            clear_tail_calls(item)
+        return
+    elif not isinstance(node, Node):
+        return
+    if get_node_class(node) is ReturnStatement:
+        node.tail_call = False
+    for field in node.get_fields():
+        clear_tail_calls(field)
+
+
+def mark_tail_returns(node, function_names):
+    node_class = get_node_class(node)
+    if node_class is StatementBlock and node.statements:
+        mark_tail_returns(node.statements[-1], function_names)
+    elif node_class is IfStatement:
+        mark_tail_returns(node.true_statement, function_names)
+        mark_tail_returns(node.false_statement, function_names)
+    elif node_class is ReturnStatement:
+        expression = node.expression
+        node.tail_call = get_node_class(expression) is FunctionCall and expression.identifier.value in function_names
+
+
+def run_tail_calls(tail_call, call, maximum_tail_calls=MAXIMUM_TAIL_CALLS):
+    result = tail_call
+    return_checks = {}
+    tail_call_count = 0
+    while type(result) is TailCall:
+        if tail_call_count >= maximum_tail_calls:
+            raise MaximumRecursionExceededError(result.position)
+        tail_call_count += 1
+        add_return_check(return_checks, result.return_type, result.check)
+        result = call(result)
+    run_return_checks(return_checks, result)
+    return result
+
+
+def add_return_check(return_checks, return_type, check):
+    # the replaced frames check the final value innermost first, and of the checks of one return type only
+    # the innermost can fail, so a single one per type is kept
+    if check is not None:
+        return_checks.pop(return_type, None)
+        return_checks[return_type] = check
+
+
+def run_return_checks(return_checks, value):
+    for check in reversed(return_checks.values()):
+        check(value)
+
+
+def run_with_recursion_limit(function, maximum_recursion_depth):
+    # calls nest Python frames, so a deep limit runs the function on a thread with a stack large enough for it
+    python_recursion_limit = maximum_recursion_depth * PYTHON_FRAMES_PER_CALL
+    if python_recursion_limit <= sys.getrecursionlimit():
+        return function()
+    stack_size = min(python_recursion_limit * STACK_BYTES_PER_FRAME, MAXIMUM_STACK_SIZE)
+    outcome = []
+
+    def run():
+        try:
+            outcome.append((function(), None))
+        except BaseException as error:
+            outcome.append((None, error))
+
+    previous_recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(stack_size // STACK_BYTES_PER_FRAME)
+    previous_stack_size = threading.stack_size(stack_size)
+    try:
+        thread = threading.Thread(target=run)
+        thread.start()
+    finally:
+        threading.stack_size(previous_stack_size)
+    thread.join()
+    sys.setrecursionlimit(previous_recursion_limit)
+    result, error = outcome[0]
+    if error is not None:
+        raise error
+    return result
@@ -0,0 +1,590 @@
+from functools import partial
+
+from src.exceptions.interpreter_exception import (
+    WrongTypeError,
+    DifferentTypesListError,
+    UndefinedVariableError,
+    WrongTypeReturnError,
+    FunctionAlreadyDefinedError,
+    FunctionNotDefinedError,
+    ZeroDivisionError,
+    MaximumIterationsExceededError,
+    MaximumRecursionExceededError,
+)
+from src.interpreter.interpreter import BUILTIN_METHODS
+from src.interpreter.closure_interpreter import (
+    MAXIMUM_RECURSION_DEPTH,
+    MAXIMUM_ITERATIONS,
+    PYTHON_TYPES,
+    BUILTIN_FUNCTIONS,
+    get_node_class,
+    get_value_type,
+    get_container_type,
+    check_type,
+)
+from src.interpreter.tail_calls import MAXIMUM_TAIL_CALLS, TailCall, mark_tail_calls, run_tail_calls
+from src.ast.nodes import *
+
+SOURCE_FILENAME = "<kacperscript>"
+
+PYTHON_OPERATORS = {
+    AddExpression: "+",
+    SubExpression: "-",
+    MultiplyExpression: "*",
+    LessThanExpression: "<",
+    GreaterThanExpression: ">",
+    LessThanOrEqualExpression: "<=",
+}
+
+COMPARISON_NODES = (LessThanExpression, GreaterThanExpression, LessThanOrEqualExpression)
+
+CONSTANT_TYPES = {
+    BoolValue: bool,
+    IntValue: int,
+    FloatValue: float,
+    StringValue: str,
+    Identifier: str,
+}
+
+BUILTIN_RESULT_TYPES = {
+    'print': list,
+    'get_int': int,
+    'get_float': float,
+    'get_string': str,
+}
+
+UNSET = object()
+NO_RETURN = object()
+
+
+class FunctionSource:
+    def __init__(self, header, prefix, return_check):
+        self.lines = [(header, [])]
+        self.prefix = prefix
+        self.return_check = return_check
+        self.indent = 1
+        self.loop_count = 0
+        self.reads = []
+
+
+class Transpiler:
+    def __init__(self):
+        self.functions = []
+        self.function = None
+        self.constants = []
+        self.variable_names = {}
+        self.scope_count = 0
+
+    def transpile_program(self, program):
+        mark_tail_calls(program)
+        self.start_function("def _program():", "v_", None)
+        for declaration in program.program_body:
+            self.transpile_statement(declaration)
+        self.finish_function()
+
+        lines = []
+        line_map = {}
+        for function in self.functions:
+            for line, reads in function:
+                lines.append(line)
+                line_map[len(lines)] = reads
+        return "\n".join(lines) + "\n", line_map
+
+    def start_function(self, header, prefix, return_check):
+        outer_function = self.function
+        self.function = FunctionSource(header, prefix, return_check)
+        return outer_function
+
+    def finish_function(self, outer_function=None):
+        if len(self.function.lines) == 1:
+            self.emit("pass")
+        self.functions.append(self.function.lines)
+        self.function = outer_function
+
+    def new_scope_prefix(self, kind):
+        self.scope_count += 1
+        return f"{kind}{self.scope_count}_"
+
+    def emit(self, line):
+        self.function.lines.append(("    " * self.function.indent + line, self.function.reads))
+        self.function.reads = []
+
+    def emit_block(self, statements, tail=False):
+        line_count = len(self.function.lines)
+        self.function.indent += 1
+        for statement in statements[:-1]:
+            self.transpile_statement(statement)
+        if statements:
+            self.transpile_statement(statements[-1], tail)
+        if len(self.function.lines) == line_count:
+            self.emit("pass")
+        self.function.indent -= 1
+
+    def add_constant(self, value):
+        self.constants.append(value)
+        return f"_k[{len(self.constants) - 1}]"
+
+    def get_type_reference(self, value_type):
+        if value_type in PYTHON_TYPES.values():
+            return value_type.__name__
+        return self.add_constant(value_type)
+
+    def get_variable(self, name, position):
+        python_name = get_python_name(self.function.prefix, name)
+        self.variable_names[python_name] = name
+        self.function.reads.append((python_name, position))
+        return python_name
+
+    def set_variable(self, name):
+        python_name = get_python_name(self.function.prefix, name)
+        self.variable_names[python_name] = name
+        return python_name
+
+    def transpile_function(self, function_definition):
+        return_type = function_definition.return_type
+        if return_type in PYTHON_TYPES:
+            return_check = (PYTHON_TYPES[return_type], return_type)
+        else:
+            return_check = (None, get_container_type(return_type))
+        python_name = f"f{len(self.functions)}_{get_python_name('', function_definition.identifier.value)}"
+        parameter_names = [get_python_name("v_", parameter[1].value) for parameter in function_definition.arguments]
+        if len(set(parameter_names)) == len(parameter_names):
+            parameters = "".join(f"{name}=_UNSET, " for name in parameter_names)
+            outer_function = self.start_function(f"def {python_name}({parameters}*_arguments):", "v_", return_check)
+            for parameter_name in parameter_names:
+                self.emit(f"if {parameter_name} is _UNSET: del {parameter_name}")
+        else:
+            # repeated parameter names, the last matching argument wins as in Scope
+            outer_function = self.start_function(f"def {python_name}(*_arguments):", "v_", return_check)
+            for index, parameter_name in enumerate(parameter_names):
+                self.emit(f"if len(_arguments) > {index}: {parameter_name} = _arguments[{index}]")
+        for parameter in function_definition.arguments:
+            self.set_variable(parameter[1].value)
+
+        self.function.indent -= 1
+        self.emit_block(function_definition.body.statements, tail=True)
+        self.function.indent += 1
+        self.finish_function(outer_function)
+        return python_name
+
+    def transpile_statement(self, node, tail=False):
+        node_class = get_node_class(node)
+        if node_class is StatementBlock:
+            for statement in node.statements[:-1]:
+                self.transpile_statement(statement)
+            if node.statements:
+                self.transpile_statement(node.statements[-1], tail)
+        elif node_class is FunctionDefinition:
+            python_name = self.transpile_function(node)
+            self.emit(f"_define({node.identifier.value!r}, {python_name})")
+        elif node_class is IfStatement:
+            self.transpile_if_statement(node, tail)
+        elif node_class is WhileStatement:
+            self.transpile_while_statement(node)
+        elif node_class is ForStatement:
+            self.transpile_for_statement(node)
+        elif node_class is InvariantLoop:
+            # Python locals are already cheap to read, so the loop is transpiled unchanged
+            self.transpile_statement(node.loop)
+        elif node_class is Assignment:
+            self.transpile_assignment(node)
+        elif node_class is ReturnStatement:
+            self.transpile_return_statement(node, tail)
+        elif node_class is InitStatement:
+            self.transpile_init_statement(node)
+        elif node_class is Declaration:
+            pass
+        else:
+            source, _ = self.transpile_expression(node)
+            self.emit(f"return {source}" if tail else source)
+
+    def transpile_branch(self, branch, tail):
+        if get_node_class(branch) is StatementBlock:
+            self.emit_block(branch.statements, tail)
+        else:
+            self.emit_block([branch])
+
+    def emit_condition(self, condition, position, name):
+        source, source_type = self.transpile_expression(condition)
+        if source_type is bool:
+            return source
+        self.emit(f"{name} = {source}")
+        self.emit(f"if type({name}) is not bool: _check_type(bool, {name}, {position!r})")
+        return name
+
+    def transpile_if_statement(self, if_statement, tail):
+        condition = self.emit_condition(if_statement.condition, if_statement.position, "_condition")
+        self.emit(f"if {condition}:")
+        self.transpile_branch(if_statement.true_statement, tail)
+        self.emit("else:")
+        self.transpile_branch(if_statement.false_statement, tail)
+
+    def transpile_while_statement(self, while_statement):
+        position = while_statement.position
+        self.function.loop_count += 1
+        condition = f"_condition{self.function.loop_count}"
+        iteration = f"_iteration{self.function.loop_count}"
+        first_condition = self.emit_condition(while_statement.condition, position, condition)
+        if first_condition != condition:
+            self.emit(f"{condition} = {first_condition}")
+        self.emit(f"{iteration} = 0")
+        self.emit(f"while {condition}:")
+        self.transpile_branch(while_statement.body, False)
+        self.function.indent += 1
+        self.emit(f"if {iteration} == {MAXIMUM_ITERATIONS}: raise _MaximumIterationsExceededError({position!r})")
+        source, _ = self.transpile_expression(while_statement.condition)
+        self.emit(f"{condition} = {source}")
+        self.emit(f"{iteration} += 1")
+        self.function.indent -= 1
+
+    def transpile_for_statement(self, for_statement):
+        # the body runs as its own function, so every iteration starts from a fresh scope
+        collection = self.get_variable(for_statement.collection.value, None)
+        prefix = self.new_scope_prefix("s")
+        python_name = f"b{self.scope_count}_body"
+        outer_function = self.start_function("", prefix, self.function.return_check)
+        loop_variable = self.set_variable(for_statement.identifier.value)
+        self.function.lines[0] = (f"def {python_name}({loop_variable}):", [])
+        self.function.indent -= 1
+        self.transpile_branch(for_statement.body, False)
+        self.function.indent += 1
+        self.emit("return _NO_RETURN")
+        self.finish_function(outer_function)
+
+        self.emit(f"_result = _for_loop({collection}, {python_name})")
+        self.emit("if _result is not _NO_RETURN: return _result")
+
+    def transpile_linq(self, linq):
+        collection = self.get_variable(linq.from_statement[2].value, None)
+        prefix = self.new_scope_prefix("q")
+        sources = []
+        for kind, expression in (("where", linq.where_statement), ("select", linq.select_statement)):
+            outer_function = self.start_function("", prefix, None)
+            pair_variable = self.set_variable(linq.from_statement[1].value)
+            python_name = f"q{self.scope_count}_{kind}"
+            self.function.lines[0] = (f"def {python_name}({pair_variable}):", [])
+            source, _ = self.transpile_expression(expression)
+            self.emit(f"return {source}")
+            self.finish_function(outer_function)
+            sources.append(python_name)
+        return f"_linq({collection}, {sources[0]}, {sources[1]})"
+
+    def transpile_assignment(self, assignment):
+        variable = self.get_variable(assignment.identifier.value, assignment.position)
+        self.emit(f"_type, _ = {variable}")
+        source, _ = self.transpile_expression(assignment.expression)
+        self.emit(f"_value = {source}")
+        self.emit(f"_check_type(_type, _value[1], {assignment.position!r})")
+        self.emit(f"{variable} = _value")
+
+    def transpile_return_statement(self, return_statement, tail=False):
+        if tail and return_statement.tail_call:
+            self.transpile_tail_call(return_statement)
+            return
+        position = return_statement.position
+        source, source_type = self.transpile_expression(return_statement.expression)
+        python_type, return_type = self.function.return_check
+        if python_type is not None and source_type is python_type:
+            self.emit(f"return {source}")
+            return
+        self.emit(f"_value = {source}")
+        if python_type is not None:
+            self.emit(f"if type(_value) is not {python_type.__name__}: "
+                      f"raise _WrongTypeReturnError({self.add_constant(return_type)}, type(_value), {position!r})")
+        else:
+            self.emit(f"_check_return({self.add_constant(return_type)}, _value, {position!r})")
+        self.emit("return _value")
+
+    def transpile_tail_call(self, return_statement):
+        # the returned call is made by _call, after the frame of this function is gone
+        function_call = return_statement.expression
+        name = function_call.identifier.value
+        position = function_call.position
+        arguments = self.transpile_arguments(function_call.arguments)
+        python_type, return_type = self.function.return_check
+        if python_type is not None:
+            check = partial(check_simple_return, python_type, return_type, position=return_statement.position)
+        else:
+            check = partial(check_return, return_type, position=return_statement.position)
+        self.emit(f"return _TailCall(_function({name!r}, {position!r}), {arguments}, {position!r}, "
+                  f"{self.add_constant(return_type)}, {self.add_constant(check)})")
+
+    def transpile_init_statement(self, init_statement):
+        position = (init_statement.line, init_statement.column)
+        source, source_type = self.transpile_expression(init_statement.expression)
+        variable_type = get_value_type(init_statement.type)
+        type_reference = self.get_type_reference(variable_type)
+        variable = self.set_variable(init_statement.identifier.value)
+        if source_type is not None and source_type is variable_type:
+            self.emit(f"{variable} = ({type_reference}, {source})")
+            return
+        self.emit(f"_value = {source}")
+        if variable_type in PYTHON_TYPES.values():
+            self.emit(f"if type(_value) is not {type_reference}: _check_type({type_reference}, _value, {position!r})")
+        else:
+            self.emit(f"_check_type({type_reference}, _value, {position!r})")
+        self.emit(f"{variable} = ({type_reference}, _value)")
+
+    def transpile_expression(self, node):
+        # returns the Python source and the static type of its value, None when it is not known
+        node_class = get_node_class(node)
+        if node_class in CONSTANT_TYPES:
+            return repr(node.value), CONSTANT_TYPES[node_class]
+        elif node_class in PYTHON_OPERATORS:
+            left, left_type = self.transpile_expression(node.left)
+            right, right_type = self.transpile_expression(node.right)
+            if node_class in COMPARISON_NODES:
+                result_type = bool
+            else:
+                result_type = get_arithmetic_type(node_class, left_type, right_type)
+            return f"({left} {PYTHON_OPERATORS[node_class]} {right})", result_type
+        elif node_class is Variable:
+            return self.get_variable(node.name.value, (node.line, node.column)), None
+        elif node_class is InvariantExpression:
+            return self.transpile_expression(node.expression)
+        elif node_class is InlinedCall:
+            return self.transpile_expression(node.function_call)
+        elif node_class is DivisionExpression:
+            left, left_type = self.transpile_expression(node.left)
+            right, right_type = self.transpile_expression(node.right)
+            result_type = float if {left_type, right_type} <= {int, float} else None
+            return f"_divide({left}, {right}, {node.position!r})", result_type
+        elif node_class is AndExpression or node_class is OrExpression:
+            left, left_type = self.transpile_expression(node.left)
+            if left_type is not bool:
+                left = f"_check_bool({left}, {node.position!r})"
+            right, right_type = self.transpile_expression(node.right)
+            function = "_and" if node_class is AndExpression else "_or"
+            return f"{function}({left}, {right})", bool if right_type is bool else None
+        elif node_class is FunctionCall:
+            return self.transpile_function_call(node)
+        elif node_class is MethodCall:
+            value, _ = self.transpile_expression(node.expression)
+            arguments = self.transpile_arguments(node.arguments)
+            method_name = node.method_identifier.value
+            return f"_method_call({value}, {method_name!r}, {arguments}, locals(), {self.function.prefix!r})", None
+        elif node_class is LINQ:
+            return self.transpile_linq(node), list
+        elif node_class is List:
+            if not node.elements:
+                return "_raise(IndexError, 'list index out of range')", None
+            element_classes = {get_node_class(element) for element in node.elements}
+            if len(element_classes) == 1 and element_classes <= CONSTANT_TYPES.keys():
+                # a literal of same-typed constants passes the element check before it runs
+                return f"{self.add_constant([element.value for element in node.elements])}[:]", list
+            # Interpreter evaluates the first element once more to seed the type check
+            first, _ = self.transpile_expression(node.elements[0])
+            elements = [self.transpile_expression(element)[0] for element in node.elements]
+            positions = tuple((element.line, element.column) for element in node.elements)
+            return f"_build_list([{first}, {', '.join(elements)}], {positions!r})", list
+        elif node_class is Pair:
+            left, _ = self.transpile_expression(node.left)
+            right, _ = self.transpile_expression(node.right)
+            return f"({left}, {right})", tuple
+        elif node_class is Dict:
+            pairs = [
+                f"{self.transpile_expression(pair.left)[0]}: {self.transpile_expression(pair.right)[0]}"
+                for pair in node.pairs
+            ]
+            return "{" + ", ".join(pairs) + "}", dict
+        elif node_class is Expression:
+            return "None", None
+        # the tree interpreter has no visit method for these, so they fail when executed
+        return f"_raise(AttributeError, {node_class.__name__ + ' cannot be executed'!r})", None
+
+    def transpile_arguments(self, arguments):
+        return "[" + ", ".join(self.transpile_expression(argument)[0] for argument in arguments.arguments) + "]"
+
+    def transpile_function_call(self, function_call):
+        name = function_call.identifier.value
+        position = function_call.position
+        if name in BUILTIN_FUNCTIONS:
+            arguments = self.transpile_arguments(function_call.arguments)
+            return f"_builtin_{name}({arguments})", BUILTIN_RESULT_TYPES[name]
+        arguments = "".join(
+            ", " + self.transpile_expression(argument)[0] for argument in function_call.arguments.arguments
+        )
+        return f"_call(_function({name!r}, {position!r}), {position!r}{arguments})", None
+
+
+class TranspiledInterpreter:
+    def __init__(self, program, maximum_recursion_depth=MAXIMUM_RECURSION_DEPTH, maximum_tail_calls=MAXIMUM_TAIL_CALLS):
+        self.global_variables = {}
+        self.functions = {}
+        self.depth = 0
+        self.maximum_recursion_depth = maximum_recursion_depth
+        self.maximum_tail_calls = maximum_tail_calls
+        transpiler = Transpiler()
+        self.source, self.line_map = transpiler.transpile_program(program)
+        self.variable_names = transpiler.variable_names
+        self.namespace = self.create_namespace(transpiler.constants)
+        exec(compile(self.source, SOURCE_FILENAME, "exec"), self.namespace)
+
+    def create_namespace(self, constants):
+        namespace = {
+            "_k": constants,
+            "_UNSET": UNSET,
+            "_NO_RETURN": NO_RETURN,
+            "_call": self.call_function,
+            "_TailCall": TailCall,
+            "_function": self.get_function,
+            "_define": self.define_function,
+            "_method_call": self.call_method,
+            "_for_loop": self.run_for_loop,
+            "_linq": self.run_linq,
+            "_divide": divide,
+            "_and": lambda left, right: left and right,
+            "_or": lambda left, right: left or right,
+            "_check_bool": check_bool,
+            "_build_list": build_list,
+            "_raise": raise_error,
+            "_check_type": check_type,
+            "_check_return": check_return,
+            "_WrongTypeReturnError": WrongTypeReturnError,
+            "_MaximumIterationsExceededError": MaximumIterationsExceededError,
+        }
+        for name, function in BUILTIN_FUNCTIONS.items():
+            namespace[f"_builtin_{name}"] = function
+        return namespace
+
+    def visit_program(self):
+        self.run(self.namespace["_program"])
+        return self.run_main_function()
+
+    def run_main_function(self):
+        main_function = self.functions['main']
+        self.depth = 0
+        return self.run(self.call_function, main_function, (0, 0))
+
+    def run(self, function, *arguments):
+        try:
+            return function(*arguments)
+        except NameError as error:
+            # an unbound local in the generated code is an undefined KacperScript variable
+            name, position = self.find_variable_read(error)
+            if name is None:
+                raise
+            raise UndefinedVariableError(name, position) from error
+
+    def find_variable_read(self, error):
+        traceback = error.__traceback__
+        frame, line_number = None, None
+        while traceback is not None:
+            if traceback.tb_frame.f_code.co_filename == SOURCE_FILENAME:
+                frame, line_number = traceback.tb_frame, traceback.tb_lineno
+            traceback = traceback.tb_next
+        # UnboundLocalError carries no name, the first read of an unbound variable on the line is the culprit
+        for python_name, position in self.line_map.get(line_number, []):
+            if python_name not in frame.f_locals and python_name not in self.namespace:
+                return self.variable_names[python_name], position
+        return None, None
+
+    def call_function(self, function, position, *arguments):
+        depth = self.depth + 1
+        if depth >= self.maximum_recursion_depth:
+            raise MaximumRecursionExceededError(position)
+        self.depth = depth
+        try:
+            result = function(*arguments)
+            if type(result) is TailCall:
+                result = run_tail_calls(result, run_tail_call, self.maximum_tail_calls)
+            return result
+        except RecursionError as error:
+            raise MaximumRecursionExceededError(position) from error
+        finally:
+            self.depth = depth - 1
+
+    def get_function(self, name, position):
+        if name in self.functions:
+            return self.functions[name]
+        raise FunctionNotDefinedError(name, position)
+
+    def define_function(self, name, function):
+        if name in self.functions:
+            raise FunctionAlreadyDefinedError(name)
+        self.functions[name] = function
+
+    def call_method(self, value, method_name, arguments, local_variables, prefix):
+        method = BUILTIN_METHODS[method_name]
+        python_name = get_python_name(prefix, value) if type(value) is str else value
+        if python_name in local_variables:
+            variable = local_variables[python_name]
+        elif value in self.global_variables:
+            variable = self.global_variables[value]
+        else:
+            raise UndefinedVariableError(value, None)
+        if variable is not None:
+            value = variable
+        return method(value, arguments)
+
+    def run_for_loop(self, collection, body):
+        for element in collection[1]:
+            self.depth += 1
+            result = body(element)
+            self.depth -= 1
+            if result is not NO_RETURN:
+                return result
+        return NO_RETURN
+
+    def run_linq(self, data, where_statement, select_statement):
+        result = []
+        for pair in list(data[1].items()):
+            self.depth += 1
+            if where_statement((None, pair)):
+                result.append(select_statement((None, pair)))
+            self.depth -= 1
+        return result
+
+
+def get_python_name(prefix, name):
+    # non-ASCII identifiers are spelled out, since Python would NFKC-normalize them
+    if name.isascii() and name.isidentifier() and not name.startswith("u__"):
+        return prefix + name
+    return prefix + "u__" + name.encode().hex()
+
+
+def get_arithmetic_type(node_class, left_type, right_type):
+    if left_type in (int, float) and right_type in (int, float):
+        return float if float in (left_type, right_type) else int
+    if node_class is AddExpression and left_type is str and right_type is str:
+        return str
+    return None
+
+
+def divide(left, right, position):
+    if right == 0:
+        raise ZeroDivisionError(position)
+    return left / right
+
+
+def check_bool(value, position):
+    if type(value) is not bool:
+        raise WrongTypeError(bool, type(value), position)
+    return value
+
+
+def build_list(elements, positions):
+    previous_element = elements[0]
+    for element, position in zip(elements[1:], positions):
+        if type(element) != type(previous_element):
+            raise DifferentTypesListError(position)
+        previous_element = element
+    return elements[1:]
+
+
+def raise_error(error_class, message):
+    raise error_class(message)
+
+
+def run_tail_call(tail_call):
+    return tail_call.function(*tail_call.arguments)
+
+
+def check_simple_return(python_type, return_type, value, position):
+    if type(value) is not python_type:
+        raise WrongTypeReturnError(return_type, type(value), position)
+
+
+def check_return(expected_type, value, position):
+    if expected_type != value[0]:
+        raise WrongTypeReturnError(expected_type[1].__name__, type(value[1][0]).__name__, position)
@@ -0,0 +1,302 @@
+from src.exceptions.interpreter_exception import WrongTypeError, WrongTypeReturnError, DifferentTypesListError
+from src.interpreter.resolver import LEAF_NODES, get_node_class
+from src.ast.nodes import *
+
+SIMPLE_TYPES = {
+    IntType: int,
+    FloatType: float,
+    BoolType: bool,
+    StringType: str,
+}
+
+CONSTANT_TYPES = {
+    BoolValue: bool,
+    IntValue: int,
+    FloatValue: float,
+    StringValue: str,
+    Identifier: str,
+}
+
+COMPARISON_NODES = (LessThanExpression, GreaterThanExpression, LessThanOrEqualExpression)
+
+ARITHMETIC_NODES = (AddExpression, SubExpression, MultiplyExpression)
+
+BUILTIN_RESULT_TYPES = {
+    'print': list,
+    'get_int': int,
+    'get_float': float,
+    'get_string': str,
+}
+
+METHOD_RESULT_TYPES = {
+    'length': int,
+    'contains': bool,
+}
+
+MUTATING_METHODS = ('add', 'delete', 'append', 'remove')
+
+
+class FunctionSummary:
+    def __init__(self, function_definition):
+        self.function_definition = function_definition
+        self.called_names = set()
+        self.return_count = 0
+
+
+class TypeChecker:
+    def __init__(self):
+        self.errors = []
+        self.function_definitions = {}
+        self.well_behaved_functions = set()
+        self.return_type = None
+
+    def check_program(self, program):
+        self.collect_functions(program)
+        self.well_behaved_functions = self.find_well_behaved_functions()
+        for declaration in program.program_body:
+            self.check(declaration)
+        return self.errors
+
+    def collect_functions(self, node, summary=None):
+        # a single walk records every definition together with the calls and returns of its own body
+        if type(node) in LEAF_NODES:
+            return
+        elif type(node) is list or type(node) is tuple:
+            for item in node:
+                self.collect_functions(item, summary)
+            return
+        elif not isinstance(node, Node):
+            return
+        node_class = get_node_class(node)
+        if node_class is FunctionDefinition:
+            summary = FunctionSummary(node)
+            self.function_definitions.setdefault(node.identifier.value, []).append(summary)
+        elif node_class is FunctionCall and summary is not None:
+            if node.identifier.value not in BUILTIN_RESULT_TYPES:
+                summary.called_names.add(node.identifier.value)
+        elif node_class is ReturnStatement and summary is not None:
+            summary.return_count += 1
+        for field in node.get_fields():
+            self.collect_functions(field, summary)
+
+    def find_well_behaved_functions(self):
+        # a function is well behaved when it leaves the scope stack as it found it: it ends in exactly one
+        # return on every path and only calls well behaved functions; otherwise the interpreter continues
+        # in another function's scope and its return type checks cannot be decided statically
+        candidates = {}
+        for name, summaries in self.function_definitions.items():
+            if len(summaries) == 1 and summaries[0].return_count == count_tail_returns(summaries[0].function_definition.body):
+                candidates[name] = summaries[0].called_names
+        well_behaved_functions = set(candidates)
+        changed = True
+        while changed:
+            changed = False
+            for name in list(well_behaved_functions):
+                if any(
+                    called_name in self.function_definitions and called_name not in well_behaved_functions
+                    for called_name in candidates[name]
+                ):
+                    well_behaved_functions.discard(name)
+                    changed = True
+        return well_behaved_functions
+
+    def check(self, node, tail=False):
+        node_class = get_node_class(node)
+        if node_class is FunctionDefinition:
+            self.check_function(node)
+        elif node_class is StatementBlock:
+            for statement in node.statements[:-1]:
+                self.check(statement)
+            if node.statements:
+                self.check(node.statements[-1], tail)
+        elif node_class is InitStatement:
+            self.check_init_statement(node)
+        elif node_class is IfStatement:
+            node.type_proven = self.check_condition(node.condition, node.position)
+            self.check(node.true_statement, tail)
+            self.check(node.false_statement, tail)
+        elif node_class is WhileStatement:
+            node.type_proven = self.check_condition(node.condition, node.position)
+            self.check(node.body)
+        elif node_class is ForStatement:
+            # the body runs in a scope without a return type
+            return_type = self.return_type
+            self.return_type = None
+            self.check(node.body)
+            self.return_type = return_type
+        elif node_class is InvariantLoop:
+            self.check(node.loop)
+        elif node_class is InlinedReturn:
+            expression_type = self.infer(node.expression)
+            node.type_proven = node.return_type in SIMPLE_TYPES and expression_type is SIMPLE_TYPES[node.return_type]
+        elif node_class is ReturnStatement:
+            self.check_return_statement(node, tail)
+        elif node_class is Assignment:
+            self.infer(node.expression)
+        elif isinstance(node, Node):
+            self.infer(node)
+
+    def check_function(self, function_definition):
+        return_type = self.return_type
+        if function_definition.identifier.value in self.well_behaved_functions:
+            self.return_type = function_definition.return_type
+        else:
+            self.return_type = None
+        self.check(function_definition.body, tail=True)
+        self.return_type = return_type
+
+    def check_condition(self, condition, position):
+        condition_type = self.infer(condition)
+        if condition_type is not None and condition_type is not bool:
+            self.errors.append(WrongTypeError(bool, condition_type, position))
+        return condition_type is bool
+
+    def check_init_statement(self, init_statement):
+        position = (init_statement.line, init_statement.column)
+        expression = init_statement.expression
+        expression_type = self.infer(expression)
+        variable_type = init_statement.type
+        init_statement.type_proven = False
+        if variable_type in SIMPLE_TYPES:
+            if expression_type is SIMPLE_TYPES[variable_type]:
+                init_statement.type_proven = True
+            elif expression_type is not None:
+                self.errors.append(WrongTypeError(SIMPLE_TYPES[variable_type], expression_type, position))
+            return
+        if expression_type in (int, float, bool):
+            # strings are indexable, so a string can pass the element check of a container type
+            self.errors.append(WrongTypeError(variable_type, expression_type, position))
+            return
+        # container values are only checked element by element, so the literal itself has to be inspected
+        type_class = get_node_class(variable_type)
+        expression_class = get_node_class(expression)
+        if type_class is ListType and expression_class is List and expression.elements:
+            expected_types = [(variable_type.type, expression.elements[0])]
+        elif type_class is PairType and expression_class is Pair:
+            expected_types = [(variable_type.type_1, expression.left), (variable_type.type_2, expression.right)]
+        elif type_class is DictType and expression_class is Dict:
+            # a repeated key keeps only one of its entries, so nothing is concluded about such literals
+            keys = [pair.left.value for pair in expression.pairs if infer_constant_type(pair.left) is not None]
+            if len(keys) != len(expression.pairs) or len(set(keys)) != len(keys):
+                return
+            expected_types = []
+            for pair in expression.pairs:
+                expected_types += [(variable_type.key_type, pair.left), (variable_type.value_type, pair.right)]
+        else:
+            return
+        if not all(element_type in SIMPLE_TYPES for element_type, _ in expected_types):
+            return
+        element_types = [(SIMPLE_TYPES[element_type], infer_constant_type(element)) for element_type, element in expected_types]
+        for expected_type, actual_type in element_types:
+            if actual_type is not None and actual_type is not expected_type:
+                self.errors.append(WrongTypeError(expected_type, actual_type, position))
+                return
+        init_statement.type_proven = all(expected_type is actual_type for expected_type, actual_type in element_types)
+
+    def check_return_statement(self, return_statement, tail):
+        expression_type = self.infer(return_statement.expression)
+        return_statement.type_proven = False
+        if not tail or self.return_type not in SIMPLE_TYPES or expression_type is None:
+            return
+        if expression_type is SIMPLE_TYPES[self.return_type]:
+            return_statement.type_proven = True
+        else:
+            self.errors.append(WrongTypeReturnError(self.return_type, expression_type, return_statement.position))
+
+    def infer(self, node):
+        # returns the Python type every successful evaluation of the node produces, None when it is not known
+        node_class = get_node_class(node)
+        if node_class in CONSTANT_TYPES:
+            return CONSTANT_TYPES[node_class]
+        elif node_class is InvariantExpression:
+            return self.infer(node.expression)
+        elif node_class in ARITHMETIC_NODES:
+            return get_arithmetic_type(node_class, self.infer(node.left), self.infer(node.right))
+        elif node_class is DivisionExpression:
+            left_type, right_type = self.infer(node.left), self.infer(node.right)
+            return float if left_type in (int, float) and right_type in (int, float) else None
+        elif node_class in COMPARISON_NODES:
+            self.infer(node.left)
+            self.infer(node.right)
+            return bool
+        elif node_class is AndExpression or node_class is OrExpression:
+            left_type = self.infer(node.left)
+            if left_type is not None and left_type is not bool:
+                self.errors.append(WrongTypeError(bool, left_type, node.position))
+            right_type = self.infer(node.right)
+            return bool if left_type is bool and right_type is bool else None
+        elif node_class is FunctionCall:
+            self.infer(node.arguments)
+            return BUILTIN_RESULT_TYPES.get(node.identifier.value)
+        elif node_class is InlinedCall:
+            self.infer(node.function_call)
+            # the body was checked with its definition, arguments stay unknown so that shared bodies prove the same
+            errors, self.errors = self.errors, []
+            self.check(node.body)
+            self.errors = errors
+            return None
+        elif node_class is MethodCall:
+            self.infer(node.expression)
+            self.infer(node.arguments)
+            return METHOD_RESULT_TYPES.get(node.method_identifier.value)
+        elif node_class is List:
+            self.check_list(node)
+            return list
+        elif node_class is Pair:
+            self.infer(node.left)
+            self.infer(node.right)
+            return tuple
+        elif node_class is Dict:
+            for pair in node.pairs:
+                self.infer(pair.left)
+                self.infer(pair.right)
+            return dict
+        elif node_class is LINQ:
+            self.infer(node.where_statement)
+            self.infer(node.select_statement)
+            return list
+        elif isinstance(node, Node):
+            for field in node.get_fields():
+                self.infer(field)
+        elif isinstance(node, (list, tuple)):
+            for item in node:
+                self.infer(item)
+        return None
+
+    def check_list(self, list_node):
+        previous_type = None
+        for element in list_node.elements:
+            element_type = self.infer(element)
+            if previous_type is not None and element_type is not None and element_type is not previous_type:
+                self.errors.append(DifferentTypesListError((element.line, element.column)))
+                return
+            previous_type = element_type
+
+
+def count_tail_returns(node):
+    # the number of returns in tail position, or -1 when some path can end without one
+    node_class = get_node_class(node)
+    if node_class is ReturnStatement:
+        return 1
+    elif node_class is StatementBlock and node.statements:
+        return count_tail_returns(node.statements[-1])
+    elif node_class is IfStatement:
+        true_count = count_tail_returns(node.true_statement)
+        false_count = count_tail_returns(node.false_statement)
+        if true_count > 0 and false_count > 0:
+            return true_count + false_count
+    return -1
+
+
+def infer_constant_type(node):
+    return CONSTANT_TYPES.get(get_node_class(node))
+
+
+def get_arithmetic_type(node_class, left_type, right_type):
+    if left_type in (int, float) and right_type in (int, float):
+        return float if float in (left_type, right_type) else int
+    if node_class is AddExpression and left_type is str and right_type is str:
+        return str
+    if node_class is MultiplyExpression and {left_type, right_type} == {str, int}:
+        return str
+    return None
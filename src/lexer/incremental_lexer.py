@@ -0,0 +1,61 @@
+import io
+from array import array
+from bisect import bisect_left
+
+from src.lexer.regex_lexer import RegexLexer
+from src.token.token_buffer import TokenBuffer
+from src.token.token_types import TokenType
+
+
+def apply_edit(text, offset, deleted_length, inserted_text):
+    return text[:offset] + inserted_text + text[offset + deleted_length:]
+
+
+def relex(buffer, text, offset, deleted_length, inserted_text):
+    # every token depends on its own characters and on one character of lookahead,
+    # so tokens ending before the edit are kept and lexing restarts after the last of them
+    new_text = apply_edit(text, offset, deleted_length, inserted_text)
+    edit_end = offset + len(inserted_text)
+    delta = len(inserted_text) - deleted_length
+
+    kept = bisect_left(buffer.ends, offset)
+    new_buffer = TokenBuffer()
+    append_tokens(new_buffer, buffer, 0, kept)
+
+    lexer = RegexLexer(io.StringIO(new_text))
+    lexer.seek(buffer.ends[kept - 1] if kept else 0)
+    while True:
+        token = lexer.get_next_token()
+        end = lexer.get_end_offset()
+        new_buffer.append(token.type, lexer.get_current_offset(), end, token.value)
+        if token.type == TokenType.EOF:
+            break
+        if end > edit_end:
+            synced = find_token_end(buffer, end - delta)
+            if synced is not None:
+                append_tokens(new_buffer, buffer, synced + 1, len(buffer), delta)
+                break
+
+    new_buffer.set_layout(*lexer.get_source_layout())
+    return new_text, new_buffer
+
+
+def find_token_end(buffer, end):
+    index = bisect_left(buffer.ends, end)
+    if index < len(buffer) and buffer.ends[index] == end and buffer.get_type(index) != TokenType.EOF:
+        return index
+    return None
+
+
+def append_tokens(new_buffer, buffer, start_index, end_index, delta=0):
+    # only the values of tokens that survive the edit are pooled again, so removed values are dropped
+    old_value_indexes = buffer.value_indexes[start_index:end_index]
+    value_indexes = {index: new_buffer.add_value(buffer.values[index]) for index in set(old_value_indexes)}
+    new_buffer.types.extend(buffer.types[start_index:end_index])
+    new_buffer.value_indexes.extend(array("I", map(value_indexes.__getitem__, old_value_indexes)))
+    if delta:
+        new_buffer.starts.extend(array("I", [start + delta for start in buffer.starts[start_index:end_index]]))
+        new_buffer.ends.extend(array("I", [end + delta for end in buffer.ends[start_index:end_index]]))
+    else:
+        new_buffer.starts.extend(buffer.starts[start_index:end_index])
+        new_buffer.ends.extend(buffer.ends[start_index:end_index])
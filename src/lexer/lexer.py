@@ -2,89 +2,110 @@ from src.token.token_types import TokenType
 from src.token.token import Token
 from src.exceptions import lexer_exception
 import math
+import re
+import string
+import sys
 
 STRING_LIMIT_CHARS = 10_000
 NUMBER_LIMIT_DIGITS = 1_000
 
 ID_LIMIT_CHARS = 100
 
+STRING_BODY = re.compile(r'[^"\n#]*')
+IDENTIFIER_BODY = re.compile(r"\w*")
+
 MAX_NUMBER = 10_000_000
 MIN_NUMBER = -MAX_NUMBER
 
+KEYWORDS = {
+    "Pair": TokenType.PAIR,
+    "Dict": TokenType.DICT,
+    "List": TokenType.LIST,
+    "int": TokenType.INT_KEYWORD,
+    "float": TokenType.FLOAT_KEYWORD,
+    "string": TokenType.STRING_KEYWORD,
+    "bool": TokenType.BOOL_KEYWORD,
+
+    # "SELECT": TokenType.SELECT,
+    # "WHERE": TokenType.WHERE,
+    # "FROM": TokenType.FROM,
+    # "at": TokenType.AT,
+    # "append": TokenType.APPEND,
+    # "remove": TokenType.REMOVE,
+    # "first": TokenType.FIRST,
+    # "second": TokenType.SECOND,
+
+    "function": TokenType.FUNCTION,
+    "for": TokenType.FOR,
+    "while": TokenType.WHILE,
+    "return": TokenType.RETURN,
+    "if": TokenType.IF,
+    "else": TokenType.ELSE,
+    "from": TokenType.FROM,
+    "in": TokenType.IN,
+    "where": TokenType.WHERE,
+    "select": TokenType.SELECT,
+    "orderby": TokenType.ORDER_BY,
+    "EOF": TokenType.EOF,
+
+    "key": TokenType.KEY,
+}
+
+SIGNS = {
+    "(": TokenType.LEFT_BRACKET,
+    ")": TokenType.RIGHT_BRACKET,
+    "{": TokenType.LEFT_CURLY_BRACKET,
+    "}": TokenType.RIGHT_CURLY_BRACKET,
+    "[": TokenType.LEFT_SQUARE_BRACKET,
+    "]": TokenType.RIGHT_SQUARE_BRACKET,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    ";": TokenType.SEMICOLON,
+    ":": TokenType.COLON
+}
+
+OPERATORS = {
+    "||": TokenType.OR_SIGN,
+    "&&": TokenType.AND_SIGN,
+    "<": TokenType.LESS_SIGN,
+    "<=": TokenType.LESS_OR_EQUAL_SIGN,
+    ">": TokenType.GREATER_SIGN,
+    ">=": TokenType.GREATER_OR_EQUAL_SIGN,
+    "=": TokenType.ASSIGN,
+    "==": TokenType.EQUAL_SIGN,
+    "!=": TokenType.NOT_EQUAL_SIGN,
+    "!": TokenType.NEGATION_SIGN,
+}
+
+ONE_CHAR_OPERATORS = {
+    "+": TokenType.ADD_SIGN,
+    "-": TokenType.SUB_SIGN,
+    "*": TokenType.MULTIPLY_SIGN,
+    "/": TokenType.DIVIDE_SIGN,
+}
+
 
 class Lexer:
     def __init__(self, reader):
         self.reader = reader
         self.current_token = None
+        self.current_offset = 0
         self.current_position = (0, 0)
-        self.previous_position = (0, 0)
-
-        self.token_dictionary = {
-            "Pair": TokenType.PAIR,
-            "Dict": TokenType.DICT,
-            "List": TokenType.LIST,
-            "int": TokenType.INT_KEYWORD,
-            "float": TokenType.FLOAT_KEYWORD,
-            "string": TokenType.STRING_KEYWORD,
-            "bool": TokenType.BOOL_KEYWORD,
-
-            # "SELECT": TokenType.SELECT,
-            # "WHERE": TokenType.WHERE,
-            # "FROM": TokenType.FROM,
-            # "at": TokenType.AT,
-            # "append": TokenType.APPEND,
-            # "remove": TokenType.REMOVE,
-            # "first": TokenType.FIRST,
-            # "second": TokenType.SECOND,
-
-            "function": TokenType.FUNCTION,
-            "for": TokenType.FOR,
-            "while": TokenType.WHILE,
-            "return": TokenType.RETURN,
-            "if": TokenType.IF,
-            "else": TokenType.ELSE,
-            "from": TokenType.FROM,
-            "in": TokenType.IN,
-            "where": TokenType.WHERE,
-            "select": TokenType.SELECT,
-            "orderby": TokenType.ORDER_BY,
-            "EOF": TokenType.EOF,
-
-            "key": TokenType.KEY,
-        }
-
-        self.token_dictionary_sign = {
-            "(": TokenType.LEFT_BRACKET,
-            ")": TokenType.RIGHT_BRACKET,
-            "{": TokenType.LEFT_CURLY_BRACKET,
-            "}": TokenType.RIGHT_CURLY_BRACKET,
-            "[": TokenType.LEFT_SQUARE_BRACKET,
-            "]": TokenType.RIGHT_SQUARE_BRACKET,
-            ",": TokenType.COMMA,
-            ".": TokenType.DOT,
-            ";": TokenType.SEMICOLON,
-            ":": TokenType.COLON
-        }
-
-        self.token_dictionary_operators = {
-            "||": TokenType.OR_SIGN,
-            "&&": TokenType.AND_SIGN,
-            "<": TokenType.LESS_SIGN,
-            "<=": TokenType.LESS_OR_EQUAL_SIGN,
-            ">": TokenType.GREATER_SIGN,
-            ">=": TokenType.GREATER_OR_EQUAL_SIGN,
-            "=": TokenType.ASSIGN,
-            "==": TokenType.EQUAL_SIGN,
-            "!=": TokenType.NOT_EQUAL_SIGN,
-            "!": TokenType.NEGATION_SIGN,
-        }
-
-        self.token_dictionary_operators_one_char = {
-            "+": TokenType.ADD_SIGN,
-            "-": TokenType.SUB_SIGN,
-            "*": TokenType.MULTIPLY_SIGN,
-            "/": TokenType.DIVIDE_SIGN,
-        }
+
+        self.token_dictionary = KEYWORDS
+        self.token_dictionary_sign = SIGNS
+        self.token_dictionary_operators = OPERATORS
+        self.token_dictionary_operators_one_char = ONE_CHAR_OPERATORS
+
+        self.builders = {"EOF": self.try_build_eof, "#": self.try_build_comment, '"': self.try_build_string}
+        for character in SIGNS:
+            self.builders[character] = self.try_build_sign
+        for character in list(ONE_CHAR_OPERATORS) + ['<', '>', '=', '!', '|', '&']:
+            self.builders[character] = self.try_build_operator
+        for character in string.digits:
+            self.builders[character] = self.try_build_number
+        for character in string.ascii_letters + "_":
+            self.builders[character] = self.try_build_keyword_or_identifier
 
     def get_next_token(self):
         self.current_token = self.try_build_token()
@@ -96,20 +117,36 @@ class Lexer:
     def get_current_position(self):
         return self.current_position
 
+    def get_current_offset(self):
+        return self.current_offset
+
+    def get_end_offset(self):
+        if self.current_token is not None and self.current_token.type == TokenType.EOF:
+            return self.current_offset
+        return self.reader.get_previous_end()
+
+    def get_position(self, offset):
+        return self.reader.get_position(offset)
+
+    def get_source_layout(self):
+        return self.reader.get_layout()
+
     def try_build_token(self):
         self.skip_whitespace()
-        self.current_position = self.reader.get_current_position()
-
-        token = (
-            self.try_build_sign() or
-            self.try_build_comment() or
-            self.try_build_eof() or
-            self.try_build_operator() or
-            self.try_build_number() or
-            self.try_build_string() or
-            self.try_build_keyword_or_identifier()
-        )
+        self.current_offset = self.reader.get_current_offset()
+        self.current_position = self.reader.get_position(self.current_offset)
 
+        character = self.get_char()
+        builder = self.builders.get(character)
+        if builder is None:
+            if character.isdigit():
+                builder = self.try_build_number
+            elif character.isalpha():
+                builder = self.try_build_keyword_or_identifier
+            else:
+                return None
+
+        token = builder()
         if token:
             return token
 
@@ -127,7 +164,8 @@ class Lexer:
         return None
 
     def try_build_comment(self):
-        text_comment = str()
+        characters = []
+        length = 0
         character = self.get_char()
 
         if not character == '#':
@@ -137,13 +175,14 @@ class Lexer:
         character = self.get_char()
 
         while not character == '\n' or character == 'EOF':
-            text_comment = text_comment + character
+            characters.append(character)
+            length += 1
             self.get_next_char()
             character = self.get_char()
-            if len(text_comment) > STRING_LIMIT_CHARS:
+            if length > STRING_LIMIT_CHARS:
                 raise lexer_exception.CommentTooLongException("Comment too long", self.current_position)
         self.get_next_char()
-        token = Token(TokenType.COMMENT, text_comment, self.current_position)
+        token = Token(TokenType.COMMENT, "".join(characters), self.current_position)
         return token
 
     def try_build_operator(self):
@@ -208,14 +247,17 @@ class Lexer:
     def build_integer_number(self):
         character = self.get_char()
         built_number = 0
+        digits = 0
         while character.isdigit():
             built_number = built_number * 10 + int(character)
+            digits += 1
+            if digits > NUMBER_LIMIT_DIGITS:
+                raise lexer_exception.NumberException("Number too long", self.current_position)
             self.get_next_char()
             character = self.get_char()
         return built_number
 
     def try_build_string(self):
-        text = str()
         character = self.get_char()
 
         if not character == '"':
@@ -224,13 +266,15 @@ class Lexer:
         self.get_next_char()
         character = self.get_char()
 
-        while not character == '"':
-            text = text + character
-            self.get_next_char()
-            character = self.get_char()
+        if character == '"':
+            text = ""
+        elif character == 'EOF':
+            raise lexer_exception.UnclosedStringException("Unclosed string", self.current_position)
+        else:
+            text = self.reader.read_span(STRING_BODY, STRING_LIMIT_CHARS)
             if len(text) > STRING_LIMIT_CHARS:
                 raise lexer_exception.StringTooLongException("String too long", self.current_position)
-            if character == '\n' or character == 'EOF':
+            if not self.get_char() == '"':
                 raise lexer_exception.UnclosedStringException("Unclosed string", self.current_position)
 
         token = Token(TokenType.STRING_VALUE, text, self.current_position)
@@ -238,14 +282,12 @@ class Lexer:
         return token
 
     def try_build_keyword_or_identifier(self):
-        text = str()
         character = self.get_char()
-        while (character.isalpha() or character == "_" or character.isdigit()) and character != 'EOF':
-            text += character
-            self.get_next_char()
-            character = self.get_char()
-            if len(text) > ID_LIMIT_CHARS:
-                raise lexer_exception.IdentifierTooLongException("Identifier too long", self.current_position)
+        if not (character.isalpha() or character == "_" or character.isdigit()) or character == 'EOF':
+            return None
+        text = self.reader.read_span(IDENTIFIER_BODY, ID_LIMIT_CHARS)
+        if len(text) > ID_LIMIT_CHARS:
+            raise lexer_exception.IdentifierTooLongException("Identifier too long", self.current_position)
         if text == "":
             return None
         elif text in ("true", "false"):
@@ -255,8 +297,8 @@ class Lexer:
                 case "false":
                     return Token(TokenType.BOOL_VALUE, False, self.current_position)
         elif text in self.token_dictionary.keys():
-            return Token(self.token_dictionary[text], text, self.current_position)
-        return Token(TokenType.ID, text, self.current_position)
+            return Token(self.token_dictionary[text], sys.intern(text), self.current_position)
+        return Token(TokenType.ID, sys.intern(text), self.current_position)
 
     def skip_whitespace(self):
         char = self.get_char()
@@ -268,7 +310,6 @@ class Lexer:
         return self.reader.get_current_char()
 
     def get_next_char(self):
-        self.previous_position = self.reader.get_current_position()
         return self.reader.next()
 
 
@@ -0,0 +1,173 @@
+import math
+import re
+import sys
+from bisect import bisect_left
+
+from src.token.token_types import TokenType
+from src.token.token import Token
+from src.exceptions import lexer_exception
+from src.lexer.lexer import (
+    STRING_LIMIT_CHARS,
+    NUMBER_LIMIT_DIGITS,
+    ID_LIMIT_CHARS,
+    MAX_NUMBER,
+    MIN_NUMBER,
+    KEYWORDS,
+    SIGNS,
+    OPERATORS,
+    ONE_CHAR_OPERATORS,
+    STRING_BODY,
+)
+from src.reader import offset_to_position
+
+# whitespace and comments, skipped the same way Reader does it: a '#' right
+# after a newline is dropped on its own, any other '#' runs to the end of line
+SKIP_PATTERN = r"(?:\s|(?<=\n)\#+|\#[^\n]*)*"
+
+TOKEN_PATTERN = re.compile(SKIP_PATTERN + r"""
+    (?:
+        (?P<simple>[(){}\[\],.;:\-+*/]|[<>=!](?!=)|\|\||&&)
+      | (?P<two_char_operator>[<>=!](?==))
+      | (?P<eof>\Z)
+      | (?P<number>\d+)(?P<fraction>\.\d*)?
+      | (?P<string>")
+      | (?P<word>\w+)
+    )
+""", re.VERBOSE)
+
+SIMPLE_TOKENS = {sign: (token_type, None) for sign, token_type in SIGNS.items()}
+SIMPLE_TOKENS.update({operator: (token_type, "") for operator, token_type in ONE_CHAR_OPERATORS.items()})
+SIMPLE_TOKENS.update({operator: (token_type, operator) for operator, token_type in OPERATORS.items()})
+SIMPLE_TOKENS["||"] = (TokenType.OR_SIGN, None)
+SIMPLE_TOKENS["&&"] = (TokenType.AND_SIGN, None)
+
+SKIP = re.compile(SKIP_PATTERN)
+
+
+class RegexLexer:
+    def __init__(self, source):
+        self.text = source.read()
+        self.offset = 0
+        self.current_token = None
+        self.current_offset = 0
+        self.current_position = (0, 0)
+        self.newline_offsets = [match.start() for match in re.finditer("\n", self.text)]
+        self.comment_offsets = [match.start() for match in re.finditer("#", self.text)]
+
+    def seek(self, offset):
+        self.offset = offset
+
+    def get_next_token(self):
+        self.current_token = self.try_build_token()
+        return self.current_token
+
+    def get_current_token(self):
+        return self.current_token
+
+    def get_current_position(self):
+        return self.current_position
+
+    def get_current_offset(self):
+        return self.current_offset
+
+    def get_end_offset(self):
+        return self.offset
+
+    def get_source_layout(self):
+        return self.newline_offsets, self.comment_offsets, len(self.text)
+
+    def get_position(self, offset):
+        if offset >= len(self.text):
+            return len(self.newline_offsets) + 2, 0
+        if not self.comment_offsets:
+            line = bisect_left(self.newline_offsets, offset)
+            return line + 1, offset - (self.newline_offsets[line - 1] if line else -1)
+        return offset_to_position(self.newline_offsets, self.comment_offsets, offset)
+
+    def try_build_token(self):
+        match = TOKEN_PATTERN.match(self.text, self.offset)
+        if not match:
+            self.offset = SKIP.match(self.text, self.offset).end()
+            self.current_offset = self.offset
+            self.current_position = self.get_position(self.offset)
+            return None
+
+        kind = match.lastgroup
+        if kind == "fraction":
+            kind = "number"
+        self.current_offset = match.start(kind)
+        self.current_position = self.get_position(self.current_offset)
+        self.offset = match.end()
+        value = match.group(kind)
+
+        if kind == "simple":
+            token_type, token_value = SIMPLE_TOKENS[value]
+            return Token(token_type, token_value, self.current_position)
+        elif kind == "word":
+            return self.build_keyword_or_identifier(value)
+        elif kind == "number":
+            return self.build_number(value, match.group("fraction"))
+        elif kind == "string":
+            return self.build_string()
+        elif kind == "two_char_operator":
+            return Token(OPERATORS[value + "="], value + "=", self.current_position)
+        return Token(TokenType.EOF, None, self.current_position)
+
+    def build_number(self, integer_part, fraction):
+        if len(integer_part) > NUMBER_LIMIT_DIGITS or fraction and len(fraction) - 1 > NUMBER_LIMIT_DIGITS:
+            raise lexer_exception.NumberException("Number too long", self.current_position)
+        int_number = int(integer_part)
+
+        if fraction is None:
+            if int_number > MAX_NUMBER:
+                raise lexer_exception.NumberException("Number above max", self.current_position)
+            elif int_number < MIN_NUMBER:
+                raise lexer_exception.NumberException("Number below min", self.current_position)
+
+            return Token(TokenType.INT_VALUE, int_number, self.current_position)
+
+        float_part = int(fraction[1:]) if len(fraction) > 1 else 0
+
+        digits = int(math.log10(float_part)) + 1
+        number = float(int_number) + float_part * 10 ** -digits
+
+        if number > MAX_NUMBER:
+            raise lexer_exception.NumberException("Number above max", self.current_position)
+        elif number < MIN_NUMBER:
+            raise lexer_exception.NumberException("Number below min", self.current_position)
+
+        return Token(TokenType.FLOAT_VALUE, number, self.current_position)
+
+    def build_string(self):
+        text = self.text
+        start = self.offset
+        if start >= len(text):
+            raise lexer_exception.UnclosedStringException("Unclosed string", self.current_position)
+        if text[start] == '"':
+            self.offset = start + 1
+            return Token(TokenType.STRING_VALUE, "", self.current_position)
+        if text[start] == "#":
+            # the comment is skipped and its closing newline becomes the first character
+            start = text.find("\n", start)
+            if start < 0:
+                raise lexer_exception.UnclosedStringException("Unclosed string", self.current_position)
+
+        end = STRING_BODY.match(text, start + 1).end()
+        if end - start > STRING_LIMIT_CHARS:
+            raise lexer_exception.StringTooLongException("String too long", self.current_position)
+        if end >= len(text) or text[end] != '"':
+            raise lexer_exception.UnclosedStringException("Unclosed string", self.current_position)
+
+        self.offset = end + 1
+        return Token(TokenType.STRING_VALUE, text[start:end], self.current_position)
+
+    def build_keyword_or_identifier(self, text):
+        if len(text) > ID_LIMIT_CHARS:
+            raise lexer_exception.IdentifierTooLongException("Identifier too long", self.current_position)
+        if text == "true":
+            return Token(TokenType.BOOL_VALUE, True, self.current_position)
+        elif text == "false":
+            return Token(TokenType.BOOL_VALUE, False, self.current_position)
+        elif text in KEYWORDS:
+            return Token(KEYWORDS[text], sys.intern(text), self.current_position)
+        return Token(TokenType.ID, sys.intern(text), self.current_position)
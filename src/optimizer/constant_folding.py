@@ -0,0 +1,114 @@
+import operator
+
+from src.interpreter.resolver import get_node_class
+from src.ast.nodes import *
+
+FOLDED_OPERATIONS = {
+    AddExpression: operator.add,
+    SubExpression: operator.sub,
+    MultiplyExpression: operator.mul,
+    DivisionExpression: operator.truediv,
+    LessThanExpression: operator.lt,
+    GreaterThanExpression: operator.gt,
+    LessThanOrEqualExpression: operator.le,
+}
+
+VALUE_NODES = {
+    bool: BoolValue,
+    int: IntValue,
+    float: FloatValue,
+    str: StringValue,
+}
+
+MAXIMUM_STRING_LENGTH = 1000
+
+
+class ConstantFolder:
+    def fold_program(self, program):
+        return self.fold(program)
+
+    def fold(self, node):
+        if type(node) is list or type(node) is tuple:
+            items = [self.fold(item) for item in node]
+            if all(item is old_item for item, old_item in zip(items, node)):
+                return node
+            return items if type(node) is list else tuple(items)
+        elif not isinstance(node, Node):
+            return node
+        node_class = get_node_class(node)
+        if node_class in VALUE_NODES.values():
+            return node
+        elif node_class is StatementBlock:
+            return self.fold_statement_block(node)
+        elif node_class is IfStatement:
+            chosen_statement = self.choose_branch(node)
+            if chosen_statement is not None:
+                return self.fold(chosen_statement)
+        fields = [self.fold(field) for field in node.get_fields()]
+        if node_class in FOLDED_OPERATIONS:
+            value_node = fold_operation(node, *fields)
+            if value_node is not None:
+                return value_node
+        if all(field is old_field for field, old_field in zip(fields, node.get_fields())):
+            return node
+        return rebuild_node(node, fields)
+
+    def fold_statement_block(self, statement_block):
+        statements = []
+        for statement in statement_block.statements:
+            chosen_statement = self.choose_branch(statement) if get_node_class(statement) is IfStatement else None
+            if get_node_class(chosen_statement) is StatementBlock:
+                # the branch runs in the scope of the if statement, so its statements can take its place
+                statements += self.fold_statement_block(chosen_statement).statements
+            else:
+                statements.append(self.fold(statement))
+        if len(statements) == len(statement_block.statements) and all(
+            statement is old_statement for statement, old_statement in zip(statements, statement_block.statements)
+        ):
+            return statement_block
+        return rebuild_node(statement_block, [statements])
+
+    def choose_branch(self, if_statement):
+        # a non-bool condition still has to raise, and an empty branch fails when it is executed
+        condition = self.fold(if_statement.condition)
+        if get_node_class(condition) is not BoolValue:
+            return None
+        chosen_statement = if_statement.true_statement if condition.value else if_statement.false_statement
+        if not isinstance(chosen_statement, Node):
+            return None
+        return chosen_statement
+
+
+def fold_operation(node, left, right):
+    value_classes = VALUE_NODES.values()
+    if get_node_class(left) not in value_classes or get_node_class(right) not in value_classes:
+        return None
+    node_class = get_node_class(node)
+    left_value, right_value = left.value, right.value
+    if node_class is DivisionExpression and right_value == 0:
+        return None
+    if node_class is MultiplyExpression and get_repeated_length(left_value, right_value) > MAXIMUM_STRING_LENGTH:
+        return None
+    try:
+        value = FOLDED_OPERATIONS[node_class](left_value, right_value)
+    except (TypeError, ArithmeticError):
+        return None
+    return VALUE_NODES[type(value)](value, node.line, node.column)
+
+
+def get_repeated_length(left_value, right_value):
+    if type(left_value) is str and type(right_value) is int:
+        return len(left_value) * right_value
+    elif type(left_value) is int and type(right_value) is str:
+        return left_value * len(right_value)
+    return 0
+
+
+def rebuild_node(node, fields):
+    node_class = get_node_class(node)
+    new_node = node_class.__new__(node_class)
+    for name, value in zip(node_class.__slots__, fields):
+        setattr(new_node, name, value)
+    new_node.line = node.line
+    new_node.column = node.column
+    return new_node
@@ -0,0 +1,177 @@
+from src.interpreter.resolver import LEAF_NODES, get_node_class
+from src.interpreter.type_checker import TypeChecker, SIMPLE_TYPES
+from src.optimizer.constant_folding import rebuild_node
+from src.ast.nodes import *
+
+MAXIMUM_INLINED_SIZE = 30
+
+# nodes whose evaluation does not depend on the scope they run in
+INLINED_NODES = (
+    BoolValue,
+    IntValue,
+    FloatValue,
+    StringValue,
+    Identifier,
+    Variable,
+    AddExpression,
+    SubExpression,
+    MultiplyExpression,
+    DivisionExpression,
+    LessThanExpression,
+    GreaterThanExpression,
+    LessThanOrEqualExpression,
+    AndExpression,
+    OrExpression,
+    FunctionCall,
+    Arguments,
+    List,
+    Pair,
+    Dict,
+)
+
+
+class Inliner:
+    def __init__(self, maximum_size=MAXIMUM_INLINED_SIZE):
+        self.maximum_size = maximum_size
+        self.inlined_calls = {}
+        self.function_definitions = {}
+        self.inlined_bodies = {}
+
+    def inline_program(self, program):
+        type_checker = TypeChecker()
+        type_checker.collect_functions(program)
+        well_behaved_functions = type_checker.find_well_behaved_functions()
+        recursive_functions = find_recursive_functions(type_checker.function_definitions)
+        for name in well_behaved_functions - recursive_functions:
+            function_definition = type_checker.function_definitions[name][0].function_definition
+            if is_inlinable(function_definition):
+                self.function_definitions[name] = function_definition
+        return self.inline(program)
+
+    def inline(self, node):
+        if type(node) in LEAF_NODES:
+            return node
+        elif type(node) is list or type(node) is tuple:
+            items = [self.inline(item) for item in node]
+            if all(item is old_item for item, old_item in zip(items, node)):
+                return node
+            return items if type(node) is list else tuple(items)
+        elif not isinstance(node, Node):
+            return node
+        fields = [self.inline(field) for field in node.get_fields()]
+        if not all(field is old_field for field, old_field in zip(fields, node.get_fields())):
+            node = rebuild_node(node, fields)
+        if get_node_class(node) is FunctionCall:
+            return self.inline_call(node)
+        return node
+
+    def inline_call(self, function_call):
+        name = function_call.identifier.value
+        function_definition = self.function_definitions.get(name)
+        if function_definition is None or len(function_call.arguments.arguments) != len(function_definition.arguments):
+            return function_call
+        body = self.get_inlined_body(name)
+        if body is None:
+            return function_call
+        self.inlined_calls[function_call.position] = name
+        return InlinedCall(function_call, body, function_call.line, function_call.column)
+
+    def get_inlined_body(self, name):
+        # the body with the calls inside it inlined, None when that grows past the size limit
+        if name not in self.inlined_bodies:
+            function_definition = self.function_definitions[name]
+            argument_indexes = {parameter[1].value: index for index, parameter in enumerate(function_definition.arguments)}
+            body = substitute_arguments(function_definition.body, argument_indexes, function_definition.return_type)
+            body = self.inline(body)
+            self.inlined_bodies[name] = body if get_size(body) <= self.maximum_size else None
+        return self.inlined_bodies[name]
+
+
+def is_inlinable(function_definition):
+    if function_definition.return_type not in SIMPLE_TYPES:
+        return False
+    parameter_names = [parameter[1].value for parameter in function_definition.arguments]
+    if len(set(parameter_names)) != len(parameter_names):
+        return False
+    return is_inlinable_statement(function_definition.body, set(parameter_names), True)
+
+
+def is_inlinable_statement(node, parameter_names, tail):
+    # every path has to end in a return and nothing may need the callee's scope
+    node_class = get_node_class(node)
+    if node_class is StatementBlock:
+        statements = node.statements
+        return (
+            bool(statements) and
+            all(is_inlinable_statement(statement, parameter_names, False) for statement in statements[:-1]) and
+            is_inlinable_statement(statements[-1], parameter_names, tail)
+        )
+    elif node_class is ReturnStatement:
+        return tail and reads_only(node.expression, parameter_names)
+    elif node_class is IfStatement:
+        return (
+            tail and
+            reads_only(node.condition, parameter_names) and
+            is_inlinable_statement(node.true_statement, parameter_names, True) and
+            is_inlinable_statement(node.false_statement, parameter_names, True)
+        )
+    return not tail and reads_only(node, parameter_names)
+
+
+def reads_only(node, parameter_names):
+    if type(node) is list or type(node) is tuple:
+        return all(reads_only(item, parameter_names) for item in node)
+    node_class = get_node_class(node)
+    if node_class not in INLINED_NODES:
+        return False
+    elif node_class is Variable:
+        return node.name.value in parameter_names
+    elif node_class in LEAF_NODES:
+        return True
+    return all(reads_only(field, parameter_names) for field in node.get_fields())
+
+
+def substitute_arguments(node, argument_indexes, return_type):
+    if type(node) in LEAF_NODES:
+        return node
+    elif type(node) is list or type(node) is tuple:
+        items = [substitute_arguments(item, argument_indexes, return_type) for item in node]
+        return items if type(node) is list else tuple(items)
+    elif not isinstance(node, Node):
+        return node
+    node_class = get_node_class(node)
+    if node_class is Variable:
+        return InlinedArgument(argument_indexes[node.name.value], node.line, node.column)
+    elif node_class is ReturnStatement:
+        expression = substitute_arguments(node.expression, argument_indexes, return_type)
+        return InlinedReturn(expression, return_type, node.line, node.column)
+    fields = [substitute_arguments(field, argument_indexes, return_type) for field in node.get_fields()]
+    return rebuild_node(node, fields)
+
+
+def get_size(node):
+    if type(node) is list or type(node) is tuple:
+        return sum(get_size(item) for item in node)
+    elif not isinstance(node, Node):
+        return 0
+    return 1 + sum(get_size(field) for field in node.get_fields())
+
+
+def find_recursive_functions(function_definitions):
+    called_names = {}
+    for name, summaries in function_definitions.items():
+        called_names[name] = set()
+        for summary in summaries:
+            called_names[name] |= summary.called_names & function_definitions.keys()
+    recursive_functions = set()
+    for name in called_names:
+        reached_names = set()
+        names = list(called_names[name])
+        while names:
+            called_name = names.pop()
+            if called_name not in reached_names:
+                reached_names.add(called_name)
+                names.extend(called_names[called_name])
+        if name in reached_names:
+            recursive_functions.add(name)
+    return recursive_functions
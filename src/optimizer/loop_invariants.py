@@ -0,0 +1,142 @@
+from src.interpreter.resolver import LEAF_NODES, get_node_class
+from src.interpreter.type_checker import TypeChecker, BUILTIN_RESULT_TYPES, MUTATING_METHODS
+from src.optimizer.constant_folding import rebuild_node
+from src.ast.nodes import *
+
+LOOP_NODES = (WhileStatement, ForStatement)
+
+INVARIANT_OPERATIONS = (
+    AddExpression,
+    SubExpression,
+    MultiplyExpression,
+    DivisionExpression,
+    LessThanExpression,
+    GreaterThanExpression,
+    LessThanOrEqualExpression,
+    AndExpression,
+    OrExpression,
+)
+
+# expressions inside these run in another scope or are handled as a loop of their own
+SCOPE_NODES = (WhileStatement, ForStatement, InvariantLoop, LINQ, FunctionDefinition)
+
+
+class LoopInvariantMover:
+    def __init__(self):
+        self.function_names = set()
+        self.well_behaved_functions = set()
+
+    def move_program(self, program):
+        type_checker = TypeChecker()
+        type_checker.collect_functions(program)
+        self.function_names = set(type_checker.function_definitions)
+        self.well_behaved_functions = type_checker.find_well_behaved_functions()
+        return self.move(program)
+
+    def move(self, node):
+        if type(node) in LEAF_NODES:
+            return node
+        elif type(node) is list or type(node) is tuple:
+            items = [self.move(item) for item in node]
+            if all(item is old_item for item, old_item in zip(items, node)):
+                return node
+            return items if type(node) is list else tuple(items)
+        elif not isinstance(node, Node):
+            return node
+        fields = [self.move(field) for field in node.get_fields()]
+        if not all(field is old_field for field, old_field in zip(fields, node.get_fields())):
+            node = rebuild_node(node, fields)
+        if get_node_class(node) in LOOP_NODES:
+            return self.move_loop(node)
+        return node
+
+    def move_loop(self, loop):
+        variant_names = set()
+        if not self.collect_variant_names(loop, variant_names):
+            return loop
+        if get_node_class(loop) is ForStatement:
+            variant_names.add(loop.identifier.value)
+        hoister = InvariantHoister(variant_names)
+        if get_node_class(loop) is WhileStatement:
+            loop = rebuild_node(loop, [hoister.hoist(loop.condition), hoister.hoist(loop.body)])
+        else:
+            loop = rebuild_node(loop, [loop.type, loop.identifier, loop.collection, hoister.hoist(loop.body)])
+        if hoister.invariant_count == 0:
+            return loop
+        return InvariantLoop(loop, hoister.invariant_count, loop.line, loop.column)
+
+    def collect_variant_names(self, node, variant_names):
+        # returns False when the loop can leave its scope or change values that are not assigned by name
+        if type(node) in LEAF_NODES:
+            return True
+        elif type(node) is list or type(node) is tuple:
+            return all(self.collect_variant_names(item, variant_names) for item in node)
+        elif not isinstance(node, Node):
+            return True
+        node_class = get_node_class(node)
+        if node_class is FunctionDefinition:
+            return True
+        elif node_class is ReturnStatement:
+            return False
+        elif node_class is Assignment or node_class is InitStatement:
+            variant_names.add(node.identifier.value)
+        elif node_class is ForStatement:
+            variant_names.add(node.identifier.value)
+        elif node_class is LINQ:
+            variant_names.add(node.from_statement[1].value)
+        elif node_class is FunctionCall and node.identifier.value not in BUILTIN_RESULT_TYPES:
+            # the callee may change the scope or the arguments it was given
+            name = node.identifier.value
+            if node.arguments.arguments or name in self.function_names and name not in self.well_behaved_functions:
+                return False
+        elif node_class is MethodCall and node.method_identifier.value in MUTATING_METHODS:
+            # values are shared between variables, so a mutated value may be read under any name
+            return False
+        return all(self.collect_variant_names(field, variant_names) for field in node.get_fields())
+
+
+class InvariantHoister:
+    def __init__(self, variant_names):
+        self.variant_names = variant_names
+        self.invariant_count = 0
+
+    def hoist(self, node):
+        if type(node) in LEAF_NODES:
+            return node
+        elif type(node) is list or type(node) is tuple:
+            items = [self.hoist(item) for item in node]
+            if all(item is old_item for item, old_item in zip(items, node)):
+                return node
+            return items if type(node) is list else tuple(items)
+        elif not isinstance(node, Node):
+            return node
+        node_class = get_node_class(node)
+        if node_class in SCOPE_NODES or node_class is InvariantExpression:
+            return node
+        elif node_class in INVARIANT_OPERATIONS and self.is_invariant(node) and reads_variable(node):
+            invariant_expression = InvariantExpression(node, self.invariant_count, node.line, node.column)
+            self.invariant_count += 1
+            return invariant_expression
+        fields = [self.hoist(field) for field in node.get_fields()]
+        if all(field is old_field for field, old_field in zip(fields, node.get_fields())):
+            return node
+        return rebuild_node(node, fields)
+
+    def is_invariant(self, node):
+        node_class = get_node_class(node)
+        if node_class in LEAF_NODES:
+            return True
+        elif node_class is Variable:
+            return node.name.value not in self.variant_names
+        elif node_class in INVARIANT_OPERATIONS:
+            return self.is_invariant(node.left) and self.is_invariant(node.right)
+        return False
+
+
+def reads_variable(node):
+    node_class = get_node_class(node)
+    if node_class is Variable:
+        return True
+    elif node_class in INVARIANT_OPERATIONS:
+        return reads_variable(node.left) or reads_variable(node.right)
+    return False
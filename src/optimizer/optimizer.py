@@ -0,0 +1,9 @@
+from src.optimizer.constant_folding import ConstantFolder
+from src.optimizer.inlining import Inliner
+from src.optimizer.loop_invariants import LoopInvariantMover
+
+
+def optimize_program(program, inliner=None):
+    program = ConstantFolder().fold_program(program)
+    program = (inliner or Inliner()).inline_program(program)
+    return LoopInvariantMover().move_program(program)
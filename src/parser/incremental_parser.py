@@ -0,0 +1,153 @@
+import io
+from bisect import bisect_left
+
+from src.ast.abstract_node import Node
+from src.ast.nodes import Program
+from src.lexer.regex_lexer import RegexLexer
+from src.lexer.incremental_lexer import relex, apply_edit
+from src.parser.parser import Parser
+from src.token.token_buffer import TokenBufferStream, tokenize
+from src.token.token_types import TokenType
+
+
+class IncrementalParser:
+    def __init__(self, text):
+        self.text = text
+        self.buffer = None
+        self.program = None
+        self.spans = []
+        self.function_nodes = []
+        self.parse_all()
+
+    def parse_all(self):
+        self.buffer = tokenize(RegexLexer(io.StringIO(self.text)))
+        functions, self.spans = parse_functions(self.buffer, 0)
+        self.function_nodes = [None] * len(functions)
+        self.program = Program(functions)
+        return self.program
+
+    def get_program(self):
+        return self.program
+
+    def edit(self, offset, deleted_length, inserted_text):
+        if self.program is None:
+            self.text = apply_edit(self.text, offset, deleted_length, inserted_text)
+            return self.parse_all()
+
+        old_buffer = self.buffer
+        old_functions = self.program.program_body
+        old_spans = self.spans
+        old_nodes = self.function_nodes
+        self.program = None
+        try:
+            self.text, self.buffer = relex(old_buffer, self.text, offset, deleted_length, inserted_text)
+        except Exception:
+            self.text = apply_edit(self.text, offset, deleted_length, inserted_text)
+            raise
+        new_buffer = self.buffer
+        delta = len(inserted_text) - deleted_length
+
+        # functions ending before the edit keep their tokens, nodes and positions
+        kept = 0
+        while kept < len(old_spans) and old_buffer.get_end(old_spans[kept][1] - 1) < offset:
+            kept += 1
+        functions = old_functions[:kept]
+        spans = old_spans[:kept]
+        function_nodes = old_nodes[:kept]
+        cursor = spans[-1][1] if spans else 0
+
+        old_starts = [old_buffer.get_start(start) for start, _ in old_spans]
+        parser = Parser(None, TokenBufferStream(new_buffer, cursor))
+        while True:
+            reused = find_reusable_function(old_buffer, old_spans, old_starts, new_buffer, cursor,
+                                            offset + deleted_length, delta)
+            if reused is not None:
+                reuse_functions(old_buffer, old_functions, old_spans, old_nodes, new_buffer, cursor, reused,
+                                functions, spans, function_nodes)
+                break
+            if parser.current_token.get_type() == TokenType.EOF:
+                break
+            functions.append(parse_function(parser))
+            spans.append((cursor, parser.lexer.get_cursor()))
+            function_nodes.append(None)
+            cursor = parser.lexer.get_cursor()
+
+        self.program = Program(functions)
+        self.spans = spans
+        self.function_nodes = function_nodes
+        return self.program
+
+
+def parse_function(parser):
+    function = parser.parse_function_declaration()
+    if function is None:
+        parser.require_token(TokenType.FUNCTION)
+    return function
+
+
+def parse_functions(buffer, cursor):
+    stream = TokenBufferStream(buffer, cursor)
+    parser = Parser(None, stream)
+    functions = []
+    spans = []
+    while parser.current_token.get_type() != TokenType.EOF:
+        start = stream.get_cursor()
+        functions.append(parse_function(parser))
+        spans.append((start, stream.get_cursor()))
+    return functions, spans
+
+
+def find_reusable_function(old_buffer, old_spans, old_starts, new_buffer, cursor, old_edit_end, delta):
+    # the rest of the old program can be reused once a function boundary lies
+    # past the edit and the remaining token streams are identical
+    old_offset = new_buffer.get_start(cursor) - delta
+    if old_offset < old_edit_end:
+        return None
+    index = bisect_left(old_starts, old_offset)
+    if index == len(old_starts) or old_starts[index] != old_offset:
+        return None
+    old_cursor = old_spans[index][0]
+    if new_buffer.types[cursor:] != old_buffer.types[old_cursor:]:
+        return None
+    # relexing pools the values again, so value indexes are compared through the new pool
+    value_indexes = [new_buffer.value_pool.get((type(value), value)) for value in old_buffer.values]
+    if new_buffer.value_indexes[cursor:].tolist() != [value_indexes[i] for i in old_buffer.value_indexes[old_cursor:]]:
+        return None
+    return index
+
+
+def reuse_functions(old_buffer, old_functions, old_spans, old_nodes, new_buffer, cursor, index,
+                    functions, spans, function_nodes):
+    old_line, old_column = old_buffer.get_position(old_spans[index][0])
+    new_line, new_column = new_buffer.get_position(cursor)
+    line_delta = new_line - old_line
+    column_delta = new_column - old_column
+    index_delta = cursor - old_spans[index][0]
+    for function, (start, end), nodes in zip(old_functions[index:], old_spans[index:], old_nodes[index:]):
+        if line_delta or column_delta and function.line == old_line:
+            if nodes is None:
+                nodes = collect_positioned_nodes(function, [], set())
+            shift_positions(nodes, line_delta, old_line, column_delta)
+        functions.append(function)
+        spans.append((start + index_delta, end + index_delta))
+        function_nodes.append(nodes)
+
+
+def collect_positioned_nodes(node, nodes, visited):
+    if isinstance(node, (list, tuple)):
+        for item in node:
+            collect_positioned_nodes(item, nodes, visited)
+    elif isinstance(node, Node) and id(node) not in visited:
+        visited.add(id(node))
+        if getattr(node, "line", None) is not None:
+            nodes.append(node)
+        for value in node.get_fields():
+            collect_positioned_nodes(value, nodes, visited)
+    return nodes
+
+
+def shift_positions(nodes, line_delta, column_line, column_delta):
+    for node in nodes:
+        if node.line == column_line:
+            node.column += column_delta
+        node.line += line_delta
@@ -1,8 +1,14 @@
+from concurrent.futures import ProcessPoolExecutor
+import gc
+import os
+
 from src.lexer.lexer import Lexer
 from src.token.token_types import TokenType
 from src.token.token import Token
+from src.token.token_buffer import TokenBufferStream, tokenize
 
 from src.ast.nodes import *
+from src.ast import serializer
 from src.exceptions.parser_exception import *
 
 VARIABLE_TYPES = {
@@ -47,6 +53,8 @@ MULTIPLICATIVE_SIGNS = {
     TokenType.DIVIDE_SIGN: DivisionExpression
 }
 
+CHUNKS_PER_WORKER = 4
+
 
 class Parser:
     def __init__(self, reader, lexer: Lexer):
@@ -85,6 +93,42 @@ class Parser:
             program.add_function(function)
         return program
 
+    def parse_parallel(self, workers=None):
+        if isinstance(self.lexer, TokenBufferStream):
+            buffer, cursor = self.lexer.buffer, self.lexer.get_cursor()
+        else:
+            buffer, cursor = tokenize(self.lexer, self.current_token), 0
+            self.lexer = TokenBufferStream(buffer, cursor)
+            self.current_token = self.lexer.get_next_token()
+        workers = workers or os.cpu_count() or 1
+
+        spans = find_function_spans(buffer, cursor)
+        if spans is None or workers == 1 or len(spans) < 2:
+            return self.parse()
+
+        chunk_size = -(-len(spans) // (workers * CHUNKS_PER_WORKER))
+        chunks = [spans[index:index + chunk_size] for index in range(0, len(spans), chunk_size)]
+        try:
+            with ProcessPoolExecutor(workers) as executor:
+                results = list(executor.map(
+                    parse_function_chunk,
+                    [buffer.get_slice(chunk[0][0], chunk[-1][1]) for chunk in chunks],
+                    [[end - chunk[0][0] for _, end in chunk] for chunk in chunks]
+                ))
+        except Exception:
+            results = [None]
+        if None in results:
+            # the spans did not match the grammar, parse sequentially to get the usual result or error
+            return self.parse()
+
+        program = Program()
+        for functions in results:
+            for function in serializer.loads(functions):
+                program.add_function(function)
+        self.lexer = TokenBufferStream(buffer, len(buffer) - 1)
+        self.current_token = self.lexer.get_next_token()
+        return program
+
     def parse_function_declaration(self):
         line, column = self.current_token.get_position()
         if self.current_token.get_type() != TokenType.FUNCTION:
@@ -541,3 +585,53 @@ class Parser:
             content = []
         self.require_and_consume(TokenType.RIGHT_CURLY_BRACKET)
         return WhileStatement(condition, content, line, column)
+
+
+def find_function_spans(buffer, cursor):
+    # [start, end) token ranges of the top-level functions, found by matching curly brackets
+    function_code = TokenType.FUNCTION.value
+    left_code = TokenType.LEFT_CURLY_BRACKET.value
+    right_code = TokenType.RIGHT_CURLY_BRACKET.value
+    eof_code = TokenType.EOF.value
+    types = buffer.types
+    spans = []
+    start = None
+    depth = 0
+    for index in range(cursor, len(types)):
+        code = types[index]
+        if depth == 0:
+            if start is None:
+                if code == eof_code:
+                    return spans
+                if code != function_code:
+                    return None
+                start = index
+            elif code == left_code:
+                depth = 1
+            elif code == eof_code:
+                return None
+        elif code == left_code:
+            depth += 1
+        elif code == right_code:
+            depth -= 1
+            if depth == 0:
+                spans.append((start, index + 1))
+                start = None
+        elif code == eof_code:
+            return None
+    return None
+
+
+def parse_function_chunk(buffer, span_ends):
+    gc.disable()
+    try:
+        stream = TokenBufferStream(buffer)
+        parser = Parser(None, stream)
+        functions = []
+        for end in span_ends:
+            functions.append(parser.parse_function_declaration())
+            if stream.get_cursor() != end:
+                return None
+        return serializer.dumps(functions)
+    finally:
+        gc.enable()
@@ -1,34 +1,173 @@
+from bisect import bisect_left
+import codecs
+import mmap
+import os
+import stat
+
+BUFFER_SIZE = 64 * 1024
+MMAP_THRESHOLD = 1024 * 1024
+
+ASCII_CHARS = [chr(code) for code in range(128)]
+
+
 class Reader:
-    def __init__(self, source):
+    def __init__(self, source, buffer_size=BUFFER_SIZE):
         self.source = source
+        self.buffer_size = buffer_size
+        self.buffer = ""
+        self.buffer_index = 0
         self.current_char = ""
-        self.current_position = (1, 0)
-        self.next_position = (1, 1)
+        self.current_offset = 0
+        self.next_offset = 0
+        self.previous_end = 0
+        self.newline_offsets = []
+        self.comment_offsets = []
         self.next()
 
     def next(self):
-        next_char = self.source.read(1)
+        self.previous_end = self.current_offset + 1
+        next_char = self.read_char()
 
         if not next_char:
             self.current_char = "EOF"
-            self.current_position = (self.next_position[0] + 1, 0)
+            self.current_offset = self.next_offset
 
         elif next_char == "\n":
             self.current_char = next_char
-            self.current_position = self.next_position
-            self.next_position = (self.current_position[0] + 1, 1)
+            self.current_offset = self.next_offset
+            self.newline_offsets.append(self.next_offset)
+            self.next_offset += 1
 
         elif next_char == "#":
+            # '#' itself does not take up a column
+            self.comment_offsets.append(self.next_offset)
+            self.next_offset += 1
+            previous_end = self.previous_end
             while self.current_char != "\n":
                 self.next()
+            self.previous_end = previous_end
 
         else:
             self.current_char = next_char
-            self.current_position = self.next_position
-            self.next_position = (self.current_position[0], self.current_position[1] + 1)
+            self.current_offset = self.next_offset
+            self.next_offset += 1
+
+    def read_char(self):
+        if self.buffer_index >= len(self.buffer):
+            self.buffer = self.source.read(self.buffer_size)
+            self.buffer_index = 0
+            if not self.buffer:
+                return ""
+        char = self.buffer[self.buffer_index]
+        self.buffer_index += 1
+        return char
+
+    def read_span(self, span_pattern, limit):
+        # current character plus the following characters matched by span_pattern,
+        # which must not match newlines or '#', taken straight from the buffer
+        characters = [self.current_char]
+        length = 1
+        while length <= limit:
+            if self.buffer_index >= len(self.buffer):
+                self.buffer = self.source.read(self.buffer_size)
+                self.buffer_index = 0
+                if not self.buffer:
+                    break
+            end = span_pattern.match(self.buffer, self.buffer_index, self.buffer_index + limit + 1 - length).end()
+            if end == self.buffer_index:
+                break
+            characters.append(self.buffer[self.buffer_index:end])
+            length += end - self.buffer_index
+            self.next_offset += end - self.buffer_index
+            self.buffer_index = end
+        self.current_offset = self.next_offset - 1
+        self.next()
+        return "".join(characters)
 
     def get_current_char(self):
         return self.current_char
 
+    def get_current_offset(self):
+        return self.current_offset
+
     def get_current_position(self):
-        return self.current_position
+        return self.get_position(self.current_offset)
+
+    def get_previous_end(self):
+        return self.previous_end
+
+    def get_layout(self):
+        return self.newline_offsets, self.comment_offsets, self.next_offset
+
+    def get_position(self, offset):
+        if offset >= self.next_offset and self.current_char == "EOF":
+            return len(self.newline_offsets) + 2, 0
+        return offset_to_position(self.newline_offsets, self.comment_offsets, offset)
+
+    def close(self):
+        pass
+
+
+class MmapReader(Reader):
+    def __init__(self, source):
+        size = os.fstat(source.fileno()).st_size
+        self.mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.mapping_size = size
+        self.mapping_index = 0
+        super().__init__(source)
+
+    def read_char(self):
+        index = self.mapping_index
+        if index >= self.mapping_size:
+            return ""
+        byte = self.mapping[index]
+        if byte < 0x80:
+            self.mapping_index = index + 1
+            if byte == 0x0D:
+                if self.mapping_index < self.mapping_size and self.mapping[self.mapping_index] == 0x0A:
+                    self.mapping_index += 1
+                return "\n"
+            return ASCII_CHARS[byte]
+        if byte < 0xE0:
+            length = 2
+        elif byte < 0xF0:
+            length = 3
+        else:
+            length = 4
+        self.mapping_index = index + length
+        return self.mapping[index:index + length].decode("utf-8")
+
+    def read_span(self, span_pattern, limit):
+        characters = [self.current_char]
+        self.next()
+        while len(characters) <= limit and self.current_char != "EOF" and span_pattern.fullmatch(self.current_char):
+            characters.append(self.current_char)
+            self.next()
+        return "".join(characters)
+
+    def close(self):
+        if isinstance(self.mapping, mmap.mmap):
+            self.mapping.close()
+
+
+def offset_to_position(newline_offsets, comment_offsets, offset):
+    line = bisect_left(newline_offsets, offset)
+    line_start = newline_offsets[line - 1] + 1 if line else 0
+    skipped = bisect_left(comment_offsets, offset) - bisect_left(comment_offsets, line_start)
+    return line + 1, offset - line_start + 1 - skipped
+
+
+def is_utf8(source):
+    encoding = getattr(source, "encoding", None)
+    return encoding is not None and codecs.lookup(encoding).name == "utf-8"
+
+
+def open_reader(source):
+    try:
+        status = os.fstat(source.fileno())
+    except (AttributeError, OSError):
+        return Reader(source)
+    # the mapped bytes are decoded as UTF-8, so files opened with another encoding are streamed as text
+    if stat.S_ISREG(status.st_mode) and status.st_size >= MMAP_THRESHOLD and is_utf8(source):
+        return MmapReader(source)
+    return Reader(source)
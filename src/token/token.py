@@ -3,14 +3,20 @@ from typing import Optional
 
 
 class Token:
+    __slots__ = ("type", "value", "line", "column")
+
     def __init__(self, type: TokenType, value: Optional[str | int | float], position: tuple[int, int]):
         self.type = type
         self.value = value
-        self.position = position
+        self.line, self.column = position
 
     def __str__(self):
         return f'{self.type}: {self.value}'
 
+    @property
+    def position(self) -> tuple[int, int]:
+        return self.line, self.column
+
     def get_type(self) -> TokenType:
         return self.type
 
@@ -18,10 +24,10 @@ class Token:
         return self.value
 
     def get_position(self) -> tuple[int, int]:
-        return self.position
+        return self.line, self.column
 
     def get_line(self):
-        return self.position[0]
+        return self.line
 
     def get_column(self):
-        return self.position[1]
+        return self.column
@@ -0,0 +1,140 @@
+from array import array
+
+from src.token.token_types import TokenType
+from src.token.token import Token
+from src.reader import offset_to_position
+
+TOKEN_TYPES = [None] * (max(token_type.value for token_type in TokenType) + 1)
+for token_type in TokenType:
+    TOKEN_TYPES[token_type.value] = token_type
+
+
+class TokenBuffer:
+    def __init__(self, newline_offsets=(), comment_offsets=(), source_length=0):
+        self.types = array("H")
+        self.starts = array("I")
+        self.ends = array("I")
+        self.value_indexes = array("I")
+        self.values = []
+        self.value_pool = {}
+        self.newline_offsets = array("I", newline_offsets)
+        self.comment_offsets = array("I", comment_offsets)
+        self.source_length = source_length
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["value_pool"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.value_pool = {(type(value), value): index for index, value in enumerate(self.values)}
+
+    def add_value(self, value):
+        key = (type(value), value)
+        value_index = self.value_pool.get(key)
+        if value_index is None:
+            value_index = len(self.values)
+            self.value_pool[key] = value_index
+            self.values.append(value)
+        return value_index
+
+    def append(self, token_type, start, end, value):
+        self.types.append(token_type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.value_indexes.append(self.add_value(value))
+
+    def set_layout(self, newline_offsets, comment_offsets, source_length):
+        self.newline_offsets = array("I", newline_offsets)
+        self.comment_offsets = array("I", comment_offsets)
+        self.source_length = source_length
+
+    def get_type(self, index):
+        return TOKEN_TYPES[self.types[index]]
+
+    def get_value(self, index):
+        return self.values[self.value_indexes[index]]
+
+    def get_start(self, index):
+        return self.starts[index]
+
+    def get_end(self, index):
+        return self.ends[index]
+
+    def get_position(self, index):
+        return self.offset_to_position(self.starts[index])
+
+    def offset_to_position(self, offset):
+        if offset >= self.source_length:
+            return len(self.newline_offsets) + 2, 0
+        return offset_to_position(self.newline_offsets, self.comment_offsets, offset)
+
+    def get_token(self, index):
+        return Token(self.get_type(index), self.get_value(index), self.get_position(index))
+
+    def get_tokens(self):
+        return [self.get_token(index) for index in range(len(self))]
+
+    def get_slice(self, start, end):
+        # tokens [start, end) closed with an EOF token, sharing the value table and layout
+        buffer = TokenBuffer()
+        buffer.types = self.types[start:end]
+        buffer.starts = self.starts[start:end]
+        buffer.ends = self.ends[start:end]
+        buffer.value_indexes = self.value_indexes[start:end]
+        buffer.values = self.values
+        buffer.value_pool = self.value_pool
+        if (type(None), None) not in self.value_pool:
+            buffer.values = list(self.values)
+            buffer.value_pool = dict(self.value_pool)
+        buffer.newline_offsets = self.newline_offsets
+        buffer.comment_offsets = self.comment_offsets
+        buffer.source_length = self.source_length
+        buffer.append(TokenType.EOF, self.source_length, self.source_length, None)
+        return buffer
+
+
+class TokenBufferStream:
+    def __init__(self, buffer, cursor=0):
+        self.buffer = buffer
+        self.cursor = cursor - 1
+        self.current_token = None
+
+    def get_next_token(self):
+        if self.cursor < len(self.buffer) - 1:
+            self.cursor += 1
+        self.current_token = self.buffer.get_token(self.cursor)
+        return self.current_token
+
+    def get_current_token(self):
+        return self.current_token
+
+    def get_current_position(self):
+        return self.buffer.get_position(self.cursor)
+
+    def get_current_offset(self):
+        return self.buffer.get_start(self.cursor)
+
+    def get_cursor(self):
+        return self.cursor
+
+    def peek_type(self, distance=1):
+        index = min(self.cursor + distance, len(self.buffer) - 1)
+        return self.buffer.get_type(index)
+
+
+def tokenize(lexer, token=None):
+    buffer = TokenBuffer()
+    if token is None:
+        token = lexer.get_next_token()
+    while True:
+        buffer.append(token.type, lexer.get_current_offset(), lexer.get_end_offset(), token.value)
+        if token.type == TokenType.EOF:
+            break
+        token = lexer.get_next_token()
+    buffer.set_layout(*lexer.get_source_layout())
+    return buffer
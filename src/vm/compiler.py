@@ -0,0 +1,387 @@
+import operator
+from array import array
+
+from src.ast.nodes import *
+from src.interpreter.closure_interpreter import (
+    PYTHON_TYPES,
+    BUILTIN_FUNCTIONS,
+    CONSTANT_NODES,
+    get_node_class,
+    get_value_type,
+    get_container_type,
+)
+from src.interpreter.tail_calls import mark_tail_calls
+from src.vm.opcodes import *
+
+COMPILE_METHODS = {
+    StatementBlock: "compile_statement_block",
+    FunctionDefinition: "compile_function_definition",
+    IfStatement: "compile_if_statement",
+    WhileStatement: "compile_while_statement",
+    ForStatement: "compile_for_statement",
+    Assignment: "compile_assignment",
+    ReturnStatement: "compile_return_statement",
+    InitStatement: "compile_init_statement",
+    Declaration: "compile_declaration",
+    BoolValue: "compile_value",
+    IntValue: "compile_value",
+    FloatValue: "compile_value",
+    StringValue: "compile_value",
+    Identifier: "compile_value",
+    Expression: "compile_empty_expression",
+    Variable: "compile_variable",
+    FunctionCall: "compile_function_call",
+    MethodCall: "compile_method_call",
+    LINQ: "compile_linq",
+    AndExpression: "compile_and_expression",
+    OrExpression: "compile_or_expression",
+    DivisionExpression: "compile_division_expression",
+    List: "compile_list",
+    Pair: "compile_pair",
+    Dict: "compile_dict",
+    InvariantLoop: "compile_invariant_loop",
+    InvariantExpression: "compile_invariant_expression",
+    InlinedCall: "compile_inlined_call",
+}
+
+BINARY_OPERATIONS = {
+    AddExpression: (ADD, operator.add),
+    SubExpression: (SUBTRACT, operator.sub),
+    MultiplyExpression: (MULTIPLY, operator.mul),
+    LessThanExpression: (LESS_THAN, operator.lt),
+    GreaterThanExpression: (GREATER_THAN, operator.gt),
+    LessThanOrEqualExpression: (LESS_THAN_OR_EQUAL, operator.le),
+}
+
+BINARY_OPERATORS = [operation for _, operation in BINARY_OPERATIONS.values()]
+OPERATOR_INDEXES = {node_class: index for index, node_class in enumerate(BINARY_OPERATIONS)}
+
+STATEMENT_NODES = (
+    StatementBlock,
+    FunctionDefinition,
+    IfStatement,
+    WhileStatement,
+    ForStatement,
+    Assignment,
+    ReturnStatement,
+    InitStatement,
+    Declaration,
+    InvariantLoop,
+)
+
+
+class Code:
+    def __init__(self, name, parameter_slots=(), return_check=None):
+        self.name = name
+        self.instructions = array("i")
+        self.positions = []
+        self.constants = []
+        self.slot_names = []
+        self.parameter_slots = list(parameter_slots)
+        self.return_check = return_check
+
+    def get_slot_count(self):
+        return len(self.slot_names)
+
+    def get_position(self, index):
+        return self.positions[index >> 1]
+
+    def emit(self, opcode, argument=0, position=None):
+        self.instructions.append(opcode)
+        self.instructions.append(argument)
+        self.positions.append(position)
+        return len(self.instructions) - 2
+
+    def add_constant(self, value):
+        self.constants.append(value)
+        return len(self.constants) - 1
+
+    def get_offset(self):
+        return len(self.instructions)
+
+    def patch(self, index, argument):
+        self.instructions[index + 1] = argument
+
+    def disassemble(self):
+        return [
+            (OPCODE_NAMES[self.instructions[index]], self.instructions[index + 1])
+            for index in range(0, len(self.instructions), 2)
+        ]
+
+
+class Compiler:
+    def __init__(self):
+        self.code = None
+        self.namespace = None
+
+    def compile_program(self, program):
+        self.code = Code("<program>")
+        self.namespace = {}
+        mark_tail_calls(program)
+        for declaration in program.program_body:
+            self.compile_statement(declaration)
+        self.code.emit(RETURN_NONE)
+        return self.code
+
+    def compile_function(self, function_definition):
+        outer_code, outer_namespace = self.code, self.namespace
+        return_type = function_definition.return_type
+        if return_type in PYTHON_TYPES:
+            return_check = (PYTHON_TYPES[return_type], None, return_type)
+        else:
+            return_check = (None, get_container_type(return_type), return_type)
+        self.code = Code(function_definition.identifier.value, return_check=return_check)
+        self.namespace = {}
+        for parameter in function_definition.arguments:
+            self.code.parameter_slots.append(self.get_slot(parameter[1].value))
+
+        self.compile_statement(function_definition.body, tail=True)
+        self.code.emit(RETURN_NONE)
+
+        code = self.code
+        self.code, self.namespace = outer_code, outer_namespace
+        return code
+
+    def get_slot(self, name):
+        if name not in self.namespace:
+            self.namespace[name] = self.allocate_slot(name)
+        return self.namespace[name]
+
+    def allocate_slot(self, name):
+        self.code.slot_names.append(name)
+        return len(self.code.slot_names) - 1
+
+    def compile_statement(self, node, tail=False):
+        # in tail position the value of a trailing expression becomes the function result
+        if tail and isinstance(node, StatementBlock):
+            self.compile_statement_block(node, tail=True)
+            return
+        if tail and isinstance(node, IfStatement):
+            self.compile_if_statement(node, tail=True)
+            return
+        if tail and isinstance(node, ReturnStatement) and node.tail_call:
+            self.compile_tail_call(node)
+            return
+        self.compile(node)
+        if not isinstance(node, STATEMENT_NODES):
+            self.code.emit(RETURN_UNCHECKED if tail else POP_TOP)
+
+    def compile(self, node):
+        node_class = get_node_class(node)
+        if node_class in BINARY_OPERATIONS:
+            self.compile_binary_operation(node, node_class)
+            return
+        method_name = COMPILE_METHODS.get(node_class)
+        if method_name is None:
+            # the tree interpreter has no visit method for these, so they fail when executed
+            self.emit_raise(AttributeError, f"{node_class.__name__} cannot be executed")
+            return
+        getattr(self, method_name)(node)
+
+    def compile_binary_operation(self, operation_node, node_class):
+        # a variable or constant right operand is folded into the instruction instead of being pushed
+        self.compile(operation_node.left)
+        right = operation_node.right
+        right_class = get_node_class(right)
+        operator_index = OPERATOR_INDEXES[node_class]
+        if right_class is Variable:
+            slot = self.get_slot(right.name.value)
+            self.code.emit(BINARY_LOCAL, slot << 3 | operator_index, (right.line, right.column))
+        elif right_class in CONSTANT_NODES:
+            self.code.emit(BINARY_CONSTANT, self.code.add_constant(right.value) << 3 | operator_index)
+        else:
+            self.compile(right)
+            self.code.emit(BINARY_OPERATIONS[node_class][0])
+
+    def emit_raise(self, error_class, message):
+        self.code.emit(RAISE, self.code.add_constant((error_class, message)))
+
+    def compile_statement_block(self, statement_block, tail=False):
+        for statement in statement_block.statements[:-1]:
+            self.compile_statement(statement)
+        if statement_block.statements:
+            self.compile_statement(statement_block.statements[-1], tail)
+
+    def compile_function_definition(self, function_definition):
+        name = function_definition.identifier.value
+        code = self.compile_function(function_definition)
+        self.code.emit(DEFINE_FUNCTION, self.code.add_constant((name, code)))
+
+    def compile_if_statement(self, if_statement, tail=False):
+        self.compile(if_statement.condition)
+        self.code.emit(CHECK_BOOL, position=if_statement.position)
+        jump_to_false = self.code.emit(POP_JUMP_IF_FALSE)
+        self.compile_statement(if_statement.true_statement, tail)
+        jump_to_end = self.code.emit(JUMP)
+        self.code.patch(jump_to_false, self.code.get_offset())
+        self.compile_statement(if_statement.false_statement, tail)
+        self.code.patch(jump_to_end, self.code.get_offset())
+
+    def compile_invariant_loop(self, invariant_loop):
+        # variables already live in frame slots, so the loop is compiled unchanged
+        self.compile(invariant_loop.loop)
+
+    def compile_invariant_expression(self, invariant_expression):
+        self.compile(invariant_expression.expression)
+
+    def compile_inlined_call(self, inlined_call):
+        self.compile(inlined_call.function_call)
+
+    def compile_while_statement(self, while_statement):
+        position = while_statement.position
+        counter = self.allocate_slot(None)
+        self.compile(while_statement.condition)
+        self.code.emit(CHECK_BOOL, position=position)
+        self.code.emit(RESET_COUNTER, counter)
+        loop_start = self.code.get_offset()
+        jump_to_end = self.code.emit(POP_JUMP_IF_FALSE)
+        self.compile_statement(while_statement.body)
+        self.code.emit(LOOP_CHECK, counter, position)
+        self.compile(while_statement.condition)
+        self.code.emit(JUMP, loop_start)
+        self.code.patch(jump_to_end, self.code.get_offset())
+
+    def compile_for_statement(self, for_statement):
+        self.emit_load_collection(for_statement.collection.value)
+        self.code.emit(GET_ITERATOR)
+        self.compile_loop(for_statement.identifier.value, for_statement.body)
+
+    def compile_linq(self, linq):
+        self.code.emit(NEW_LIST)
+        self.emit_load_collection(linq.from_statement[2].value)
+        self.code.emit(GET_ITEMS_ITERATOR)
+
+        outer_namespace = self.namespace
+        self.namespace = {}
+        first_slot = self.code.get_slot_count()
+        self.code.emit(ENTER_SCOPE)
+        loop_start = self.code.emit(FOR_ITER)
+        clear_locals = self.code.emit(CLEAR_LOCALS)
+        self.code.emit(MAKE_UNTYPED)
+        self.code.emit(STORE_LOCAL, self.get_slot(linq.from_statement[1].value))
+        self.compile(linq.where_statement)
+        self.code.emit(POP_JUMP_IF_FALSE, loop_start)
+        self.compile(linq.select_statement)
+        self.code.emit(LIST_APPEND)
+        self.code.emit(JUMP, loop_start)
+        self.code.patch(loop_start, self.code.get_offset())
+        self.code.emit(EXIT_SCOPE)
+        self.code.patch(clear_locals, self.code.add_constant((first_slot, self.code.get_slot_count())))
+        self.namespace = outer_namespace
+
+    def compile_loop(self, identifier, body):
+        # every iteration runs in a fresh scope that only holds the loop variable
+        outer_namespace = self.namespace
+        self.namespace = {}
+        first_slot = self.code.get_slot_count()
+        self.code.emit(ENTER_SCOPE)
+        loop_start = self.code.emit(FOR_ITER)
+        clear_locals = self.code.emit(CLEAR_LOCALS)
+        self.code.emit(STORE_LOCAL, self.get_slot(identifier))
+        self.compile_statement(body)
+        self.code.emit(JUMP, loop_start)
+        self.code.patch(loop_start, self.code.get_offset())
+        self.code.emit(EXIT_SCOPE)
+        self.code.patch(clear_locals, self.code.add_constant((first_slot, self.code.get_slot_count())))
+        self.namespace = outer_namespace
+
+    def emit_load_collection(self, name):
+        # looked up without a position, like Interpreter.get_variable(collection)
+        self.code.emit(LOAD_COLLECTION, self.get_slot(name))
+
+    def compile_assignment(self, assignment):
+        slot = self.get_slot(assignment.identifier.value)
+        self.code.emit(LOAD_ASSIGN_TYPE, slot, assignment.position)
+        self.compile(assignment.expression)
+        self.code.emit(ASSIGN_LOCAL, slot, assignment.position)
+
+    def compile_return_statement(self, return_statement):
+        self.compile(return_statement.expression)
+        self.code.emit(RETURN, self.code.add_constant(self.code.return_check), return_statement.position)
+
+    def compile_tail_call(self, return_statement):
+        function_call = return_statement.expression
+        self.code.emit(LOAD_FUNCTION, self.code.add_constant(function_call.identifier.value), function_call.position)
+        argument_count = self.compile_arguments(function_call.arguments)
+        constant = (argument_count, self.code.return_check, function_call.position)
+        self.code.emit(TAIL_CALL, self.code.add_constant(constant), return_statement.position)
+
+    def compile_init_statement(self, init_statement):
+        self.compile(init_statement.expression)
+        variable_type = get_value_type(init_statement.type)
+        slot = self.get_slot(init_statement.identifier.value)
+        self.code.emit(INIT_LOCAL, self.code.add_constant((variable_type, slot)),
+                       (init_statement.line, init_statement.column))
+
+    def compile_declaration(self, declaration):
+        pass
+
+    def compile_value(self, node):
+        self.code.emit(LOAD_CONSTANT, self.code.add_constant(node.value))
+
+    def compile_empty_expression(self, expression):
+        self.code.emit(LOAD_CONSTANT, self.code.add_constant(None))
+
+    def compile_variable(self, variable):
+        self.code.emit(LOAD_LOCAL, self.get_slot(variable.name.value), (variable.line, variable.column))
+
+    def compile_arguments(self, arguments):
+        for argument in arguments.arguments:
+            self.compile(argument)
+        return len(arguments.arguments)
+
+    def compile_function_call(self, function_call):
+        name = function_call.identifier.value
+        position = function_call.position
+        if name in BUILTIN_FUNCTIONS:
+            argument_count = self.compile_arguments(function_call.arguments)
+            self.code.emit(CALL_BUILTIN, self.code.add_constant((BUILTIN_FUNCTIONS[name], argument_count)))
+            return
+        self.code.emit(LOAD_FUNCTION, self.code.add_constant(name), position)
+        argument_count = self.compile_arguments(function_call.arguments)
+        self.code.emit(CALL, argument_count, position)
+
+    def compile_method_call(self, method_call):
+        self.compile(method_call.expression)
+        argument_count = self.compile_arguments(method_call.arguments)
+        method_name = method_call.method_identifier.value
+        self.code.emit(METHOD_CALL, self.code.add_constant((method_name, argument_count, self.namespace)))
+
+    def compile_and_expression(self, and_expression):
+        self.compile(and_expression.left)
+        self.code.emit(CHECK_BOOL, position=and_expression.position)
+        self.compile(and_expression.right)
+        self.code.emit(AND)
+
+    def compile_or_expression(self, or_expression):
+        self.compile(or_expression.left)
+        self.code.emit(CHECK_BOOL, position=or_expression.position)
+        self.compile(or_expression.right)
+        self.code.emit(OR)
+
+    def compile_division_expression(self, division_expression):
+        self.compile(division_expression.left)
+        self.compile(division_expression.right)
+        self.code.emit(DIVIDE, position=division_expression.position)
+
+    def compile_list(self, list_node):
+        if not list_node.elements:
+            self.emit_raise(IndexError, "list index out of range")
+            return
+        # Interpreter evaluates the first element once more to seed the type check
+        self.compile(list_node.elements[0])
+        for element in list_node.elements:
+            self.compile(element)
+        positions = tuple((element.line, element.column) for element in list_node.elements)
+        self.code.emit(BUILD_LIST, self.code.add_constant(positions))
+
+    def compile_pair(self, pair):
+        self.compile(pair.left)
+        self.compile(pair.right)
+        self.code.emit(BUILD_PAIR)
+
+    def compile_dict(self, dict_node):
+        for pair in dict_node.pairs:
+            self.compile(pair.left)
+            self.compile(pair.right)
+        self.code.emit(BUILD_DICT, len(dict_node.pairs))
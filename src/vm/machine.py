@@ -0,0 +1,277 @@
+from functools import partial
+
+from src.exceptions.interpreter_exception import (
+    DifferentTypesListError,
+    WrongTypeReturnError,
+    FunctionAlreadyDefinedError,
+    FunctionNotDefinedError,
+    ZeroDivisionError,
+    MaximumIterationsExceededError,
+    MaximumRecursionExceededError,
+)
+from src.interpreter.interpreter import BUILTIN_METHODS
+from src.interpreter.closure_interpreter import (
+    MAXIMUM_RECURSION_DEPTH,
+    MAXIMUM_ITERATIONS,
+    check_type,
+    get_global_variable,
+)
+from src.interpreter.tail_calls import MAXIMUM_TAIL_CALLS, add_return_check, run_return_checks
+from src.vm.compiler import Compiler, BINARY_OPERATORS
+from src.vm.opcodes import *
+
+UNSET = object()
+
+
+class VirtualMachine:
+    def __init__(self, program, maximum_recursion_depth=MAXIMUM_RECURSION_DEPTH, maximum_tail_calls=MAXIMUM_TAIL_CALLS):
+        self.global_variables = {}
+        self.functions = {}
+        self.maximum_recursion_depth = maximum_recursion_depth
+        self.maximum_tail_calls = maximum_tail_calls
+        self.program_code = Compiler().compile_program(program)
+
+    def visit_program(self):
+        self.run(self.program_code, [], None, 0)
+        return self.run_main_function()
+
+    def run_main_function(self):
+        return self.run(self.functions['main'], [], (0, 0), 1)
+
+    def load_variable(self, code, slot, position):
+        return get_global_variable(self.global_variables, code.slot_names[slot], position)
+
+    def run(self, code, arguments, position, depth):
+        if depth >= self.maximum_recursion_depth:
+            raise MaximumRecursionExceededError(position)
+        frames = []
+        return_checks = None
+        tail_call_count = 0
+        slots = [UNSET] * code.get_slot_count()
+        for slot, value in zip(code.parameter_slots, arguments):
+            slots[slot] = value
+        stack = []
+        instructions = code.instructions
+        constants = code.constants
+        pc = 0
+
+        while True:
+            opcode = instructions[pc]
+            argument = instructions[pc + 1]
+            pc += 2
+
+            if opcode == LOAD_LOCAL:
+                value = slots[argument]
+                if value is UNSET:
+                    value = self.load_variable(code, argument, code.get_position(pc - 2))
+                stack.append(value)
+            elif opcode == BINARY_CONSTANT:
+                stack[-1] = BINARY_OPERATORS[argument & 7](stack[-1], constants[argument >> 3])
+            elif opcode == BINARY_LOCAL:
+                value = slots[argument >> 3]
+                if value is UNSET:
+                    value = self.load_variable(code, argument >> 3, code.get_position(pc - 2))
+                stack[-1] = BINARY_OPERATORS[argument & 7](stack[-1], value)
+            elif opcode == LOAD_CONSTANT:
+                stack.append(constants[argument])
+            elif opcode == ADD:
+                right = stack.pop()
+                stack[-1] = stack[-1] + right
+            elif opcode == SUBTRACT:
+                right = stack.pop()
+                stack[-1] = stack[-1] - right
+            elif opcode == MULTIPLY:
+                right = stack.pop()
+                stack[-1] = stack[-1] * right
+            elif opcode == LESS_THAN:
+                right = stack.pop()
+                stack[-1] = stack[-1] < right
+            elif opcode == GREATER_THAN:
+                right = stack.pop()
+                stack[-1] = stack[-1] > right
+            elif opcode == POP_JUMP_IF_FALSE:
+                if not stack.pop():
+                    pc = argument
+            elif opcode == JUMP:
+                pc = argument
+            elif opcode == CHECK_BOOL:
+                if type(stack[-1]) is not bool:
+                    check_type(bool, stack[-1], code.get_position(pc - 2))
+            elif opcode == POP_TOP:
+                stack.pop()
+            elif opcode == LOAD_FUNCTION:
+                function = self.functions.get(constants[argument])
+                if function is None:
+                    raise FunctionNotDefinedError(constants[argument], code.get_position(pc - 2))
+                stack.append(function)
+            elif opcode == CALL:
+                call_arguments = stack[len(stack) - argument:]
+                del stack[len(stack) - argument:]
+                function = stack.pop()
+                if depth + 1 >= self.maximum_recursion_depth:
+                    raise MaximumRecursionExceededError(code.get_position(pc - 2))
+                frames.append((code, pc, slots, stack, depth, return_checks, tail_call_count))
+                return_checks = None
+                tail_call_count = 0
+                code = function
+                slots = [UNSET] * code.get_slot_count()
+                for slot, value in zip(code.parameter_slots, call_arguments):
+                    slots[slot] = value
+                stack = []
+                instructions = code.instructions
+                constants = code.constants
+                pc = 0
+                depth += 1
+            elif opcode == RETURN or opcode == RETURN_UNCHECKED or opcode == RETURN_NONE:
+                value = None if opcode == RETURN_NONE else stack.pop()
+                if opcode == RETURN:
+                    check_return(constants[argument], value, code.get_position(pc - 2))
+                if return_checks is not None:
+                    run_return_checks(return_checks, value)
+                if not frames:
+                    return value
+                code, pc, slots, stack, depth, return_checks, tail_call_count = frames.pop()
+                instructions = code.instructions
+                constants = code.constants
+                stack.append(value)
+            elif opcode == TAIL_CALL:
+                # the callee replaces the current frame, which leaves its return check to be run on the final value
+                argument_count, return_check, call_position = constants[argument]
+                if tail_call_count >= self.maximum_tail_calls:
+                    raise MaximumRecursionExceededError(call_position)
+                tail_call_count += 1
+                call_arguments = stack[len(stack) - argument_count:]
+                function = stack[len(stack) - argument_count - 1]
+                if return_checks is None:
+                    return_checks = {}
+                add_return_check(return_checks, return_check[2],
+                                 partial(check_return, return_check, position=code.get_position(pc - 2)))
+                code = function
+                slots = [UNSET] * code.get_slot_count()
+                for slot, value in zip(code.parameter_slots, call_arguments):
+                    slots[slot] = value
+                stack = []
+                instructions = code.instructions
+                constants = code.constants
+                pc = 0
+            elif opcode == DIVIDE:
+                right = stack.pop()
+                if right == 0:
+                    raise ZeroDivisionError(code.get_position(pc - 2))
+                stack[-1] = stack[-1] / right
+            elif opcode == LESS_THAN_OR_EQUAL:
+                right = stack.pop()
+                stack[-1] = stack[-1] <= right
+            elif opcode == INIT_LOCAL:
+                variable_type, slot = constants[argument]
+                value = stack.pop()
+                if type(value) is not variable_type:
+                    check_type(variable_type, value, code.get_position(pc - 2))
+                slots[slot] = (variable_type, value)
+            elif opcode == STORE_LOCAL:
+                slots[argument] = stack.pop()
+            elif opcode == LOAD_ASSIGN_TYPE:
+                variable = slots[argument]
+                if variable is UNSET:
+                    variable = self.load_variable(code, argument, code.get_position(pc - 2))
+                variable_type, _ = variable
+                stack.append(variable_type)
+            elif opcode == ASSIGN_LOCAL:
+                value = stack.pop()
+                check_type(stack.pop(), value[1], code.get_position(pc - 2))
+                slots[argument] = value
+            elif opcode == LOOP_CHECK:
+                if slots[argument] == MAXIMUM_ITERATIONS:
+                    raise MaximumIterationsExceededError(code.get_position(pc - 2))
+                slots[argument] += 1
+            elif opcode == RESET_COUNTER:
+                slots[argument] = 0
+            elif opcode == FOR_ITER:
+                value = next(stack[-1], UNSET)
+                if value is UNSET:
+                    stack.pop()
+                    pc = argument
+                else:
+                    stack.append(value)
+            elif opcode == CLEAR_LOCALS:
+                first_slot, end_slot = constants[argument]
+                slots[first_slot:end_slot] = [UNSET] * (end_slot - first_slot)
+            elif opcode == ENTER_SCOPE:
+                depth += 1
+            elif opcode == EXIT_SCOPE:
+                depth -= 1
+            elif opcode == LOAD_COLLECTION:
+                value = slots[argument]
+                if value is UNSET:
+                    value = self.load_variable(code, argument, None)
+                stack.append(value)
+            elif opcode == GET_ITERATOR:
+                stack[-1] = iter(stack[-1][1])
+            elif opcode == GET_ITEMS_ITERATOR:
+                stack[-1] = iter(list(stack[-1][1].items()))
+            elif opcode == CALL_BUILTIN:
+                function, argument_count = constants[argument]
+                call_arguments = stack[len(stack) - argument_count:]
+                del stack[len(stack) - argument_count:]
+                stack.append(function(call_arguments))
+            elif opcode == METHOD_CALL:
+                method_name, argument_count, namespace = constants[argument]
+                method_arguments = stack[len(stack) - argument_count:]
+                del stack[len(stack) - argument_count:]
+                value = stack.pop()
+                method = BUILTIN_METHODS[method_name]
+                variable = slots[namespace[value]] if value in namespace else UNSET
+                if variable is UNSET:
+                    variable = get_global_variable(self.global_variables, value, None)
+                if variable is not None:
+                    value = variable
+                stack.append(method(value, method_arguments))
+            elif opcode == AND:
+                right = stack.pop()
+                stack[-1] = stack[-1] and right
+            elif opcode == OR:
+                right = stack.pop()
+                stack[-1] = stack[-1] or right
+            elif opcode == BUILD_LIST:
+                positions = constants[argument]
+                elements = stack[len(stack) - len(positions):]
+                del stack[len(stack) - len(positions):]
+                previous_element = stack.pop()
+                for element, element_position in zip(elements, positions):
+                    if type(element) != type(previous_element):
+                        raise DifferentTypesListError(element_position)
+                    previous_element = element
+                stack.append(elements)
+            elif opcode == BUILD_PAIR:
+                right = stack.pop()
+                stack[-1] = (stack[-1], right)
+            elif opcode == BUILD_DICT:
+                values = stack[len(stack) - 2 * argument:]
+                del stack[len(stack) - 2 * argument:]
+                stack.append(dict(zip(values[::2], values[1::2])))
+            elif opcode == NEW_LIST:
+                stack.append([])
+            elif opcode == LIST_APPEND:
+                value = stack.pop()
+                stack[-2].append(value)
+            elif opcode == MAKE_UNTYPED:
+                stack[-1] = (None, stack[-1])
+            elif opcode == DEFINE_FUNCTION:
+                name, function = constants[argument]
+                if name in self.functions:
+                    raise FunctionAlreadyDefinedError(name)
+                self.functions[name] = function
+            elif opcode == RAISE:
+                error_class, message = constants[argument]
+                raise error_class(message)
+            else:
+                raise ValueError(f"Unknown opcode {opcode}")
+
+
+def check_return(return_check, value, position):
+    python_type, container_type, return_type = return_check
+    if python_type is not None:
+        if type(value) is not python_type:
+            raise WrongTypeReturnError(return_type, type(value), position)
+    elif container_type != value[0]:
+        raise WrongTypeReturnError(container_type[1].__name__, type(value[1][0]).__name__, position)
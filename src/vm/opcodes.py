@@ -0,0 +1,55 @@
+LOAD_CONSTANT = 1
+LOAD_LOCAL = 2
+STORE_LOCAL = 3
+INIT_LOCAL = 4
+LOAD_ASSIGN_TYPE = 5
+ASSIGN_LOCAL = 6
+CLEAR_LOCALS = 7
+POP_TOP = 8
+
+ADD = 10
+SUBTRACT = 11
+MULTIPLY = 12
+DIVIDE = 13
+LESS_THAN = 14
+GREATER_THAN = 15
+LESS_THAN_OR_EQUAL = 16
+AND = 17
+OR = 18
+CHECK_BOOL = 19
+# argument is (operand << 3) | operation, the operand being a slot or a constant index
+BINARY_LOCAL = 20
+BINARY_CONSTANT = 21
+
+JUMP = 30
+POP_JUMP_IF_FALSE = 31
+LOOP_CHECK = 32
+RESET_COUNTER = 33
+ENTER_SCOPE = 34
+EXIT_SCOPE = 35
+LOAD_COLLECTION = 36
+GET_ITERATOR = 37
+GET_ITEMS_ITERATOR = 38
+FOR_ITER = 39
+
+LOAD_FUNCTION = 40
+CALL = 41
+CALL_BUILTIN = 42
+METHOD_CALL = 43
+RETURN = 44
+RETURN_NONE = 45
+RETURN_UNCHECKED = 46
+DEFINE_FUNCTION = 47
+# argument is a constant holding the argument count, the return check of the returning function and the call position
+TAIL_CALL = 48
+
+BUILD_LIST = 50
+BUILD_PAIR = 51
+BUILD_DICT = 52
+NEW_LIST = 53
+LIST_APPEND = 54
+MAKE_UNTYPED = 55
+
+RAISE = 60
+
+OPCODE_NAMES = {value: name for name, value in dict(globals()).items() if name.isupper() and type(value) is int}
@@ -0,0 +1,62 @@
+import io
+import os
+
+from src import ast_cache
+from src.reader import Reader
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+
+PROGRAM = "function int main(){ int a = 10; return a + 2; }"
+
+
+def parse(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader)).parse()
+
+
+def create_script(tmp_path, string=PROGRAM):
+    script_path = tmp_path / "program.ks"
+    script_path.write_text(string)
+    return str(script_path)
+
+
+def test_store_and_load(tmp_path):
+    script_path = create_script(tmp_path)
+    key = ast_cache.get_cache_key(PROGRAM.encode())
+    assert ast_cache.load_program(script_path, key) is None
+    assert ast_cache.store_program(script_path, key, parse(PROGRAM))
+    assert ast_cache.load_program(script_path, key) == parse(PROGRAM)
+    assert os.listdir(tmp_path / ast_cache.CACHE_DIRECTORY) == [f"program.ks.{key[:32]}{ast_cache.CACHE_EXTENSION}"]
+
+
+def test_changed_source_is_a_miss(tmp_path):
+    script_path = create_script(tmp_path)
+    key = ast_cache.get_cache_key(PROGRAM.encode())
+    ast_cache.store_program(script_path, key, parse(PROGRAM))
+    changed_key = ast_cache.get_cache_key(PROGRAM.replace("10", "11").encode())
+    assert changed_key != key
+    assert ast_cache.load_program(script_path, changed_key) is None
+
+
+def test_stale_entries_are_removed(tmp_path):
+    script_path = create_script(tmp_path)
+    changed_program = PROGRAM.replace("10", "11")
+    ast_cache.store_program(script_path, ast_cache.get_cache_key(PROGRAM.encode()), parse(PROGRAM))
+    changed_key = ast_cache.get_cache_key(changed_program.encode())
+    ast_cache.store_program(script_path, changed_key, parse(changed_program))
+    assert os.listdir(tmp_path / ast_cache.CACHE_DIRECTORY) == [f"program.ks.{changed_key[:32]}{ast_cache.CACHE_EXTENSION}"]
+
+
+def test_damaged_entry_is_a_miss(tmp_path):
+    script_path = create_script(tmp_path)
+    key = ast_cache.get_cache_key(PROGRAM.encode())
+    ast_cache.store_program(script_path, key, parse(PROGRAM))
+    with open(ast_cache.get_cache_path(script_path, key), "wb") as file_handle:
+        file_handle.write(b"damaged")
+    assert ast_cache.load_program(script_path, key) is None
+
+
+def test_interpreter_version_is_part_of_key(monkeypatch):
+    key = ast_cache.get_cache_key(PROGRAM.encode())
+    monkeypatch.setattr(ast_cache, "interpreter_version", "other")
+    assert ast_cache.get_cache_key(PROGRAM.encode()) != key
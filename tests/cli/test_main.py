@@ -0,0 +1,18 @@
+import pytest
+
+from main import parse_arguments
+
+
+@pytest.mark.parametrize("arguments", [
+    ["--memoize", "--memoize-size", "0"],
+    ["--memoize", "--memoize-size", "-1"],
+    ["--recursion-limit", "0"],
+    ["--tail-call-limit", "0"],
+])
+def test_limits_below_one_are_rejected(arguments):
+    with pytest.raises(SystemExit):
+        parse_arguments(arguments)
+
+
+def test_memoize_size_is_parsed():
+    assert parse_arguments(["--memoize", "--memoize-size", "1"]).memoize_size == 1
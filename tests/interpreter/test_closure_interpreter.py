@@ -0,0 +1,134 @@
+import io
+import pytest
+
+from src.ast.arena import AstArena
+from src.interpreter.interpreter import Interpreter
+from src.interpreter.closure_interpreter import ClosureInterpreter
+from src.interpreter.tail_calls import run_with_recursion_limit
+from src.exceptions.interpreter_exception import *
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.reader import Reader
+
+
+def parse(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader)).parse()
+
+
+def get_outcome(interpreter_class, program):
+    try:
+        return interpreter_class(program).visit_program()
+    except Exception as e:
+        return type(e), getattr(e, "position", None)
+
+
+@pytest.mark.parametrize("string", [
+    'function int main(){return 3+1;}',
+    'function int a(int b){return b + 4 * 5;} function int main(){return a(2) + 10;}',
+    'function int main(){ if(true) { return 10; } else { return 7; };}',
+    'function int main(){ if(false) { return 10; } else { return 7; };}',
+    'function int main(){ if(1) { return 10; } else { return 7; };}',
+    'function int main(){ if(true) { } else { return 7; };}',
+    'function float main(){return 7 / 2;}',
+    'function float main(){return 7 / (3 - 3);}',
+    'function int main(){return 2 - 3 * 4;}',
+    'function bool main(){return 2 < 3;}',
+    'function bool main(){return 2 > 3;}',
+    'function string main(){return "a" + "b";}',
+    'function bool main(){return 4;}',
+    'function int main(){return a;}',
+    'function int main(){return a();}',
+    'function int main(){return 3+1;} function int main(){return 3+1;}',
+    'function bool main(){float a = 10; return 4;}',
+    'function int main(){int a = 10; return a;}',
+    'function int main(){int a = 10; int b = 4; a = b; return 1;}',
+    'function int main(){int a = 10; a = 4; return 1;}',
+    'function int main(){return [1, 2, "a"];}',
+    'function List<int> main(){return [1, 2, 3];}',
+    'function List<int> main(){List<int> a = [1, 2, 3]; return a;}',
+    'function List<int> main(){List<string> a = ["a"]; return a;}',
+    'function Pair<int, string> main(){Pair<int, string> a = (1, "a"); return a;}',
+    'function Dict<int, int> main(){Dict<int, int> a = {1: 2, 3: 4}; return a;}',
+    'function Dict<int, int> main(){Dict<int, int> a = {1: 2, 3: "4"}; return a;}',
+    'function int main(){int i = 0; while(true) { i = i; }; return 0;}',
+    'function int main(){while(false) { return 1; }; return 0;}',
+    'function int main(){while(1) { return 1; }; return 0;}',
+    'function int f(int n){return 1 + f(n);} function int main(){return f(1);}',
+    'function int f(int n, int a){if (n < 1) { return a; } else { return f(n - 1, a + n); };} function int main(){return f(1000, 0);}',
+    'function bool e(int n){if (n < 1) { return true; } else { return o(n - 1); };} function bool o(int n){if (n < 1) { return false; } else { return e(n - 1); };} function bool main(){return e(501);}',
+    'function string g(int n){return "a";} function int f(int n){return g(n);} function int main(){return f(1);}',
+    'function List<string> g(){return ["a"];} function List<int> f(){return g();} function List<int> main(){return f();}',
+    'function int f(int n){if (n > 0) { return f(n - 1) + n; } else { return 0; };} function int main(){return f(5);}',
+    'function int main(){List<int> a = [1, 2, 3]; for (int b in a) { print(b * 2); }; return 1;}',
+    'function int main(){List<int> a = [1, 2, 3]; for (int b in c) { print(b); }; return 1;}',
+    'function int main(){List<int> a = [1, 2, 3]; return a.length();}',
+    'function int main(){return print(1, "a");}',
+    'function int main(){return get_int(2);}',
+    'function int main(){print(1);}',
+])
+def test_same_outcome(string, capsys):
+    program = parse(string)
+    expected = get_outcome(Interpreter, program)
+    expected_output = capsys.readouterr().out
+    assert get_outcome(ClosureInterpreter, program) == expected
+    assert capsys.readouterr().out == expected_output
+
+
+def test_return_ends_function():
+    string = 'function int main(){ if(true) { return 10; } else { return 7; }; return 3;}'
+    assert ClosureInterpreter(parse(string)).visit_program() == 10
+
+
+def test_return_inside_while():
+    string = 'function int main(){ while(true) { return 10; }; return 3;}'
+    assert ClosureInterpreter(parse(string)).visit_program() == 10
+
+
+def test_calls_do_not_leak_depth():
+    string = """
+    function int one(){return 1;}
+    function int main(){int i = 0; while(true) { print(one()); }; return 0;}
+    """
+    with pytest.raises(MaximumIterationsExceededError):
+        ClosureInterpreter(parse(string)).visit_program()
+
+
+def test_maximum_recursion():
+    string = 'function int f(int n){return 1 + f(n - 1);} function int main(){return f(1);}'
+    with pytest.raises(MaximumRecursionExceededError):
+        ClosureInterpreter(parse(string)).visit_program()
+
+
+def test_recursion_limit_is_configurable():
+    string = 'function int f(int n){if (n < 1) { return 0; } else { return 1 + f(n - 1); };} function int main(){return f(20);}'
+    assert ClosureInterpreter(parse(string), maximum_recursion_depth=30).visit_program() == 20
+
+
+def test_recursion_limit_below_one_allows_no_calls():
+    with pytest.raises(MaximumRecursionExceededError):
+        ClosureInterpreter(parse('function int main(){return 1;}'), maximum_recursion_depth=0).visit_program()
+
+
+def test_endless_tail_recursion_is_stopped():
+    with pytest.raises(MaximumRecursionExceededError):
+        ClosureInterpreter(parse('function int f(int n){return f(n);} function int main(){return f(1);}'), maximum_tail_calls=100).visit_program()
+
+
+def test_recursion_limit_beyond_the_python_stack():
+    string = 'function int f(int n){if (n < 1) { return 0; } else { return 1 + f(n - 1); };} function int main(){return f(3000);}'
+    with pytest.raises(MaximumRecursionExceededError):
+        ClosureInterpreter(parse(string), maximum_recursion_depth=10 ** 6).visit_program()
+    interpreter = ClosureInterpreter(parse(string), maximum_recursion_depth=10 ** 4)
+    assert run_with_recursion_limit(interpreter.visit_program, 10 ** 4) == 3000
+
+
+def test_arena_program():
+    string = 'function int a(int b){return b + 4 * 5;} function int main(){return a(2) + 10;}'
+    program = AstArena.from_tree(parse(string)).get_root()
+    assert ClosureInterpreter(program).visit_program() == 32
+
+
+def test_missing_main():
+    with pytest.raises(KeyError):
+        ClosureInterpreter(parse('function int a(){return 1;}')).visit_program()
@@ -1,6 +1,7 @@
 import io
 
 from src.interpreter.interpreter import Interpreter
+from src.interpreter.tail_calls import run_with_recursion_limit
 from src.parser.parser import Parser
 from src.reader import Reader
 from src.lexer.lexer import Lexer, get_tokens
@@ -221,4 +222,31 @@ def test_get_string():
     function string main(){ return get_string(2012); }
     """
     result = get_return_value_from_main(string)
-    assert result == "2012"
\ No newline at end of file
+    assert result == "2012"
+
+
+def test_tail_calls_do_not_grow_the_stack():
+    string = """
+    function int f(int n, int a){if (n < 1) { return a; } else { return f(n - 1, a + n); };}
+    function int main(){ return f(5000, 0); }
+    """
+    result = get_return_value_from_main(string)
+    assert result == 12502500
+
+
+def test_recursion_limit_is_configurable():
+    string = """
+    function int f(int n){if (n < 1) { return 0; } else { return 1 + f(n - 1); };}
+    function int main(){ return f(20); }
+    """
+    interpreter = Interpreter(create_parser(string).parse(), maximum_recursion_depth=30)
+    assert interpreter.visit_program() == 20
+
+
+def test_recursion_limit_beyond_the_python_stack():
+    string = """
+    function int f(int n){if (n < 1) { return 0; } else { return 1 + f(n - 1); };}
+    function int main(){ return f(3000); }
+    """
+    interpreter = Interpreter(create_parser(string).parse(), maximum_recursion_depth=10 ** 4)
+    assert run_with_recursion_limit(interpreter.visit_program, 10 ** 4) == 3000
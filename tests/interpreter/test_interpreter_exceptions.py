@@ -53,4 +53,23 @@ def test_different_types():
         string = 'function bool main(){float a = 10; return 4;}'
         result = interpret(string)
         assert result == 4
-                                                               
\ No newline at end of file
+                                                               
+
+
+def test_python_stack_overflow_is_a_recursion_error():
+    string = """
+    function int f(int n){if (n < 1) { return 0; } else { return 1 + f(n - 1); };}
+    function int main(){ return f(3000); }
+    """
+    with pytest.raises(MaximumRecursionExceededError):
+        Interpreter(create_parser(string).parse(), maximum_recursion_depth=10 ** 6).visit_program()
+
+
+def test_recursion_limit_below_one_allows_no_calls():
+    with pytest.raises(MaximumRecursionExceededError):
+        Interpreter(create_parser('function int main(){return 1;}').parse(), maximum_recursion_depth=0).visit_program()
+
+
+def test_endless_tail_recursion_is_stopped():
+    with pytest.raises(MaximumRecursionExceededError):
+        Interpreter(create_parser('function int f(int n){return f(n);} function int main(){return f(1);}').parse(), maximum_tail_calls=100).visit_program()
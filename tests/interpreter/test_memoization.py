@@ -0,0 +1,117 @@
+import io
+import contextlib
+import pytest
+
+from src.ast.nodes import IntType
+from src.interpreter.interpreter import Interpreter
+from src.interpreter.memoization import LRUCache, find_memoizable_functions, get_memoization_key
+from src.exceptions.interpreter_exception import *
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.reader import Reader
+
+FIBONACCI = (
+    'function int fib(int n){if (n < 2) { return n; } else { return fib(n - 1) + fib(n - 2); };} '
+    'function int main(){return fib(8);}'
+)
+
+
+def parse(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader)).parse()
+
+
+def run(program, memoization_cache=None):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            result = Interpreter(program, memoization_cache).visit_program()
+        except Exception as error:
+            result = (type(error), getattr(error, "position", None))
+    return result, output.getvalue()
+
+
+def test_lru_cache_drops_least_recently_used():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+@pytest.mark.parametrize("left, right", [
+    ([1], [1.0]),
+    ([1], [True]),
+    ([[1, 2]], [(1, 2)]),
+    ([{1: 2, 3: 4}], [{3: 4, 1: 2}]),
+])
+def test_keys_keep_types_and_order(left, right):
+    assert get_memoization_key(left) != get_memoization_key(right)
+
+
+def test_containers_are_keyed_by_structure():
+    assert get_memoization_key([[1, 2], {"a": (IntType, 1)}]) == get_memoization_key([[1, 2], {"a": (IntType, 1)}])
+
+
+def test_unhashable_arguments_have_no_key():
+    assert get_memoization_key([object()]) is None
+
+
+@pytest.mark.parametrize("string, expected", [
+    (FIBONACCI, {'fib', 'main'}),
+    ('function int f(int n){print(n); return n;}', set()),
+    ('function int f(List<int> l){l.append(1); return 1;}', set()),
+    ('function int f(int n){print(n); return n;} function int g(int n){return f(n);}', set()),
+    ('function int f(int n){if (n < 1) { return 1; } else { };}', set()),
+    ('function List<int> f(int n){return [n];}', set()),
+    ('function int f(List<int> l){return l.length();}', {'f'}),
+])
+def test_memoizable_functions(string, expected):
+    assert find_memoizable_functions(parse(string)) == expected
+
+
+def test_fibonacci_reuses_results():
+    cache = LRUCache()
+    assert run(parse(FIBONACCI), cache) == run(parse(FIBONACCI))
+    assert (cache.hits, cache.misses) == (6, 10)
+
+
+def test_small_cache_evicts_results():
+    cache = LRUCache(2)
+    assert run(parse(FIBONACCI), cache) == run(parse(FIBONACCI))
+    assert cache.misses > 10
+
+
+@pytest.mark.parametrize("string", [
+    FIBONACCI.replace('fib(8)', 'fib(9)'),
+    'function int f(int n){if (n < 1) { return 0; } else { return 0 + f(n - 1); };} '
+    'function int g(int d, int n){if (d < 1) { return f(n); } else { return 0 + g(d - 1, n); };} '
+    'function int main(){return f(5) + g(6, 5);}',
+    'function int f(int n){return n + 0.5;} function int main(){return f(1) + f(1);}',
+    'function int f(List<int> l){return l.length();} function int main(){List<int> l = [1]; return f(l) + f(l);}',
+    'function int f(int n){print(n); return n;} function int main(){return f(1) + f(1);}',
+])
+def test_memoized_program_behaves_the_same(string):
+    assert run(parse(string), LRUCache()) == run(parse(string))
+
+
+def test_result_is_not_reused_where_the_call_would_exceed_the_recursion_limit():
+    string = (
+        'function int f(int n){if (n < 1) { return 0; } else { return 0 + f(n - 1); };} '
+        'function int g(int d, int n){if (d < 1) { return f(n); } else { return 0 + g(d - 1, n); };} '
+        'function int main(){return f(5) + g(6, 5);}'
+    )
+    assert run(parse(string), LRUCache())[0] == (MaximumRecursionExceededError, (1, 66))
+
+
+def test_tail_calls_are_memoized():
+    string = (
+        'function int f(int n){if (n < 1) { return 0; } else { return f(n - 1); };} '
+        'function int main(){return f(30) + f(30);}'
+    )
+    cache = LRUCache()
+    assert run(parse(string), cache) == run(parse(string)) == (0, "")
+    assert cache.hits == 1
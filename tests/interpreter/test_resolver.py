@@ -0,0 +1,50 @@
+import io
+
+from src.ast.arena import AstArena
+from src.interpreter.interpreter import Interpreter
+from src.interpreter.resolver import Resolver
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.reader import Reader
+
+
+def parse(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader)).parse()
+
+
+def test_parameters_take_first_slots():
+    program = Resolver().resolve_program(parse('function int f(int a, int b){int c = b; a = c; return a;}'))
+    function_definition = program.program_body[0]
+    layout = function_definition.frame_layout
+    assert layout.slot_names == {"a": 0, "b": 1, "c": 2}
+    assert layout.parameter_slots == [0, 1]
+    init_statement, assignment, return_statement = function_definition.body.statements
+    assert init_statement.slot == 2
+    assert init_statement.expression.slot == 1
+    assert assignment.slot == 0
+    assert return_statement.expression.frame_layout is layout
+
+
+def test_for_body_has_own_frame():
+    program = Resolver().resolve_program(parse(
+        'function int main(){List<int> a = [1]; for (int b in a) { print(b); }; return 1;}'
+    ))
+    function_definition = program.program_body[0]
+    for_statement = function_definition.body.statements[1]
+    assert for_statement.frame_layout.slot_names == {"b": 0}
+    assert function_definition.frame_layout.slot_names == {"a": 0}
+
+
+def test_resolution_is_not_part_of_structure():
+    string = 'function int f(int a){return a;}'
+    resolved = Resolver().resolve_program(parse(string))
+    assert resolved == parse(string)
+    assert hash(resolved) == hash(parse(string))
+
+
+def test_arena_program_is_resolved():
+    string = 'function int a(int b){return b + 4 * 5;} function int main(){return a(2) + 10;}'
+    program = AstArena.from_tree(parse(string)).get_root()
+    assert Interpreter(program).visit_program() == 32
+    assert program.program_body[0].body.statements[0].expression.left.slot == 0
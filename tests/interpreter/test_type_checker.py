@@ -0,0 +1,63 @@
+import io
+import pytest
+
+from src.interpreter.interpreter import Interpreter
+from src.interpreter.type_checker import TypeChecker
+from src.exceptions.interpreter_exception import *
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.reader import Reader
+
+
+def parse(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader)).parse()
+
+
+def get_errors(string):
+    return [(type(error), error.position) for error in TypeChecker().check_program(parse(string))]
+
+
+@pytest.mark.parametrize("string, errors", [
+    ('function int main(){int a = 1 + 2 * 3; return 1;}', []),
+    ('function int main(){int a = "a"; return 1;}', [(WrongTypeError, (1, 21))]),
+    ('function int main(){float a = 1 / 2; return 1;}', []),
+    ('function int main(){if (1) { return 1; } else { return 2; };}', [(WrongTypeError, (1, 21))]),
+    ('function int main(){while (1 < 2) { print(1); }; return 1;}', []),
+    ('function int main(){return "a";}', [(WrongTypeReturnError, (1, 21))]),
+    ('function int main(){List<int> a = [1, "a"]; return 1;}', [(DifferentTypesListError, (1, 39))]),
+    ('function int main(){Dict<int, int> a = {1: 2, 3: "4"}; return 1;}', [(WrongTypeError, (1, 21))]),
+    ('function int main(){List<string> a = "abc"; return 1;}', []),
+    ('function int main(){Dict<int, int> a = {1: "x", 1: 2}; return 1;}', []),
+])
+def test_errors(string, errors):
+    assert get_errors(string) == errors
+
+
+def test_proven_statements_are_annotated():
+    program = parse('function int main(){Dict<int, int> a = {1: 2, 3: 4}; if (1 < 2) { return 1; } else { return 2; };}')
+    TypeChecker().check_program(program)
+    init_statement, if_statement = program.program_body[0].body.statements
+    assert init_statement.type_proven
+    assert if_statement.type_proven
+    assert if_statement.true_statement.statements[0].type_proven
+
+
+def test_return_after_return_is_not_proven():
+    # the interpreter continues after a return in the caller's scope, so the caller's return type applies
+    program = parse('function int main(){if (true) { return 1; } else { return 2; }; return "a";}')
+    assert TypeChecker().check_program(program) == []
+    assert not program.program_body[0].body.statements[1].type_proven
+
+
+def test_return_in_function_calling_one_without_return_is_not_proven():
+    program = parse('function int g(){print(1);} function int main(){g(); return 1;}')
+    TypeChecker().check_program(program)
+    assert not program.program_body[1].body.statements[1].type_proven
+
+
+def test_proven_checks_are_skipped(monkeypatch):
+    program = parse('function int main(){Dict<int, int> a = {1: 2, 3: 4}; while (1 > 2) { print(1); }; return 1;}')
+    interpreter = Interpreter(program)
+    monkeypatch.setattr(interpreter, "check_type", None)
+    assert interpreter.visit_program() == 1
@@ -0,0 +1,74 @@
+import io
+import os
+import random
+import pytest
+
+from src.lexer.regex_lexer import RegexLexer
+from src.lexer.incremental_lexer import relex, apply_edit
+from src.token.token_buffer import tokenize
+
+PROGRAM_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "program.ks")
+
+
+def get_all_tokens(buffer):
+    return [
+        (buffer.get_type(i), buffer.get_value(i), buffer.get_start(i), buffer.get_end(i), buffer.get_position(i))
+        for i in range(len(buffer))
+    ]
+
+
+def get_full_outcome(text):
+    try:
+        return get_all_tokens(tokenize(RegexLexer(io.StringIO(text))))
+    except Exception as e:
+        return type(e)
+
+
+def get_incremental_outcome(buffer, text, offset, deleted_length, inserted_text):
+    try:
+        return get_all_tokens(relex(buffer, text, offset, deleted_length, inserted_text)[1])
+    except Exception as e:
+        return type(e)
+
+
+@pytest.mark.parametrize("text, offset, deleted_length, inserted_text", [
+    ("int a = 10;", 5, 0, "b"),
+    ("int a = 10;", 0, 4, ""),
+    ("int a = 10;", 11, 0, " a"),
+    ("a < b", 3, 0, "="),
+    ("a <= b", 3, 1, ""),
+    ("a 1 b", 3, 0, ".5"),
+    ('a "x" b', 2, 0, '"'),
+    ("a # b\nc", 2, 1, ""),
+    ("a\nb", 2, 0, "#"),
+    ("", 0, 0, "int a;"),
+])
+def test_relex_edit(text, offset, deleted_length, inserted_text):
+    buffer = tokenize(RegexLexer(io.StringIO(text)))
+    expected = get_full_outcome(apply_edit(text, offset, deleted_length, inserted_text))
+    assert get_incremental_outcome(buffer, text, offset, deleted_length, inserted_text) == expected
+
+
+def test_relex_random_edits():
+    with open(PROGRAM_PATH, "r") as file_handle:
+        text = file_handle.read()
+    buffer = tokenize(RegexLexer(io.StringIO(text)))
+    pieces = ["a", "1", ".", " ", "\n", "#", '"', "<", "=", "!", "(", ")", "{", "}", ";",
+              "int", "while", "return x;", "\t", "ą", "2.5"]
+    generator = random.Random(2024)
+    for _ in range(300):
+        offset = generator.randint(0, len(text))
+        deleted_length = generator.randint(0, min(6, len(text) - offset))
+        inserted_text = "".join(generator.choice(pieces) for _ in range(generator.randint(0, 6)))
+        expected = get_full_outcome(apply_edit(text, offset, deleted_length, inserted_text))
+        assert get_incremental_outcome(buffer, text, offset, deleted_length, inserted_text) == expected
+        if not isinstance(expected, type):
+            text, buffer = relex(buffer, text, offset, deleted_length, inserted_text)
+
+
+def test_relex_drops_values_no_token_uses():
+    text = "int a = 1;"
+    buffer = tokenize(RegexLexer(io.StringIO(text)))
+    for number in range(2, 50):
+        text, buffer = relex(buffer, text, 8, len(str(number - 1)), str(number))
+    assert sorted(map(str, buffer.values)) == sorted(map(str, tokenize(RegexLexer(io.StringIO(text))).values))
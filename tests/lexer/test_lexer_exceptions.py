@@ -43,6 +43,33 @@ def test_too_big_float():
         tokens = get_all_tokens("10000000.1")
 
 
+def test_too_long_number():
+    with pytest.raises(NumberException) as e:
+        tokens = get_all_tokens("1" * 1_001)
+
+
+def test_too_long_float_part():
+    with pytest.raises(NumberException) as e:
+        tokens = get_all_tokens("1." + "5" * 1_001)
+
+
+def test_longest_string():
+    tokens = get_all_tokens('"' + "a" * 10_000 + '"')
+    assert len(tokens[0].value) == 10_000
+
+
+def test_long_string_small_buffer():
+    reader = Reader(io.StringIO('"' + "a" * 9_999 + '" b'), 64)
+    tokens = get_tokens(Lexer(reader))
+    assert len(tokens[0].value) == 9_999
+    assert tokens[1].position == (1, 10_003)
+
+
+def test_too_long_string_small_buffer():
+    with pytest.raises(StringTooLongException) as e:
+        get_tokens(Lexer(Reader(io.StringIO('"' + "a" * 10_001 + '"'), 64)))
+
+
 def test_unclosed_string_EOF():
     with pytest.raises(UnclosedStringException) as e:
         tokens = get_all_tokens('"Hello World')
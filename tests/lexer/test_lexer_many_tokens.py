@@ -108,3 +108,16 @@ def test_declaration_with_assignment():
                                                 TokenType.ASSIGN, TokenType.INT_VALUE, TokenType.SEMICOLON, TokenType.EOF]
     assert [token.value for token in tokens] == ['int', 'a', '', 10, '', '']
     assert [token.position for token in tokens] == [(1, 1), (1, 5), (1, 7), (1, 9), (1, 11), (2, 0)]
+
+
+def test_identifiers_are_interned():
+    tokens = get_all_tokens("lista int lista int")
+    assert tokens[0].value is tokens[2].value
+    assert tokens[1].value is tokens[3].value
+
+
+def test_token_position():
+    token = get_all_tokens("\n  lista")[0]
+    assert token.position == token.get_position() == (2, 3)
+    assert (token.get_line(), token.get_column()) == (2, 3)
+    assert not hasattr(token, "__dict__")
@@ -0,0 +1,95 @@
+import io
+import os
+import random
+import pytest
+
+from src.exceptions.lexer_exception import (
+    StringTooLongException,
+    UnclosedStringException,
+    IdentifierTooLongException,
+    NumberException
+)
+from src.reader import Reader
+from src.lexer.lexer import Lexer, get_tokens
+from src.lexer.regex_lexer import RegexLexer
+from src.token.token_types import TokenType
+
+
+def get_all_tokens(lexer):
+    return [(token.type, token.value, token.position) for token in get_tokens(lexer)]
+
+
+def assert_same_tokens(string):
+    expected = get_all_tokens(Lexer(Reader(io.StringIO(string))))
+    assert get_all_tokens(RegexLexer(io.StringIO(string))) == expected
+
+
+@pytest.mark.parametrize("string", [
+    "",
+    " ",
+    "jakis_id jakis_id2 jakis_id3",
+    "10 20 30",
+    "1 \n2\n3",
+    "Pair<int, string>\n",
+    "Dict<int, string>\n",
+    "10 + 20 = 30",
+    "-3.14",
+    "int a = 10;",
+    "a <= b >= c == d != e < f > g ! h",
+    "a || b && c",
+    "true false EOF",
+    '"Hello World" "" "Łódź"',
+    "a # komentarz\nb",
+    "a\n#b\n##c",
+    '"#komentarz\n"',
+    "\t(){}[],.;:+-*/",
+])
+def test_same_tokens(string):
+    assert_same_tokens(string)
+
+
+def test_same_tokens_program():
+    with open(os.path.join(os.path.dirname(__file__), "..", "..", "program.ks"), "r") as file_handle:
+        assert_same_tokens(file_handle.read())
+
+
+def test_same_tokens_random():
+    pieces = ["a", "b", "1", "2", ".", " ", "\n", "#", '"', "<", "=", ">", "!", "+", "-",
+              "(", ")", "{", "}", ";", "ą", "_", "int", "true", "while", "\t", "||", "&&"]
+    generator = random.Random(2024)
+    for _ in range(500):
+        string = "".join(generator.choice(pieces) for _ in range(generator.randint(0, 25))) + "\n"
+        expected = get_lexer_outcome(Lexer(Reader(io.StringIO(string))))
+        assert get_lexer_outcome(RegexLexer(io.StringIO(string))) == expected
+
+
+def get_lexer_outcome(lexer):
+    try:
+        return get_all_tokens(lexer)
+    except Exception as e:
+        return type(e), getattr(e, "line", None), getattr(e, "column", None)
+
+
+@pytest.mark.parametrize("string, exception", [
+    ('"' + "a" * 10_001 + '"', StringTooLongException),
+    ('"Hello World', UnclosedStringException),
+    ('"Hello World\n', UnclosedStringException),
+    ("ID1" * 100, IdentifierTooLongException),
+    ("11000000", NumberException),
+    ("10000000.1", NumberException),
+    ("1" * 1_001, NumberException),
+    ("1." + "1" * 1_001, NumberException),
+])
+def test_same_exceptions(string, exception):
+    with pytest.raises(exception) as chain_error:
+        get_tokens(Lexer(Reader(io.StringIO(string))))
+    with pytest.raises(exception) as regex_error:
+        get_tokens(RegexLexer(io.StringIO(string)))
+    assert (regex_error.value.line, regex_error.value.column) == (chain_error.value.line, chain_error.value.column)
+
+
+def test_eof_repeats():
+    lexer = RegexLexer(io.StringIO("a"))
+    assert lexer.get_next_token().type == TokenType.ID
+    assert lexer.get_next_token().type == TokenType.EOF
+    assert lexer.get_next_token().type == TokenType.EOF
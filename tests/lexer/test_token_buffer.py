@@ -0,0 +1,79 @@
+import io
+import os
+import pickle
+import pytest
+
+from src.reader import Reader
+from src.lexer.lexer import Lexer, get_tokens
+from src.lexer.regex_lexer import RegexLexer
+from src.parser.parser import Parser
+from src.token.token_buffer import TokenBuffer, TokenBufferStream, tokenize
+from src.token.token_types import TokenType
+
+PROGRAM_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "program.ks")
+
+
+def get_all_tokens(tokens):
+    return [(token.type, token.value, token.position) for token in tokens]
+
+
+@pytest.mark.parametrize("string", [
+    "",
+    "int a = 10;",
+    "a <= b || c && d",
+    '"Hello World" # komentarz\n"x"',
+    "a\n#b\n##c",
+    "1.5 true false",
+])
+def test_buffer_matches_lexer(string):
+    expected = get_all_tokens(get_tokens(Lexer(Reader(io.StringIO(string)))))
+    assert get_all_tokens(tokenize(Lexer(Reader(io.StringIO(string)))).get_tokens()) == expected
+    assert get_all_tokens(tokenize(RegexLexer(io.StringIO(string))).get_tokens()) == expected
+
+
+@pytest.mark.parametrize("string, spans", [
+    ("int a = 10;", ["int", "a", "=", "10", ";", ""]),
+    ("a<=b", ["a", "<", "=", "b", ""]),
+    ('x # komentarz\n"s" ||y', ["x", '"s"', "||", "y", ""]),
+])
+def test_buffer_spans(string, spans):
+    for lexer in (Lexer(Reader(io.StringIO(string), 2)), RegexLexer(io.StringIO(string))):
+        buffer = tokenize(lexer)
+        assert [string[buffer.get_start(i):buffer.get_end(i)] for i in range(len(buffer))][:len(spans)] == spans
+
+
+def test_buffer_value_pool():
+    buffer = tokenize(RegexLexer(io.StringIO("a a a 1 1 true 1.5")))
+    assert len(buffer) == 8
+    assert buffer.values.count("a") == 1
+    assert buffer.get_value(3) == 1
+    assert buffer.get_value(5) is True
+
+
+def test_buffer_pickle():
+    with open(PROGRAM_PATH, "r") as file_handle:
+        buffer = tokenize(RegexLexer(file_handle))
+    copy = pickle.loads(pickle.dumps(buffer))
+    assert get_all_tokens(copy.get_tokens()) == get_all_tokens(buffer.get_tokens())
+    copy.append(TokenType.ID, 0, 1, buffer.get_value(0))
+    assert len(copy.values) == len(buffer.values)
+
+
+def test_stream_stays_on_eof():
+    stream = TokenBufferStream(tokenize(RegexLexer(io.StringIO("a"))))
+    assert stream.get_next_token().type == TokenType.ID
+    assert stream.peek_type() == TokenType.EOF
+    assert stream.get_next_token().type == TokenType.EOF
+    assert stream.get_next_token().type == TokenType.EOF
+
+
+def test_parser_over_buffer():
+    with open(PROGRAM_PATH, "r") as file_handle:
+        text = file_handle.read()
+    expected = Parser(None, Lexer(Reader(io.StringIO(text)))).parse()
+    buffer = tokenize(RegexLexer(io.StringIO(text)))
+    assert Parser(None, TokenBufferStream(buffer)).parse() == expected
+
+
+def test_empty_buffer():
+    assert len(TokenBuffer()) == 0
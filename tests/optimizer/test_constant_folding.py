@@ -0,0 +1,90 @@
+import io
+import pytest
+
+from src.ast.arena import AstArena
+from src.ast.nodes import *
+from src.interpreter.interpreter import Interpreter
+from src.optimizer.constant_folding import ConstantFolder
+from src.exceptions.interpreter_exception import *
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.reader import Reader
+
+
+def parse(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader)).parse()
+
+
+def fold_return(expression):
+    program = ConstantFolder().fold_program(parse(f'function int main(){{return {expression};}}'))
+    return program.program_body[0].body.statements[0].expression
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ('1 + 2 * 3', IntValue(7)),
+    ('7 / 2', FloatValue(3.5)),
+    ('1.5 - 1', FloatValue(0.5)),
+    ('"a" + "b"', StringValue("ab")),
+    ('"ab" * 2', StringValue("abab")),
+    ('2 < 3', BoolValue(True)),
+    ('3 > 4', BoolValue(False)),
+    ('true + 1', IntValue(2)),
+])
+def test_folds_constant_operations(expression, expected):
+    assert fold_return(expression) == expected
+
+
+@pytest.mark.parametrize("expression", [
+    '7 / 0',
+    '"a" - 1',
+    '"a" * 100000',
+    'a + 1',
+])
+def test_keeps_operations_that_are_not_constant_or_raise(expression):
+    assert fold_return(expression) == parse(f'function int main(){{return {expression};}}').program_body[0] \
+        .body.statements[0].expression
+
+
+def test_folded_value_keeps_position():
+    expression = parse('function int main(){return 1 + 2;}').program_body[0].body.statements[0].expression
+    assert fold_return('1 + 2').position == expression.position
+
+
+def test_division_by_zero_raises_at_original_position():
+    string = 'function float main(){return 1 + 1 / 0;}'
+    with pytest.raises(ZeroDivisionError) as expected_error:
+        Interpreter(parse(string)).visit_program()
+    with pytest.raises(ZeroDivisionError) as error:
+        Interpreter(ConstantFolder().fold_program(parse(string))).visit_program()
+    assert error.value.position == expected_error.value.position
+
+
+def test_constant_if_is_replaced_by_chosen_branch():
+    program = ConstantFolder().fold_program(parse(
+        'function int main(){print(1); if (1 < 2) { print(2); return 3; } else { return 4; };}'
+    ))
+    statements = program.program_body[0].body.statements
+    assert [get_class(statement) for statement in statements] == [FunctionCall, FunctionCall, ReturnStatement]
+    assert Interpreter(program).visit_program() == 3
+
+
+def test_if_with_non_bool_condition_is_kept():
+    program = ConstantFolder().fold_program(parse('function int main(){if (1) { return 1; } else { return 2; };}'))
+    assert type(program.program_body[0].body.statements[0]) is IfStatement
+
+
+def test_unchanged_program_is_returned_as_is():
+    program = parse('function int f(int a){return a;}')
+    assert ConstantFolder().fold_program(program) is program
+
+
+def test_arena_program():
+    program = AstArena.from_tree(parse('function int main(){return 2 * 3 + 4;}')).get_root()
+    folded_program = ConstantFolder().fold_program(program)
+    assert folded_program.program_body[0].body.statements[0].expression == IntValue(10)
+    assert Interpreter(folded_program).visit_program() == 10
+
+
+def get_class(node):
+    return node.get_node_class()
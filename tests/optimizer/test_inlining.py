@@ -0,0 +1,123 @@
+import io
+import contextlib
+import pytest
+
+from src.ast.arena import AstArena
+from src.ast.nodes import *
+from src.interpreter.interpreter import Interpreter
+from src.interpreter.closure_interpreter import ClosureInterpreter
+from src.interpreter.transpiler import TranspiledInterpreter
+from src.interpreter.type_checker import TypeChecker
+from src.vm.machine import VirtualMachine
+from src.optimizer.inlining import Inliner
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.reader import Reader
+
+HELPER = 'function int a(int b){if (b + 2 > 7) { return 10; } else { return 7; };} '
+
+
+def parse(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader)).parse()
+
+
+def run(interpreter_class, program):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            result = interpreter_class(program).visit_program()
+        except Exception as error:
+            result = (type(error), getattr(error, "position", None))
+    return result, output.getvalue()
+
+
+def get_main_return(program):
+    return program.program_body[-1].body.statements[-1].expression
+
+
+def test_call_is_replaced_by_body():
+    inliner = Inliner()
+    program = inliner.inline_program(parse(HELPER + 'function int main(){return a(6);}'))
+    inlined_call = get_main_return(program)
+    assert inlined_call.get_node_class() is InlinedCall
+    condition = inlined_call.body.statements[0].condition
+    assert condition.left.left == InlinedArgument(0)
+    assert inliner.inlined_calls == {inlined_call.function_call.position: 'a'}
+
+
+@pytest.mark.parametrize("string", [
+    'function int f(int n){return 1 + f(n);} function int main(){return f(1);}',
+    'function int f(int n){int m = 1; return n;} function int main(){return f(1);}',
+    'function int f(int n){return m;} function int main(){return f(1);}',
+    'function int f(int n){print(n);} function int main(){return f(1);}',
+    'function int f(int n, int n){return n;} function int main(){return f(1, 2);}',
+    'function int f(int n){return n;} function int main(){return f(1, 2);}',
+    'function List<int> f(int n){return [n];} function int main(){return f(1);}',
+    'function int f(int n){return n;} function int f(int n){return n;} function int main(){return f(1);}',
+])
+def test_unsafe_calls_are_kept(string):
+    program = parse(string)
+    assert Inliner().inline_program(program) == program
+
+
+def test_size_limit():
+    string = HELPER + 'function int main(){return a(6);}'
+    program = parse(string)
+    assert Inliner(maximum_size=5).inline_program(program) == program
+    assert get_main_return(Inliner(maximum_size=13).inline_program(program)).get_node_class() is InlinedCall
+
+
+def test_calls_inside_inlined_body_are_inlined():
+    program = Inliner(maximum_size=50).inline_program(parse(
+        HELPER + 'function int c(int d){return a(d) + a(d * 2);} function int main(){return c(3);}'
+    ))
+    expression = get_main_return(program).body.statements[0].expression
+    assert expression.left.get_node_class() is InlinedCall
+    assert expression.right.function_call.arguments.arguments[0].left == InlinedArgument(0)
+
+
+@pytest.mark.parametrize("string", [
+    HELPER + 'function int main(){return a(6);}',
+    HELPER + 'function int main(){print(a(1), a(9)); return a(2) + a(8);}',
+    HELPER + 'function int c(int d){return a(d) + a(d * 2);} function int main(){return c(3);}',
+    'function int f(int n){return n + 0.5;} function int main(){return f(1);}',
+    'function int f(int n){if (n) { return 1; } else { return 2; };} function int main(){return f(1);}',
+    'function int f(int n, int m){return n / m;} function int main(){return f(1, 0);}',
+    'function float f(int n, int m){return n / m;} function int main(){return f(1, 2);}',
+    'function int f(int n){print(n); return n + 1;} function int main(){print(f(get_int(1))); return f(2);}',
+    'function int h(int n){return n + 1;} '
+    'function int r(int n){if (n > 7) { return h(n); } else { return r(n + 1); };} '
+    'function int main(){return r(0);}',
+    'function int h(int n){return n + 1;} '
+    'function int r(int n){if (n > 5) { return h(n); } else { return r(n + 1); };} '
+    'function int main(){return r(0);}',
+    'function int h(int n){return n * 2;} function int c(int d){return h(d) + h(d + 1);} '
+    'function int main(){return c(3);}',
+])
+@pytest.mark.parametrize("interpreter_class", [Interpreter, ClosureInterpreter, TranspiledInterpreter, VirtualMachine])
+def test_inlined_program_behaves_the_same(interpreter_class, string):
+    inlined_program = Inliner().inline_program(parse(string))
+    assert run(interpreter_class, inlined_program) == run(interpreter_class, parse(string))
+
+
+def test_type_errors_are_not_repeated():
+    string = 'function int f(int n){return 1.5;} function int main(){return f(1) + f(2);}'
+    inlined_program = Inliner().inline_program(parse(string))
+    errors = TypeChecker().check_program(parse(string))
+    assert len(errors) == 1
+    assert list(map(str, TypeChecker().check_program(inlined_program))) == list(map(str, errors))
+
+
+def test_constant_return_is_proven():
+    program = Inliner().inline_program(parse(HELPER + 'function int main(){return a(6);}'))
+    TypeChecker().check_program(program)
+    inlined_return = get_main_return(program).body.statements[0].true_statement.statements[0]
+    assert inlined_return.type_proven
+
+
+def test_arena_program():
+    string = HELPER + 'function int main(){return a(6);}'
+    program = Inliner().inline_program(AstArena.from_tree(parse(string)).get_root())
+    assert get_main_return(program).get_node_class() is InlinedCall
+    assert run(Interpreter, program) == run(Interpreter, parse(string))
@@ -0,0 +1,97 @@
+import io
+import contextlib
+import pytest
+
+from src.ast.arena import AstArena
+from src.ast.nodes import *
+from src.interpreter.interpreter import Interpreter
+from src.interpreter.closure_interpreter import ClosureInterpreter
+from src.interpreter.transpiler import TranspiledInterpreter
+from src.vm.machine import VirtualMachine
+from src.optimizer.loop_invariants import LoopInvariantMover
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.reader import Reader
+
+
+def parse(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader)).parse()
+
+
+def run(interpreter_class, program):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            result = interpreter_class(program).visit_program()
+        except Exception as error:
+            result = (type(error), getattr(error, "position", None))
+    return result, output.getvalue()
+
+
+def get_class(node):
+    return node.get_node_class()
+
+
+def test_invariant_operations_are_hoisted():
+    program = LoopInvariantMover().move_program(parse(
+        'function int f(int n, int m){while (n < 5) { print(n * m + 1); }; return 1;}'
+    ))
+    loop = program.program_body[0].body.statements[0]
+    assert get_class(loop) is InvariantLoop
+    assert loop.invariant_count == 2
+    assert get_class(loop.loop.condition) is InvariantExpression
+    expression = loop.loop.body.statements[0].arguments.arguments[0]
+    assert expression == InvariantExpression(
+        AddExpression(MultiplyExpression(Variable(Identifier("n")), Variable(Identifier("m"))), IntValue(1)), 1
+    )
+
+
+@pytest.mark.parametrize("body", [
+    'while (n < 5) { n = n + 1; };',
+    'for(int n in l){ print(n * 2); };',
+    'while (m < 5) { print(n * 2); return 1; };',
+    'while (m < 5) { l.append(1); print(n < 2); };',
+    'while (m < 5) { g(1); print(n * 2); };',
+    'while (m < 5) { h(); print(n * 2); };',
+    'for(int x in l){ print(1 + 2); };',
+])
+def test_variant_or_unsafe_loops_are_kept(body):
+    program = parse(f'function int h(){{print(1);}} function int f(int n, int m){{{body} return 1;}}')
+    assert LoopInvariantMover().move_program(program) == program
+
+
+def test_inner_loop_claims_its_invariants():
+    program = LoopInvariantMover().move_program(parse(
+        'function int f(int n, int m){while (m < 5) { while (n < 3) { print(m * 2); }; }; return 1;}'
+    ))
+    outer_loop = program.program_body[0].body.statements[0]
+    inner_loop = outer_loop.loop.body.statements[0]
+    assert outer_loop.invariant_count == 1
+    assert get_class(inner_loop) is InvariantLoop
+    assert inner_loop.invariant_count == 2
+
+
+@pytest.mark.parametrize("string", [
+    'function int f(int n, int m){while (n < 5) { print(n * m + 1); }; return 1;} '
+    'function int main(){return f(1, 2);}',
+    'function int f(int n, int m){while (n < 5) { print(n / m); }; return 1;} '
+    'function int main(){return f(1, 0);}',
+    'function int f(int n){while (n < 5) { print(n + k); }; return 1;} '
+    'function int main(){return f(1);}',
+    'function int f(int n, int m){while (m < 3) { int x = n * 2; print(x); }; return 1;} '
+    'function int main(){return f(1, 2);}',
+    'function int f(int n, int m){if (n < 2) { while (n < 5) { print(n + m); }; } else { }; return 1;} '
+    'function int main(){return f(4, 2);}',
+])
+@pytest.mark.parametrize("interpreter_class", [Interpreter, ClosureInterpreter, TranspiledInterpreter, VirtualMachine])
+def test_moved_program_behaves_the_same(interpreter_class, string):
+    moved_program = LoopInvariantMover().move_program(parse(string))
+    assert run(interpreter_class, moved_program) == run(interpreter_class, parse(string))
+
+
+def test_arena_program():
+    string = 'function int f(int n, int m){while (n < 5) { print(n * m); }; return 1;} function int main(){return f(1, 2);}'
+    program = LoopInvariantMover().move_program(AstArena.from_tree(parse(string)).get_root())
+    assert get_class(program.program_body[0].body.statements[0]) is InvariantLoop
+    assert run(Interpreter, program) == run(Interpreter, parse(string))
@@ -0,0 +1,86 @@
+import io
+import os
+from multiprocessing import shared_memory
+
+from src.reader import Reader
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.interpreter.interpreter import Interpreter
+from src.ast.abstract_node import Node
+from src.ast.arena import AstArena
+from src.ast.nodes import *
+
+PROGRAM_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "program.ks")
+
+
+def parse(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader)).parse()
+
+
+def get_positions(node, positions):
+    if isinstance(node, (list, tuple)):
+        for item in node:
+            get_positions(item, positions)
+    elif isinstance(node, Node):
+        positions.append((node.get_node_class().__name__, getattr(node, "line", None), getattr(node, "column", None)))
+        for value in node.get_fields():
+            get_positions(value, positions)
+    return positions
+
+
+def read_program():
+    with open(PROGRAM_PATH, "r") as file_handle:
+        return file_handle.read()
+
+
+def test_proxy_matches_tree():
+    program = parse(read_program())
+    root = AstArena.from_tree(program).get_root()
+    assert root == program
+    assert hash(root) == hash(program)
+    assert isinstance(root, Program)
+    assert get_positions(root, []) == get_positions(program, [])
+
+
+def test_proxy_attributes():
+    program = parse("function int main(){ return 3 + 1; }")
+    function = AstArena.from_tree(program).get_root().program_body[0]
+    assert function.identifier == Identifier("main")
+    assert function.return_type is IntType
+    assert function.position == (1, 1)
+    statement = function.body.statements[0]
+    assert isinstance(statement, ReturnStatement)
+    assert statement.expression.left == IntValue(3)
+    assert statement.expression.right.value == 1
+    assert not hasattr(statement, "__dict__")
+
+
+def test_nodes_without_position():
+    tree = Program([FunctionDefinition(IntType, Identifier("a"), [(IntType(), Identifier("b"))], StatementBlock([]))])
+    root = AstArena.from_tree(tree).get_root()
+    assert root == tree
+    assert root.line is None
+    assert root.program_body[0].body.line is None
+
+
+def test_interpreter_on_arena():
+    program = parse("""
+    function int a(int b){return b + 4 * 5;}
+    function int main(){return a(2) + 10;}
+    """)
+    assert Interpreter(AstArena.from_tree(program).get_root()).visit_program() == 32
+
+
+def test_shared_memory():
+    program = parse(read_program())
+    data = AstArena.from_tree(program).to_bytes()
+    memory = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        memory.buf[:len(data)] = data
+        arena = AstArena.from_buffer(memory.buf)
+        assert arena.get_root() == program
+        del arena
+    finally:
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,89 @@
+import os
+import random
+import re
+import pytest
+
+from src.ast.abstract_node import Node
+from src.parser.incremental_parser import IncrementalParser
+
+PROGRAM_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "program.ks")
+EXTRA_FUNCTION = "function int extra_{0}(int x){{ return x + {0}; }}"
+
+
+def get_positions(node, positions):
+    if isinstance(node, (list, tuple)):
+        for item in node:
+            get_positions(item, positions)
+    elif isinstance(node, Node):
+        positions.append((type(node).__name__, node.line, node.column, node.position))
+        for value in node.get_fields():
+            get_positions(value, positions)
+    return positions
+
+
+def get_outcome(parse):
+    try:
+        program = parse()
+    except Exception as e:
+        return type(e)
+    return program, get_positions(program, [])
+
+
+def assert_same_as_full_parse(parser, offset, deleted_length, inserted_text):
+    text = parser.text[:offset] + inserted_text + parser.text[offset + deleted_length:]
+    expected = get_outcome(lambda: IncrementalParser(text).get_program())
+    assert get_outcome(lambda: parser.edit(offset, deleted_length, inserted_text)) == expected
+
+
+@pytest.mark.parametrize("text, offset, deleted_length, inserted_text", [
+    ("function int a(){ return 1; }\nfunction int b(){ return 2; }", 25, 1, "7"),
+    ("function int a(){ return 1; }\nfunction int b(){ return 2; }", 29, 0, "\n\n"),
+    ("function int a(){ return 1; } function int b(){ return 2; }", 25, 1, "12345"),
+    ("function int a(){ return 1; } function int b(){ return 2; }", 30, 0, "function int c(){ return 3; } "),
+    ("function int a(){ return 1; }\nfunction int b(){ return 2; }", 0, 30, ""),
+    ("function int a(){ return 1; }\nfunction int b(){ return 2; }", 59, 0, "\nfunction int c(){ return 3; }"),
+])
+def test_edit(text, offset, deleted_length, inserted_text):
+    assert_same_as_full_parse(IncrementalParser(text), offset, deleted_length, inserted_text)
+
+
+def test_edit_reuses_functions():
+    text = "\n".join(EXTRA_FUNCTION.format(index) for index in range(5))
+    parser = IncrementalParser(text)
+    old_functions = list(parser.get_program().program_body)
+    offset = text.index("x + 2")
+    program = parser.edit(offset, 1, "y")
+    assert [new is old for new, old in zip(program.program_body, old_functions)] == [True, True, False, True, True]
+    assert program.program_body[3].position == (4, 1)
+
+
+def test_edit_after_error():
+    parser = IncrementalParser(EXTRA_FUNCTION.format(1))
+    with pytest.raises(Exception):
+        parser.edit(0, 8, "")
+    assert parser.edit(0, 0, "function") == IncrementalParser(EXTRA_FUNCTION.format(1)).get_program()
+
+
+def test_random_edits():
+    with open(PROGRAM_PATH, "r") as file_handle:
+        parser = IncrementalParser(file_handle.read())
+    generator = random.Random(2024)
+    for index in range(100):
+        kind = generator.randrange(4)
+        if kind == 0:
+            match = generator.choice(list(re.finditer(r"\d+", parser.text)))
+            edit = match.start(), match.end() - match.start(), str(generator.randint(0, 999))
+        elif kind == 1:
+            match = generator.choice(list(re.finditer(r"\s", parser.text)))
+            edit = match.start(), 0, generator.choice([" ", "\n", "\n\n", "  # komentarz\n", "\t"])
+        elif kind == 2:
+            matches = list(re.finditer(r"(?m)^function", parser.text))
+            offset = generator.choice([match.start() for match in matches] + [len(parser.text)])
+            edit = offset, 0, EXTRA_FUNCTION.format(index) + generator.choice(["\n", " "])
+        else:
+            matches = list(re.finditer(r"(?m)^function[^\n]*extra_\d+[^\n]*\n", parser.text))
+            if not matches:
+                continue
+            match = generator.choice(matches)
+            edit = match.start(), match.end() - match.start(), ""
+        assert_same_as_full_parse(parser, *edit)
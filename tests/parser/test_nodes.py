@@ -0,0 +1,62 @@
+import io
+import os
+import pickle
+
+from src.reader import Reader
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.ast.nodes import *
+
+PROGRAM_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "program.ks")
+
+
+def parse(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader)).parse()
+
+
+def read_program():
+    with open(PROGRAM_PATH, "r") as file_handle:
+        return file_handle.read()
+
+
+def test_nodes_have_no_dict():
+    node = AddExpression(IntValue(1, 1, 1), IntValue(2, 1, 5), 1, 3)
+    assert not hasattr(node, "__dict__")
+    assert node.position == (1, 3)
+    node.line = 4
+    assert node.position == (4, 3)
+
+
+def test_equal_trees_have_equal_hashes():
+    program = read_program()
+    assert hash(parse(program)) == hash(parse("\n\n" + program))
+
+
+def test_hash_ignores_positions():
+    assert hash(IntValue(1, 1, 1)) == hash(IntValue(1, 7, 3))
+    assert hash(IntType()) == hash(IntType())
+
+
+def test_hash_distinguishes_structure():
+    assert hash(AddExpression(IntValue(1), IntValue(2))) != hash(SubExpression(IntValue(1), IntValue(2)))
+    assert hash(AddExpression(IntValue(1), IntValue(2))) != hash(AddExpression(IntValue(2), IntValue(1)))
+
+
+def test_deduplicate_subexpressions():
+    expressions = [
+        AddExpression(Variable(Identifier("a")), IntValue(1)),
+        AddExpression(Variable(Identifier("a"), 3, 4), IntValue(1)),
+        AddExpression(Variable(Identifier("b")), IntValue(1)),
+    ]
+    assert len(set(expressions)) == 2
+
+
+def test_hash_is_not_pickled():
+    node = FunctionCall(Identifier("print"), Arguments([StringValue("x")]), 2, 5)
+    hash(node)
+    copy = pickle.loads(pickle.dumps(node))
+    assert copy == node
+    assert copy.position == (2, 5)
+    assert not hasattr(copy, "structural_hash")
+    assert hash(copy) == hash(node)
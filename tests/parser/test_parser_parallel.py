@@ -0,0 +1,58 @@
+import io
+import os
+import pytest
+
+from src.reader import Reader
+from src.lexer.lexer import Lexer
+from src.lexer.regex_lexer import RegexLexer
+from src.parser.parser import Parser, find_function_spans
+from src.exceptions.parser_exception import NoSemicolonError
+from src.token.token_buffer import tokenize
+from src.token.token_types import TokenType
+
+PROGRAM_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "program.ks")
+
+
+def create_parser(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader))
+
+
+def read_program():
+    with open(PROGRAM_PATH, "r") as file_handle:
+        return file_handle.read()
+
+
+def test_parse_parallel_program():
+    program = read_program()
+    parser = create_parser(program)
+    assert parser.parse_parallel(workers=2) == create_parser(program).parse()
+    assert parser.current_token.get_type() == TokenType.EOF
+
+
+def test_parse_parallel_many_functions():
+    program = "\n".join(f"function int f_{index}(int x){{ return x + {index}; }}" for index in range(50))
+    assert create_parser(program).parse_parallel(workers=3) == create_parser(program).parse()
+
+
+def test_parse_parallel_one_worker():
+    program = read_program()
+    assert create_parser(program).parse_parallel(workers=1) == create_parser(program).parse()
+
+
+def test_parse_parallel_syntax_error():
+    program = "function int a(){ return 1; }\nfunction int b(){ return 2 }"
+    with pytest.raises(NoSemicolonError):
+        create_parser(program).parse_parallel(workers=2)
+
+
+@pytest.mark.parametrize("string, spans", [
+    ("", []),
+    ("function int a(){}", [(0, 7)]),
+    ("function int a(){ Dict<int, int> d = {1: 2}; } function int b(){}", [(0, 21), (21, 28)]),
+    ("function int a(){", None),
+    ("int a = 1;", None),
+])
+def test_find_function_spans(string, spans):
+    buffer = tokenize(RegexLexer(io.StringIO(string)))
+    assert find_function_spans(buffer, 0) == spans
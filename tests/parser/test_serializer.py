@@ -0,0 +1,71 @@
+import io
+import os
+import pytest
+
+from src.reader import Reader
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.ast import serializer
+from src.ast.abstract_node import Node
+from src.ast.nodes import *
+
+PROGRAM_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "program.ks")
+
+
+def parse(string):
+    reader = Reader(io.StringIO(string))
+    return Parser(reader, Lexer(reader)).parse()
+
+
+def get_positions(node, positions):
+    if isinstance(node, (list, tuple)):
+        for item in node:
+            get_positions(item, positions)
+    elif isinstance(node, Node):
+        positions.append((type(node).__name__, getattr(node, "line", None), getattr(node, "column", None)))
+        for value in node.get_fields():
+            get_positions(value, positions)
+    return positions
+
+
+def assert_round_trip(tree):
+    copy = serializer.loads(serializer.dumps(tree))
+    assert copy == tree
+    assert get_positions(copy, []) == get_positions(tree, [])
+    return copy
+
+
+def test_round_trip_program():
+    with open(PROGRAM_PATH, "r") as file_handle:
+        assert_round_trip(parse(file_handle.read()))
+
+
+@pytest.mark.parametrize("string", [
+    "",
+    "function int a(){ return 1.5 * 2 - 3 / 4; }",
+    'function string a(){ string s = "Łódź"; bool b = true; return s; }',
+    "function int a(Dict<int, string> d, Pair<int, float> p){ for(int i in l, key=f){ print(i); }; }",
+    "function int a(){ if (a < b) { x = 1; } else { }; while (a > b) { a = a + 1; }; }",
+])
+def test_round_trip(string):
+    assert_round_trip(parse(string))
+
+
+def test_round_trip_nodes_without_position():
+    tree = Program([
+        FunctionDefinition(IntType, Identifier("a"), [(IntType(), Identifier("b"))],
+                           StatementBlock([ReturnStatement(IntValue(-7, 3, 1))]), -1, 2**40)
+    ])
+    copy = assert_round_trip(tree)
+    assert copy.program_body[0].position == (-1, 2**40)
+    assert copy.program_body[0].return_type is IntType
+
+
+def test_constants_are_shared():
+    tree = parse('function int a(){ print("x"); print("x"); print("x"); }')
+    assert serializer.dumps(tree).count(b"print") == 1
+
+
+def test_not_serialized():
+    with pytest.raises(ValueError):
+        serializer.loads(b"not a tree")
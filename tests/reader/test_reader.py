@@ -1,6 +1,6 @@
 import io
 import pytest
-from src.reader import Reader
+from src.reader import Reader, MmapReader, open_reader
 
 
 def test_read_from_file():
@@ -42,6 +42,92 @@ def test_read_from_string_empty():
     assert positions == [(2, 0)]
 
 
+def test_read_from_string_small_buffer():
+    src_string = "10+11=21\nkacper\nmaja"
+    expected = get_characters_and_positions(Reader(io.StringIO(src_string)))
+    for buffer_size in (1, 2, 3, 8, 9):
+        reader = Reader(io.StringIO(src_string), buffer_size)
+        assert get_characters_and_positions(reader) == expected
+
+
+def test_read_from_string_with_comment():
+    src_string = "a #b\n#c"
+    reader = Reader(io.StringIO(src_string))
+
+    characters, positions = get_characters_and_positions(reader)
+    assert characters == ['a', ' ', '\n', '\n', 'c', 'EOF']
+    assert positions == [(1, 1), (1, 2), (1, 4), (1, 4), (2, 1), (3, 0)]
+
+
+def test_position_of_offset():
+    reader = Reader(io.StringIO("10+11=21\nkacper\nmaja"))
+    get_characters_and_positions(reader)
+    assert reader.get_position(0) == (1, 1)
+    assert reader.get_position(8) == (1, 9)
+    assert reader.get_position(9) == (2, 1)
+    assert reader.get_position(19) == (3, 4)
+    assert reader.get_position(20) == (4, 0)
+
+
+def test_mmap_reader_same_as_reader(tmp_path):
+    src_string = "function int main(){\n    # komentarz\n    return \"Łódź\";\n}\n"
+    path = tmp_path / "program.ks"
+    path.write_text(src_string, encoding="utf-8")
+    with open(path, "r") as file_handle:
+        reader = MmapReader(file_handle)
+        assert get_characters_and_positions(reader) == get_characters_and_positions(Reader(io.StringIO(src_string)))
+
+
+def test_mmap_reader_windows_newlines(tmp_path):
+    path = tmp_path / "program.ks"
+    path.write_bytes(b"10\r\n20\r30")
+    with open(path, "r") as file_handle:
+        reader = MmapReader(file_handle)
+        characters, positions = get_characters_and_positions(reader)
+    assert characters == ['1', '0', '\n', '2', '0', '\n', '3', '0', 'EOF']
+    assert positions == [(1, 1), (1, 2), (1, 3), (2, 1), (2, 2), (2, 3), (3, 1), (3, 2), (4, 0)]
+
+
+def test_mmap_reader_empty_file(tmp_path):
+    path = tmp_path / "program.ks"
+    path.write_text("")
+    with open(path, "r") as file_handle:
+        characters, positions = get_characters_and_positions(MmapReader(file_handle))
+    assert characters == ["EOF"]
+    assert positions == [(2, 0)]
+
+
+def test_open_reader_maps_large_files(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.reader.MMAP_THRESHOLD", 4)
+    path = tmp_path / "program.ks"
+    path.write_text("10+11=21")
+    with open(path, "r", encoding="utf-8") as file_handle:
+        assert type(open_reader(file_handle)) is MmapReader
+
+
+def test_open_reader_streams_files_in_other_encodings(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.reader.MMAP_THRESHOLD", 4)
+    path = tmp_path / "program.ks"
+    path.write_text("café", encoding="cp1252")
+    with open(path, "r", encoding="cp1252") as file_handle:
+        reader = open_reader(file_handle)
+        assert type(reader) is Reader
+        assert get_characters_and_positions(reader)[0] == ["c", "a", "f", "é", "EOF"]
+
+
+def test_open_reader_falls_back_for_streams():
+    assert type(open_reader(io.StringIO("10+11"))) is Reader
+
+
+def test_mmap_reader_close_releases_mapping(tmp_path):
+    path = tmp_path / "program.ks"
+    path.write_text("10+11=21")
+    with open(path, "r") as file_handle:
+        reader = MmapReader(file_handle)
+        reader.close()
+    assert reader.mapping.closed
+
+
 def get_characters_and_positions(src):
     characters, positions = [], []
 
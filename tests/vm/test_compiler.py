@@ -0,0 +1,57 @@
+import io
+
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.reader import Reader
+from src.vm.compiler import Compiler
+
+
+def compile_functions(string):
+    reader = Reader(io.StringIO(string))
+    program_code = Compiler().compile_program(Parser(reader, Lexer(reader)).parse())
+    return {name: code for name, code in program_code.constants}
+
+
+def test_program_defines_functions():
+    functions = compile_functions('function int a(int b){return b;} function int main(){return a(1);}')
+    assert list(functions) == ["a", "main"]
+
+
+def test_parameters_use_first_slots():
+    code = compile_functions('function int f(int a, int b){return b - a;}')["f"]
+    assert code.parameter_slots == [0, 1]
+    assert code.disassemble() == [
+        ("LOAD_LOCAL", 1),
+        ("BINARY_LOCAL", 0 << 3 | 1),
+        ("RETURN", 0),
+        ("RETURN_NONE", 0),
+    ]
+
+
+def test_locals_resolved_to_slots():
+    code = compile_functions('function int main(){int a = 10; int b = 2; a = b; return 1;}')["main"]
+    assert code.slot_names == ["a", "b"]
+    operations = code.disassemble()
+    assert ("LOAD_ASSIGN_TYPE", 0) in operations
+    assert ("ASSIGN_LOCAL", 0) in operations
+    assert ("LOAD_LOCAL", 1) in operations
+
+
+def test_operands_folded_into_binary_instruction():
+    code = compile_functions('function int f(int a){return a * 2 + a - 1 * a;}')["f"]
+    assert [name for name, _ in code.disassemble()] == [
+        "LOAD_LOCAL", "BINARY_CONSTANT", "BINARY_LOCAL", "LOAD_CONSTANT", "BINARY_LOCAL", "SUBTRACT", "RETURN", "RETURN_NONE"
+    ]
+
+
+def test_loop_body_gets_own_slots():
+    code = compile_functions(
+        'function int main(){List<int> a = [1]; for (int a in a) { print(a); }; return 1;}'
+    )["main"]
+    assert code.slot_names == ["a", "a"]
+    assert ("STORE_LOCAL", 1) in code.disassemble()
+
+
+def test_builtin_called_directly():
+    code = compile_functions('function int main(){return get_int(2);}')["main"]
+    assert [name for name, _ in code.disassemble()] == ["LOAD_CONSTANT", "CALL_BUILTIN", "RETURN", "RETURN_NONE"]